@@ -576,6 +576,7 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, qcloseevent):
         self._plotter_manager.close()
+        self._bus_monitor_manager.close()
         self._console_manager.close()
         self._active_data_type_detector.close()
         super(MainWindow, self).closeEvent(qcloseevent)
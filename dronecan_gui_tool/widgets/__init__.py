@@ -9,11 +9,13 @@
 import os
 import re
 import pkg_resources
-import queue
+import bisect
+import numpy
+from collections import OrderedDict, deque
 from PyQt5.QtWidgets import QTableWidget, QTableWidgetItem, QAbstractItemView, QHeaderView, QApplication, QWidget, \
-    QComboBox, QCompleter, QPushButton, QHBoxLayout, QVBoxLayout, QMessageBox
-from PyQt5.QtCore import Qt, QTimer, QStringListModel
-from PyQt5.QtGui import QColor, QKeySequence, QFont, QFontInfo, QIcon
+    QComboBox, QCompleter, QPushButton, QHBoxLayout, QVBoxLayout, QMessageBox, QTableView
+from PyQt5.QtCore import Qt, QTimer, QStringListModel, QAbstractTableModel, QModelIndex, pyqtSignal
+from PyQt5.QtGui import QColor, QKeySequence, QFont, QFontInfo, QIcon, QBrush
 from logging import getLogger
 import qtawesome
 from functools import partial
@@ -49,10 +51,15 @@ def request_confirmation(title, text, parent=None):
 class BasicTable(QTableWidget):
     class Column:
         def __init__(self, name, renderer, resize_mode=QHeaderView.ResizeToContents,
-                     searchable=True, filterable=None):
+                     searchable=True, filterable=None, batch_renderer=None):
+            """
+            The optional batch renderer accepts a list of entries and returns a list of rendered values, it is
+            used by VirtualTableModel to render a screenful of cells at once.
+            """
             self.name = name
             self.resize_mode = resize_mode
             self.render = renderer
+            self.render_batch = batch_renderer
             self.searchable = searchable
             self.filterable = filterable if filterable is not None else self.searchable
 
@@ -188,6 +195,381 @@ class BasicTable(QTableWidget):
         self.setUpdatesEnabled(True)
 
 
+class VirtualTableModel(QAbstractTableModel):
+    """
+    Table model that renders cells on demand from an external bounded store, using the same column
+    specifications as BasicTable. The store is expected to provide the following interface:
+        capacity, __len__(), first_seq, next_seq, get_entry(seq)
+    plus append(*entry), discard_oldest(count) and clear() unless the store is read-only (then the model must not
+    be added to or cleared), and optionally line_count(seq) for multi-line rows and set_capacity(capacity).
+    Rows are addressed by store sequence numbers internally, so that eviction of the oldest entries does not
+    invalidate anything but the evicted rows themselves.
+    """
+    RENDER_CACHE_SIZE = 5000
+    RENDER_BATCH_SIZE = 100
+
+    def __init__(self, parent, columns, store):
+        super(VirtualTableModel, self).__init__(parent)
+        self.columns = columns
+        self.store = store
+        self._filter = None             # Row predicate accepting the store sequence number
+        self._filtered_seqs = None      # Sorted sequence numbers that passed the filter
+        self._render_cache = OrderedDict()
+        self._marked_seqs = set()
+        self._mark_icon = None
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.store) if self._filtered_seqs is None else len(self._filtered_seqs)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.columns[section].name
+
+    # flags() is not overridden: the default is the same, and Qt queries it for every cell of a selection,
+    # which is way too slow in Python for large selections
+
+    def row_to_seq(self, row):
+        if self._filtered_seqs is None:
+            return self.store.first_seq + row
+        return int(self._filtered_seqs[row])
+
+    def rows_to_seqs(self, rows):
+        """Vectorized row_to_seq(); accepts and returns integer arrays"""
+        rows = numpy.asarray(rows, dtype=numpy.int64)
+        if self._filtered_seqs is None:
+            return rows + self.store.first_seq
+        return numpy.asarray(self._filtered_seqs, dtype=numpy.int64)[rows]
+
+    def seq_to_row(self, seq, nearest=False):
+        """
+        Returns the row where the specified entry is displayed, or None if it is not displayed.
+        If nearest is set, an entry that is not displayed is substituted with the next displayed one.
+        """
+        if seq < self.store.first_seq or seq >= self.store.next_seq:
+            return None
+        if self._filtered_seqs is None:
+            return seq - self.store.first_seq
+        idx = bisect.bisect_left(self._filtered_seqs, seq)
+        if idx < len(self._filtered_seqs) and (nearest or self._filtered_seqs[idx] == seq):
+            return idx
+
+    def get_entry(self, row):
+        return self.store.get_entry(self.row_to_seq(row))
+
+    def render(self, row, col):
+        """Returns (text, color) of the specified cell; color may be None"""
+        key = self.row_to_seq(row), col
+        try:
+            return self._render_cache[key]
+        except KeyError:
+            pass
+
+        column = self.columns[col]
+        if column.render_batch is None:
+            rows = [row]
+            values = [column.render(self.store.get_entry(key[0]))]
+        else:
+            # The views request cells row by row, so the following rows are rendered ahead of time
+            rows = range(row, min(row + self.RENDER_BATCH_SIZE, self.rowCount()))
+            values = column.render_batch([self.store.get_entry(self.row_to_seq(r)) for r in rows])
+
+        for r, value in zip(rows, values):
+            color = None
+            if isinstance(value, tuple):
+                value, color = value
+            self._render_cache[self.row_to_seq(r), col] = str(value), color
+
+        while len(self._render_cache) > self.RENDER_CACHE_SIZE:
+            self._render_cache.popitem(last=False)
+        return self._render_cache[key]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return
+        if role == Qt.DisplayRole:
+            return self.render(index.row(), index.column())[0]
+        if role == Qt.BackgroundRole:
+            color = self.render(index.row(), index.column())[1]
+            return get_brush(color) if color is not None else None
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignVCenter | Qt.AlignLeft
+        if role == Qt.DecorationRole and index.column() == 0:
+            if self.row_to_seq(index.row()) in self._marked_seqs:
+                if self._mark_icon is None:
+                    self._mark_icon = get_icon('circle')
+                return self._mark_icon
+
+    def line_count(self, row):
+        try:
+            return self.store.line_count(self.row_to_seq(row))
+        except AttributeError:
+            return 1
+
+    def flip_mark(self, row):
+        """Marks or unmarks the row; returns True if the row is marked now"""
+        seq = self.row_to_seq(row)
+        if seq in self._marked_seqs:
+            self._marked_seqs.remove(seq)
+        else:
+            self._marked_seqs.add(seq)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, 0), [Qt.DecorationRole])
+        return seq in self._marked_seqs
+
+    def append_entries(self, entries):
+        if not entries:
+            return
+
+        store = self.store
+        if len(entries) >= store.capacity:
+            self.beginResetModel()
+            store.clear()
+            for e in entries[-store.capacity:]:
+                store.append(*e)
+            self._render_cache.clear()
+            self._apply_filter()
+            self.endResetModel()
+            return
+
+        if self._filtered_seqs is not None and not isinstance(self._filtered_seqs, list):
+            self._filtered_seqs = [int(x) for x in self._filtered_seqs]     # Provided via set_filter(), e.g. an array
+
+        # Evicting the oldest entries that are going to be overwritten
+        overflow = len(store) + len(entries) - store.capacity
+        if overflow > 0:
+            if self._filtered_seqs is None:
+                num_rows = overflow
+            else:
+                num_rows = bisect.bisect_left(self._filtered_seqs, store.first_seq + overflow)
+            if num_rows > 0:
+                self.beginRemoveRows(QModelIndex(), 0, num_rows - 1)
+            store.discard_oldest(overflow)
+            self._marked_seqs = set(x for x in self._marked_seqs if x >= store.first_seq)
+            if self._filtered_seqs is not None:
+                del self._filtered_seqs[:num_rows]
+            if num_rows > 0:
+                self.endRemoveRows()
+
+        first_row = self.rowCount()
+        if self._filtered_seqs is None:
+            self.beginInsertRows(QModelIndex(), first_row, first_row + len(entries) - 1)
+            for e in entries:
+                store.append(*e)
+            self.endInsertRows()
+        else:
+            first_new_seq = store.next_seq
+            for e in entries:
+                store.append(*e)
+            new_seqs = [s for s in range(first_new_seq, store.next_seq) if self._filter(s)]
+            if new_seqs:
+                self.beginInsertRows(QModelIndex(), first_row, first_row + len(new_seqs) - 1)
+                self._filtered_seqs.extend(new_seqs)
+                self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self.store.clear()
+        self._render_cache.clear()
+        self._marked_seqs.clear()
+        if self._filtered_seqs is not None:
+            self._filtered_seqs = []
+        self.endResetModel()
+
+    def set_capacity(self, capacity):
+        self.beginResetModel()
+        self.store.set_capacity(capacity)
+        self._render_cache.clear()
+        self._marked_seqs = set(x for x in self._marked_seqs if x >= self.store.first_seq)
+        self._apply_filter()
+        self.endResetModel()
+
+    def _apply_filter(self):
+        if self._filter is None:
+            self._filtered_seqs = None
+        else:
+            self._filtered_seqs = [s for s in range(self.store.first_seq, self.store.next_seq) if self._filter(s)]
+
+    def set_filter(self, predicate, seqs=None):
+        """
+        Accepts a predicate of store sequence number, or None to show all rows.
+        If the stored entries that pass the predicate are already known, e.g. from an index, their sorted
+        sequence numbers can be provided to avoid evaluating the predicate over the whole store.
+        """
+        self.beginResetModel()
+        self._filter = predicate
+        if predicate is not None and seqs is not None:
+            self._filtered_seqs = seqs
+        else:
+            self._apply_filter()
+        self.endResetModel()
+
+    def invalidate(self):
+        """Drops all rendered cells, e.g. when the renderers started to produce different output"""
+        self._render_cache.clear()
+        if self.rowCount() > 0:
+            self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, self.columnCount() - 1))
+
+
+class VirtualTable(QTableView):
+    """
+    A drop-in replacement for BasicTable that keeps its data in a bounded store instead of per-cell items.
+    Only the visible cells are rendered.
+    """
+    cellClicked = pyqtSignal(int, int)
+    cellPressed = pyqtSignal(int, int)
+
+    def __init__(self, parent, columns, store, multi_line_rows=False, font=None):
+        super(VirtualTable, self).__init__(parent)
+
+        self.columns = columns
+
+        self.filter = None
+        self._pre_filter = None
+        self._pre_filter_select = None
+
+        self.on_enter_pressed = lambda list_of_row_col_pairs: None
+
+        self._model = VirtualTableModel(self, columns, store)
+        self.setModel(self._model)
+
+        self._multi_line_rows = multi_line_rows
+
+        self.clicked.connect(lambda index: self.cellClicked.emit(index.row(), index.column()))
+        self.pressed.connect(lambda index: self.cellPressed.emit(index.row(), index.column()))
+
+        self.setShowGrid(False)
+        self.setWordWrap(False)
+        self.verticalHeader().setVisible(False)
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        # Resizing to contents would require rendering every row, so the row height is always fixed here
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        if multi_line_rows:
+            self.setAlternatingRowColors(True)
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.Fixed)
+
+        for idx, col in enumerate(self.columns):
+            # Same as above; the columns are sized once using the first rows instead
+            mode = QHeaderView.Interactive if col.resize_mode == QHeaderView.ResizeToContents else col.resize_mode
+            self.horizontalHeader().setSectionResizeMode(idx, mode)
+        self._columns_sized = False
+
+        if font:
+            self.setFont(font)
+        self._line_height = self.fontMetrics().lineSpacing()
+        self.verticalHeader().setDefaultSectionSize(self._line_height + 6)
+
+        self._model.modelReset.connect(lambda: self._update_row_heights(0, self._model.rowCount() - 1))
+
+    def model(self):
+        return self._model
+
+    def rowCount(self):
+        return self._model.rowCount()
+
+    def columnCount(self):
+        return self._model.columnCount()
+
+    @property
+    def store(self):
+        return self._model.store
+
+    def _update_row_heights(self, first_row, last_row):
+        if not self._multi_line_rows:
+            return
+        for row in range(first_row, last_row + 1):
+            lines = self._model.line_count(row)
+            if lines > 1:
+                self.verticalHeader().resizeSection(row, self._line_height * lines + 6)
+
+    def add_entries(self, entries):
+        first_row = self._model.rowCount()
+        self._model.append_entries(entries)
+        # Rows could have been evicted from the beginning, so the new rows are counted from the end
+        num_new = min(len(entries), self._model.rowCount())
+        self._update_row_heights(max(0, self._model.rowCount() - num_new), self._model.rowCount() - 1)
+        if not self._columns_sized and first_row == 0 and self._model.rowCount() > 0:
+            self._columns_sized = True
+            self.resizeColumnsToContents()
+
+    def clear(self):
+        self._model.clear()
+
+    def get_row_as_string(self, row, column_predicate=None):
+        out = []
+        for col in range(len(self.columns)):
+            if column_predicate and not column_predicate(self.columns[col]):
+                continue
+            out.append(self._model.render(row, col)[0])
+        return '\t'.join(out)
+
+    def set_filter(self, matcher):
+        self.filter = matcher
+        self._update_filter()
+
+    def set_pre_filter(self, predicate, select=None):
+        """
+        Sets a filter that is evaluated on the stored entries before anything is rendered; the text filter is then
+        evaluated only on the entries that passed it. The optional select() returns the sorted sequence numbers of
+        all matching stored entries at once, which is faster than evaluating the predicate per entry.
+        """
+        self._pre_filter = predicate
+        self._pre_filter_select = select
+        self._update_filter()
+
+    def _update_filter(self):
+        pre_filter, select, matcher = self._pre_filter, self._pre_filter_select, self.filter
+
+        if matcher is None:
+            if pre_filter is None:
+                self._model.set_filter(None)
+            else:
+                self._model.set_filter(pre_filter, select() if select is not None else None)
+            return
+
+        def text_predicate(seq):
+            entry = self._model.store.get_entry(seq)
+            texts = []
+            for c in self.columns:
+                if c.filterable:
+                    value = c.render(entry)
+                    texts.append(str(value[0] if isinstance(value, tuple) else value))
+            return matcher.match('\t'.join(texts))
+
+        if pre_filter is None:
+            self._model.set_filter(text_predicate)
+        elif select is not None:
+            self._model.set_filter(lambda seq: pre_filter(seq) and text_predicate(seq),
+                                   [seq for seq in select() if text_predicate(seq)])
+        else:
+            self._model.set_filter(lambda seq: pre_filter(seq) and text_predicate(seq))
+
+    def keyPressEvent(self, qkeyevent):
+        if qkeyevent.matches(QKeySequence.Copy):
+            selected_rows = [x.row() for x in self.selectionModel().selectedRows()]
+            logger.info('Copy to clipboard requested [%r rows]' % len(selected_rows))
+
+            out_string = ''
+            for row in selected_rows:
+                out_string += self.get_row_as_string(row) + os.linesep
+
+            if out_string:
+                QApplication.clipboard().setText(out_string)
+        else:
+            super(VirtualTable, self).keyPressEvent(qkeyevent)
+
+        if qkeyevent.matches(QKeySequence.InsertParagraphSeparator):
+            if self.hasFocus():
+                self.on_enter_pressed([(x.row(), x.column()) for x in self.selectedIndexes()])
+
+    # The search only relies on the QTableView API and get_row_as_string(), so it can be shared as is
+    search = BasicTable.search
+
+
 class CommitableComboBoxWithHistory(QComboBox):
     def __init__(self, parent):
         super(CommitableComboBoxWithHistory, self).__init__(parent)
@@ -455,14 +837,22 @@ class LabelWithIcon(QPushButton):
 
 
 class RealtimeLogWidget(QWidget):
-    def __init__(self, parent, started_by_default=False, pre_redraw_hook=None, **table_options):
+    def __init__(self, parent, started_by_default=False, pre_redraw_hook=None, store=None, **table_options):
+        """
+        If a store is provided, the log is kept in it via VirtualTable (see VirtualTableModel for the interface),
+        otherwise every entry is rendered into a BasicTable row straight away.
+        """
         super(RealtimeLogWidget, self).__init__(parent)
 
         self.on_selection_changed = None
+        self.on_row_selection_changed = None        # Accepts a list of (first row, last row) ranges, inclusive
 
         self.pre_redraw_hook = pre_redraw_hook or (lambda: None)
 
-        self._table = BasicTable(self, **table_options)
+        if store is not None:
+            self._table = VirtualTable(self, store=store, **table_options)
+        else:
+            self._table = BasicTable(self, **table_options)
         self._table.selectionModel().selectionChanged.connect(self._call_on_selection_changed)
 
         self._clear_button = make_icon_button('trash-o', 'Clear', self, on_clicked=self._clear)
@@ -489,7 +879,9 @@ class RealtimeLogWidget(QWidget):
         self._redraw_timer.timeout.connect(self._redraw)
         self._redraw_timer.start(100)
 
-        self._queue = queue.Queue()
+        # The entries received while paused are kept here; more entries than the store can hold would be evicted
+        # from it right away, so the queue is bounded by the capacity of the store, if there is one
+        self._queue = deque(maxlen=self._get_queue_limit())
 
         layout = QVBoxLayout(self)
 
@@ -524,16 +916,40 @@ class RealtimeLogWidget(QWidget):
         self._table.search(*args, **kwargs)
 
     def _clear(self):
-        self._table.setRowCount(0)
+        self._table.clear()
         self._row_count.setText(str(self._table.rowCount()))
 
+    def get_selected_row_ranges(self):
+        """Unlike selectedIndexes(), the cost does not depend on the number of selected cells"""
+        return [(r.top(), r.bottom()) for r in self._table.selectionModel().selection()]
+
     def _call_on_selection_changed(self):
+        if self.on_row_selection_changed:
+            self.on_row_selection_changed(self.get_selected_row_ranges())
+
         if not self.on_selection_changed:
             return
 
         selected_rows_cols = [(x.row(), x.column()) for x in self._table.selectedIndexes()]
         self.on_selection_changed(selected_rows_cols)
 
+    def _get_queue_limit(self):
+        return self._table.store.capacity if isinstance(self._table, VirtualTable) else None
+
+    def _take_queued_items(self):
+        if self._queue.maxlen != self._get_queue_limit():       # The capacity of the store has been changed
+            old_queue, self._queue = self._queue, deque(maxlen=self._get_queue_limit())
+            while old_queue:
+                self._queue.append(old_queue.popleft())
+
+        items = []
+        try:
+            while True:
+                items.append(self._queue.popleft())     # Thread safe, unlike iteration
+        except IndexError:
+            pass
+        return items
+
     def _redraw(self):
         self.pre_redraw_hook()
 
@@ -542,16 +958,15 @@ class RealtimeLogWidget(QWidget):
 
             do_scroll = False
             if not self.paused:
-                while True:
-                    try:
-                        item = self._queue.get_nowait()
-                    except queue.Empty:
-                        break
-
-                    row = self._table.rowCount()
-                    self._table.insertRow(row)
-                    self._table.set_row(row, item)
-                    do_scroll = True
+                items = self._take_queued_items()
+                if isinstance(self._table, VirtualTable):
+                    self._table.add_entries(items)
+                else:
+                    for item in items:
+                        row = self._table.rowCount()
+                        self._table.insertRow(row)
+                        self._table.set_row(row, item)
+                do_scroll = len(items) > 0
 
             self._table.setUpdatesEnabled(True)
 
@@ -561,14 +976,13 @@ class RealtimeLogWidget(QWidget):
             self._row_count.setText(str(self._table.rowCount()))
         else:
             # Discarding inputs
-            while self._queue.qsize() > 0:
-                self._queue.get_nowait()
+            self._queue.clear()
 
     def _on_start_button_clicked(self):
         self._pause.setChecked(False)
 
     def add_item_async(self, item):
-        self._queue.put_nowait(item)
+        self._queue.append(item)
 
     @property
     def table(self):
@@ -578,6 +992,10 @@ class RealtimeLogWidget(QWidget):
     def paused(self):
         return self._pause.isChecked()
 
+    @paused.setter
+    def paused(self, value):
+        self._pause.setChecked(value)
+
     @property
     def started(self):
         return self._start_button.isChecked()
@@ -605,9 +1023,7 @@ def make_icon_button(icon_name, tool_tip, parent, checkable=False, checked=False
     return b
 
 
-def map_7bit_to_color(value):
-    value = int(value) & 0x7f
-
+def _make_7bit_color(value):
     red = ((value >> 5) & 0b11) * 48        # 2 bits to red
     green = ((value >> 2) & 0b111) * 12     # 3 bits to green, because human eye is more sensitive in this wavelength
     blue = (value & 0b11) * 48              # 2 bits to blue
@@ -617,6 +1033,29 @@ def map_7bit_to_color(value):
     return col
 
 
+# Shared instances; must not be modified by the users
+_7BIT_PALETTE = [_make_7bit_color(x) for x in range(128)]
+
+
+def map_7bit_to_color(value):
+    return _7BIT_PALETTE[int(value) & 0x7f]
+
+
+_BRUSH_CACHE = {}
+
+
+def get_brush(color):
+    """Returns a shared QBrush of the specified color; the number of distinct colors in tables is small"""
+    rgba = color.rgba()
+    try:
+        return _BRUSH_CACHE[rgba]
+    except KeyError:
+        if len(_BRUSH_CACHE) > 4096:
+            _BRUSH_CACHE.clear()
+        brush = _BRUSH_CACHE[rgba] = QBrush(color)
+        return brush
+
+
 def get_monospace_font():
     preferred = ['Consolas', 'DejaVu Sans Mono', 'Monospace', 'Lucida Console', 'Monaco']
     for name in preferred:
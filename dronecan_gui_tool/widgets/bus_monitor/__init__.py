@@ -8,12 +8,15 @@
 
 import os
 import sys
-import queue
+import time
 import logging
 import multiprocessing
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import QTimer
 from .window import BusMonitorWindow
+from ..ipc_channel import IPCChannel
+from .frame_ring import FrameRingWriter, FrameRingReader
+from .transmit import Transmitter
 
 logger = logging.getLogger(__name__)
 
@@ -26,33 +29,33 @@ except AttributeError:
     PARENT_PID = os.getppid()
 
 
-class IPCChannel:
-    """
-    This class is built as an abstraction over the underlying IPC communication channel.
-    """
-    def __init__(self):
-        # Queue is slower than pipe, but it allows to implement non-blocking sending easier,
-        # and the buffer can be arbitrarily large.
-        self._q = multiprocessing.Queue()
+IPC_COMMAND_STOP = 'stop'
 
-    def send_nonblocking(self, obj):
-        try:
-            self._q.put_nowait(obj)
-        except queue.Full:
-            pass
+# The monitors have no node of their own, so the frames are transmitted by the parent process on their request.
+# Requests go via a separate channel as (command, argument); the status is reported back via the command channel.
+IPC_COMMAND_TRANSMIT = 'transmit'
+IPC_COMMAND_TRANSMIT_STOP = 'transmit_stop'
+IPC_TRANSMIT_STATUS = 'transmit_status'
 
-    def receive_nonblocking(self):
-        """Returns: (True, object) if successful, (False, None) if no data to read """
-        try:
-            return True, self._q.get_nowait()
-        except queue.Empty:
-            return False, None
 
+class _RemoteTransmitter:
+    """Same interface as Transmitter, used in the monitor process"""
+    def __init__(self, request_channel):
+        self._request_channel = request_channel
+        self.status = None
 
-IPC_COMMAND_STOP = 'stop'
+    def start(self, job):
+        self._request_channel.send_nonblocking((IPC_COMMAND_TRANSMIT, job))
+        self.status = 'TX requested'
 
+    def stop(self):
+        self._request_channel.send_nonblocking((IPC_COMMAND_TRANSMIT_STOP, None))
 
-def _process_entry_point(channel, iface_name):
+    def get_status_string(self):
+        return self.status
+
+
+def _process_entry_point(channel, request_channel, iface_name, frame_ring_name):
     logger.info('Bus monitor process started with PID %r', os.getpid())
     app = QApplication(sys.argv)    # Inheriting args from the parent process
 
@@ -67,16 +70,29 @@ def _process_entry_point(channel, iface_name):
     exit_check_timer.timeout.connect(exit_if_should)
     exit_check_timer.start(2000)
 
+    frame_ring = FrameRingReader(frame_ring_name)
+    received_frames = []
+    transmitter = _RemoteTransmitter(request_channel)
+
     def get_frame():
-        received, obj = channel.receive_nonblocking()
-        if received:
-            if obj == IPC_COMMAND_STOP:
+        # The control channel is polled only when the frames read from the ring are exhausted
+        if not received_frames:
+            received, obj = channel.receive_nonblocking()
+            if received and obj == IPC_COMMAND_STOP:
                 logger.info('Bus monitor process has received a stop request, goodbye')
                 app.exit(0)
-            else:
-                return obj
-
-    win = BusMonitorWindow(get_frame, iface_name)
+                return
+            if received and obj[0] == IPC_TRANSMIT_STATUS:
+                transmitter.status = obj[1]
+            received_frames.extend(reversed(frame_ring.read()))
+        if received_frames:
+            return received_frames.pop()
+
+    def get_ipc_status():
+        return 'Frame ring lag %d, lost %d' % (frame_ring.lag, frame_ring.overrun_count)
+
+    win = BusMonitorWindow(get_frame, iface_name, get_ipc_status=get_ipc_status, transmitter=transmitter)
+    app.aboutToQuit.connect(win.stop_recording)     # The capture file must be finalized on any kind of exit
     win.show()
 
     logger.info('Bus monitor process %r initialized successfully, now starting the event loop', os.getpid())
@@ -85,35 +101,85 @@ def _process_entry_point(channel, iface_name):
 
 # TODO: Duplicates PlotterManager; refactor into an abstract process factory
 class BusMonitorManager:
+    # Frames are published to the monitors in batches at this interval, or sooner if the batch fills up.
+    # The transmitters send their due frames at the same interval.
+    FRAME_RING_FLUSH_INTERVAL_MS = 10
+    TRANSMIT_STATUS_INTERVAL = 0.5
+
     def __init__(self, node, can_iface_name):
         self._node = node
         self._can_iface_name = can_iface_name
-        self._inferiors = []    # process object, channel
+        self._inferiors = []    # process object, channel, request channel, transmitter
         self._hook_handle = None
+        self._frame_ring = None
+        self._flush_timer = None
+        self._last_transmit_status_at = 0
 
     def _frame_hook(self, direction, frame):
-        for proc, channel in self._inferiors[:]:
-            if proc.is_alive():
-                try:
-                    channel.send_nonblocking((direction, frame))
-                except Exception:
-                    logger.error('Failed to send data to process %r', proc, exc_info=True)
+        if self._inferiors:
+            self._frame_ring.push(direction, frame)
+
+    def _process_requests(self, request_channel, transmitter):
+        while True:
+            received, obj = request_channel.receive_nonblocking()
+            if not received:
+                break
+            command, argument = obj
+            if command == IPC_COMMAND_TRANSMIT:
+                logger.info('Bus monitor requested transmission of %d frames', len(argument.frames))
+                transmitter.start(argument)
+            elif command == IPC_COMMAND_TRANSMIT_STOP:
+                transmitter.stop()
             else:
+                logger.warning('Unknown bus monitor request %r', command)
+
+    def _flush(self):
+        report_status = time.monotonic() - self._last_transmit_status_at >= self.TRANSMIT_STATUS_INTERVAL
+        if report_status:
+            self._last_transmit_status_at = time.monotonic()
+
+        for inferior in self._inferiors[:]:
+            proc, channel, request_channel, transmitter = inferior
+            if not proc.is_alive():
                 logger.info('Bus monitor process %r appears to be dead, removing', proc)
-                self._inferiors.remove((proc, channel))
+                transmitter.stop()
+                self._inferiors.remove(inferior)
+                continue
+            try:
+                self._process_requests(request_channel, transmitter)
+                transmitter.poll()
+                status = transmitter.get_status_string()
+                if report_status and status is not None:
+                    channel.send_nonblocking((IPC_TRANSMIT_STATUS, status))
+            except Exception:
+                logger.error('Failed to process the requests of bus monitor %r', proc, exc_info=True)
+
+        try:
+            self._frame_ring.flush()
+        except Exception:
+            logger.error('Failed to publish frames to the bus monitors', exc_info=True)
 
     def spawn_monitor(self):
-        channel = IPCChannel()
+        # The frames are delivered via the frame ring, the channels are only used for commands and requests
+        channel = IPCChannel(max_size=100)
+        request_channel = IPCChannel(max_size=10)
+
+        if self._frame_ring is None:
+            self._frame_ring = FrameRingWriter()
+            self._flush_timer = QTimer()
+            self._flush_timer.setSingleShot(False)
+            self._flush_timer.timeout.connect(self._flush)
+            self._flush_timer.start(self.FRAME_RING_FLUSH_INTERVAL_MS)
 
         if self._hook_handle is None:
             self._hook_handle = self._node.can_driver.add_io_hook(self._frame_hook)
 
         proc = multiprocessing.Process(target=_process_entry_point, name='bus_monitor',
-                                       args=(channel, self._can_iface_name))
+                                       args=(channel, request_channel, self._can_iface_name, self._frame_ring.name))
         proc.daemon = True
         proc.start()
 
-        self._inferiors.append((proc, channel))
+        self._inferiors.append((proc, channel, request_channel, Transmitter(self._node.can_driver.send)))
 
         logger.info('Spawned new bus monitor process %r', proc)
 
@@ -123,20 +189,25 @@ class BusMonitorManager:
         except Exception:
             pass
 
-        for _, channel in self._inferiors:
+        for _, channel, _, transmitter in self._inferiors:
+            transmitter.stop()
             try:
                 channel.send_nonblocking(IPC_COMMAND_STOP)
             except Exception:
                 pass
 
-        for proc, _ in self._inferiors:
+        for proc, *_ in self._inferiors:
             try:
                 proc.join(1)
             except Exception:
                 pass
 
-        for proc, _ in self._inferiors:
+        for proc, *_ in self._inferiors:
             try:
                 proc.terminate()
             except Exception:
                 pass
+
+        if self._frame_ring is not None:
+            self._flush_timer.stop()
+            self._frame_ring.close()
@@ -0,0 +1,211 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import time
+import numpy
+from .frame_buffer import MAX_PAYLOAD_LENGTH
+
+
+CRC15_POLYNOMIAL = 0x4599
+
+# CRC delimiter, ACK slot, ACK delimiter, end of frame, intermission
+CLASSIC_TRAILER_BITS = 1 + 1 + 1 + 7 + 3
+# The CRC delimiter is transmitted at the data bit rate in CAN FD, it is accounted in the data phase
+FD_TRAILER_BITS = 1 + 1 + 7 + 3
+# Stuff count: 3 bits of Gray-coded count and a parity bit
+FD_STUFF_COUNT_BITS = 4
+
+FD_LENGTHS = [0, 1, 2, 3, 4, 5, 6, 7, 8, 12, 16, 20, 24, 32, 48, 64]
+
+# Payload length --> DLC code and padded length, for all lengths up to the maximum
+_LENGTH_TO_DLC = numpy.searchsorted(FD_LENGTHS, numpy.arange(MAX_PAYLOAD_LENGTH + 1)).astype(numpy.int64)
+_LENGTH_TO_PADDED_LENGTH = numpy.array(FD_LENGTHS, dtype=numpy.int64)[_LENGTH_TO_DLC]
+
+
+def _to_bits(values, width):
+    """Returns (n, width) array of bits of the values, MSB first"""
+    return ((numpy.asarray(values, dtype=numpy.int64)[:, None] >> numpy.arange(width - 1, -1, -1)) & 1)\
+        .astype(numpy.uint8)
+
+
+def _make_header(can_id, dlc, extended, canfd):
+    """
+    Returns the bits from SOF to DLC inclusive and the number of bits transmitted at the nominal bit rate
+    (arbitration phase up to BRS inclusive; for classic frames everything is nominal).
+    """
+    n = len(can_id)
+    zero = numpy.zeros((n, 1), dtype=numpy.uint8)
+    one = numpy.ones((n, 1), dtype=numpy.uint8)
+    if extended:
+        fields = [zero, _to_bits(can_id >> 18, 11), one, one, _to_bits(can_id & 0x3FFFF, 18)]  # SOF..ID, SRR, IDE
+        if canfd:
+            fields += [zero, one, zero, one]            # RRS, FDF, res, BRS
+        else:
+            fields += [zero, zero, zero]                # RTR, r1, r0
+    else:
+        fields = [zero, _to_bits(can_id, 11)]
+        if canfd:
+            fields += [zero, zero, one, zero, one]      # RRS, IDE, FDF, res, BRS
+        else:
+            fields += [zero, zero, zero]                # RTR, IDE, r0
+    nominal_bits = sum(f.shape[1] for f in fields)
+    if canfd:
+        fields.append(zero)                             # ESI
+    fields.append(_to_bits(dlc, 4))
+    return numpy.hstack(fields), nominal_bits
+
+
+def _count_stuff_bits(bits, num_bits, nominal_bits, with_crc15):
+    """
+    Counts dynamic stuff bits in the first num_bits of every row of bits; if with_crc15 is set, the CRC-15 over these
+    bits is computed and stuffed as well. Rows are processed in parallel, one bit position at a time.
+    Returns (stuff bits in the nominal phase, stuff bits in the data phase).
+    """
+    n, width = bits.shape
+    num_columns = int(num_bits.max()) + (15 if with_crc15 else 0) if n else 0
+    run = numpy.zeros(n, dtype=numpy.int64)
+    last = numpy.full(n, 2, dtype=numpy.int64)
+    crc = numpy.zeros(n, dtype=numpy.int64)
+    stuff_nominal = numpy.zeros(n, dtype=numpy.int64)
+    stuff_data = numpy.zeros(n, dtype=numpy.int64)
+
+    for c in range(num_columns):
+        bit = bits[:, c].astype(numpy.int64) if c < width else numpy.zeros(n, dtype=numpy.int64)
+        in_frame = c < num_bits
+        if with_crc15:
+            crc_index = numpy.clip(c - num_bits, 0, 14)
+            bit = numpy.where(in_frame, bit, (crc >> (14 - crc_index)) & 1)
+            feedback = bit ^ ((crc >> 14) & 1)
+            crc = numpy.where(in_frame, ((crc << 1) & 0x7FFF) ^ (feedback * CRC15_POLYNOMIAL), crc)
+            active = c < num_bits + 15
+        else:
+            active = in_frame
+
+        run = numpy.where(bit == last, run + 1, 1)
+        last = bit
+        stuffed = active & (run == 5)
+        run = numpy.where(stuffed, 1, run)
+        last = numpy.where(stuffed, 1 - bit, last)      # The stuff bit is complementary and starts a new run
+
+        if c < nominal_bits:
+            stuff_nominal += stuffed
+        else:
+            stuff_data += stuffed
+
+    return stuff_nominal, stuff_data
+
+
+def compute_frame_bits(can_id, extended, canfd, length, payload):
+    """
+    Computes the on-wire length of every frame in bits, including stuff bits and the interframe space.
+    Inputs are arrays: CAN ID, extended flag, CAN FD flag, payload length in bytes and (n, 64) payload bytes.
+    Returns (bits at the nominal bit rate, bits in the CAN FD data phase) as arrays; the latter are transmitted at
+    the data bit rate if bit rate switching is used. Frames are assumed to be data frames without errors.
+    """
+    can_id = numpy.asarray(can_id, dtype=numpy.int64)
+    extended = numpy.asarray(extended, dtype=bool)
+    canfd = numpy.asarray(canfd, dtype=bool)
+    length = numpy.minimum(numpy.asarray(length, dtype=numpy.int64), MAX_PAYLOAD_LENGTH)
+    payload = numpy.asarray(payload, dtype=numpy.uint8)
+
+    nominal = numpy.zeros(len(can_id), dtype=numpy.int64)
+    data = numpy.zeros(len(can_id), dtype=numpy.int64)
+
+    for ext in (False, True):
+        for fd in (False, True):
+            rows = numpy.flatnonzero((extended == ext) & (canfd == fd))
+            if not len(rows):
+                continue
+
+            padded_length = _LENGTH_TO_PADDED_LENGTH[length[rows]] if fd else numpy.minimum(length[rows], 8)
+            dlc = _LENGTH_TO_DLC[padded_length]
+            header, nominal_header_bits = _make_header(can_id[rows], dlc, ext, fd)
+            max_length = int(padded_length.max())
+            payload_bits = numpy.unpackbits(payload[rows, :max_length], axis=1)
+            bits = numpy.hstack([header, payload_bits])
+            num_bits = header.shape[1] + padded_length * 8
+
+            stuff_nominal, stuff_data = _count_stuff_bits(bits, num_bits, nominal_header_bits, with_crc15=not fd)
+
+            if fd:
+                crc_length = numpy.where(padded_length > 16, 21, 17)
+                # A fixed stuff bit precedes the stuff count and follows every 4 bits of the stuff count and CRC
+                fixed_stuff_bits = 1 + (FD_STUFF_COUNT_BITS + crc_length) // 4
+                nominal[rows] = nominal_header_bits + stuff_nominal + FD_TRAILER_BITS
+                data[rows] = (num_bits - nominal_header_bits) + stuff_data + FD_STUFF_COUNT_BITS + crc_length + \
+                    fixed_stuff_bits + 1
+            else:
+                nominal[rows] = num_bits + 15 + stuff_nominal + stuff_data + CLASSIC_TRAILER_BITS
+
+    return nominal, data
+
+
+class BusUtilizationEstimator:
+    """
+    Accumulates the on-wire bit counts of frames in time buckets and reports the share of time the bus was busy.
+    Bit counts are stored rather than durations, so that changing the configured bit rates applies to the history.
+    """
+    BUCKET_DURATION = 0.1
+    MAX_WINDOW = 10.0
+
+    def __init__(self, nominal_bitrate=1000000, data_bitrate=4000000, bit_rate_switching=True):
+        self.nominal_bitrate = nominal_bitrate
+        self.data_bitrate = data_bitrate
+        self.bit_rate_switching = bit_rate_switching
+        self._buckets = {}                  # Bucket number : [nominal bits, data phase bits]
+        self._last_ts = None
+        self._last_ts_local = None
+
+    def add_frames(self, frames):
+        if not frames:
+            return
+        n = len(frames)
+        payload = numpy.zeros((n, MAX_PAYLOAD_LENGTH), dtype=numpy.uint8)
+        length = numpy.zeros(n, dtype=numpy.int64)
+        for i, f in enumerate(frames):
+            data = bytes(f.data[:MAX_PAYLOAD_LENGTH])
+            payload[i, :len(data)] = numpy.frombuffer(data, dtype=numpy.uint8)
+            length[i] = len(data)
+        nominal, data = compute_frame_bits([f.id for f in frames], [f.extended for f in frames],
+                                           [f.canfd for f in frames], length, payload)
+
+        buckets = (numpy.array([f.ts_monotonic for f in frames]) / self.BUCKET_DURATION).astype(numpy.int64)
+        unique, inverse = numpy.unique(buckets, return_inverse=True)
+        for bucket, n_bits, d_bits in zip(unique.tolist(),
+                                          numpy.bincount(inverse, weights=nominal).tolist(),
+                                          numpy.bincount(inverse, weights=data).tolist()):
+            entry = self._buckets.setdefault(bucket, [0, 0])
+            entry[0] += n_bits
+            entry[1] += d_bits
+
+        self._last_ts = frames[-1].ts_monotonic
+        self._last_ts_local = time.monotonic()
+
+        oldest = int(unique[-1]) - int(round(self.MAX_WINDOW / self.BUCKET_DURATION))
+        for bucket in [b for b in self._buckets if b <= oldest]:
+            del self._buckets[bucket]
+
+    @property
+    def now(self):
+        """The current time on the clock of the frame timestamps, or None if no frames have been seen yet"""
+        if self._last_ts is None:
+            return None
+        return self._last_ts + (time.monotonic() - self._last_ts_local)
+
+    def get_utilization(self, window=1.0):
+        """Returns the bus utilization in percent over the specified window ending now"""
+        if self.now is None:
+            return 0
+        first_bucket = int(self.now / self.BUCKET_DURATION) - int(round(window / self.BUCKET_DURATION))
+        data_bitrate = self.data_bitrate if self.bit_rate_switching else self.nominal_bitrate
+        busy = 0
+        for bucket, (nominal_bits, data_bits) in self._buckets.items():
+            if bucket > first_bucket:
+                busy += nominal_bits / self.nominal_bitrate + data_bits / data_bitrate
+        return 100 * busy / window
+
+    def clear(self):
+        self._buckets.clear()
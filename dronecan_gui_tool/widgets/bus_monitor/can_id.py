@@ -0,0 +1,73 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+#
+# Fields of the 29-bit DroneCAN CAN ID:
+#   Message:            priority (5 bits), message type ID (16 bits), service flag = 0, source node ID (7 bits)
+#   Anonymous message:  same, but only the lowest two bits of the message type ID are present; source node ID is 0
+#   Service:            priority (5 bits), service type ID (8 bits), request flag, destination node ID (7 bits),
+#                       service flag = 1, source node ID (7 bits)
+# The decoders accept the CAN IDs of extended frames only; standard frames are not DroneCAN frames.
+#
+
+import numpy
+import dronecan
+from .frame_buffer import FLAG_EXTENDED
+
+# Data type keys are data type IDs; service type IDs are distinguished by this flag
+SERVICE_TYPE_KEY_FLAG = 1 << 16
+NO_DATA_TYPE_KEY = -1
+
+
+def get_priority(can_id):
+    return (can_id >> 24) & 0x1F
+
+
+def get_source_node_id(can_id):
+    """Source node ID; 0 for anonymous messages"""
+    return can_id & 0x7F
+
+
+def is_service(can_id):
+    return bool((can_id >> 7) & 1)
+
+
+def get_destination_node_id(can_id):
+    """Destination node ID of a service frame, None for a message frame"""
+    return (can_id >> 8) & 0x7F if (can_id >> 7) & 1 else None
+
+
+def get_data_type_key(can_id):
+    if (can_id >> 7) & 1:
+        return ((can_id >> 16) & 0xFF) | SERVICE_TYPE_KEY_FLAG
+    if can_id & 0x7F:
+        return (can_id >> 8) & 0xFFFF
+    return (can_id >> 8) & 0b11         # Anonymous message
+
+
+def compute_data_type_keys(can_ids, flags):
+    """Vectorized get_data_type_key(); frames without FLAG_EXTENDED in flags get NO_DATA_TYPE_KEY"""
+    can_ids = can_ids.astype(numpy.int64)
+    service = ((can_ids >> 7) & 1).astype(bool)
+    message_type_id = (can_ids >> 8) & 0xFFFF
+    message_type_id = numpy.where((can_ids & 0x7F) == 0, message_type_id & 0b11, message_type_id)  # Anonymous
+    service_type_id = ((can_ids >> 16) & 0xFF) | SERVICE_TYPE_KEY_FLAG
+    keys = numpy.where(service, service_type_id, message_type_id)
+    keys[(flags & FLAG_EXTENDED) == 0] = NO_DATA_TYPE_KEY
+    return keys
+
+
+def get_data_type_name(key):
+    if key == NO_DATA_TYPE_KEY:
+        return 'N/A'
+    if key & SERVICE_TYPE_KEY_FLAG:
+        type_id, kind, what = key & 0xFF, dronecan.dsdl.CompoundType.KIND_SERVICE, 'service'
+    else:
+        type_id, kind, what = key, dronecan.dsdl.CompoundType.KIND_MESSAGE, 'message'
+    try:
+        return dronecan.DATATYPES[(type_id, kind)].full_name
+    except KeyError:
+        return '<unknown %s %d>' % (what, type_id)
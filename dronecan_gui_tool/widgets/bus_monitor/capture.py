@@ -0,0 +1,226 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import gzip
+import time
+import queue
+import struct
+import logging
+import threading
+from dronecan.driver import CANFrame
+from .frame_buffer import FLAG_EXTENDED, FLAG_CANFD, FLAG_TX, MAX_PAYLOAD_LENGTH, get_frame_flags
+
+logger = logging.getLogger(__name__)
+
+#
+# Capture file format, all values are little-endian:
+#   File header:    magic (8 bytes), format version (u16), reserved (6 bytes)
+#   Frame record:   ts_monotonic (f64), ts_real (f64), CAN ID (u32), flags (u8), payload length (u8), payload
+# The flags are the same as in the frame buffer. A capture may be gzip-compressed as a whole.
+#
+CAPTURE_MAGIC = b'DCANCAP\x00'
+CAPTURE_FORMAT_VERSION = 1
+
+FILE_EXTENSION = '.dcap'
+COMPRESSED_FILE_EXTENSION = '.dcap.gz'
+
+FILE_HEADER = struct.Struct('<8sH6x')
+RECORD_HEADER = struct.Struct('<ddIBB')
+
+
+class CaptureFormatError(Exception):
+    pass
+
+
+def pack_frame(direction, frame):
+    data = bytes(frame.data[:MAX_PAYLOAD_LENGTH])
+    return RECORD_HEADER.pack(frame.ts_monotonic, frame.ts_real, frame.id, get_frame_flags(direction, frame),
+                              len(data)) + data
+
+
+def make_frame(ts_monotonic, ts_real, can_id, flags, data):
+    """Inverse of pack_frame(); returns (direction, CANFrame)"""
+    frame = CANFrame(can_id, data, bool(flags & FLAG_EXTENDED), ts_monotonic=ts_monotonic, ts_real=ts_real,
+                     canfd=bool(flags & FLAG_CANFD))
+    return ('tx' if flags & FLAG_TX else 'rx'), frame
+
+
+def is_compressed(path):
+    return path.endswith('.gz')
+
+
+def open_capture(path):
+    """Opens a capture file for reading and validates its header; the returned file is positioned at the first record"""
+    f = gzip.open(path, 'rb') if is_compressed(path) else open(path, 'rb', buffering=CaptureWriter.WRITE_BUFFER_SIZE)
+    try:
+        header = f.read(FILE_HEADER.size)
+        if len(header) < FILE_HEADER.size:
+            raise CaptureFormatError('%s: file is too short' % path)
+        magic, version = FILE_HEADER.unpack(header)
+        if magic != CAPTURE_MAGIC:
+            raise CaptureFormatError('%s: not a capture file' % path)
+        if version != CAPTURE_FORMAT_VERSION:
+            raise CaptureFormatError('%s: unsupported capture format version %d' % (path, version))
+    except Exception:
+        f.close()
+        raise
+    return f
+
+
+def iter_capture(path, chunk_size=1024 * 1024):
+    """
+    Yields (direction, CANFrame) for every record in the capture file.
+    A truncated last record, which is what an interrupted recording leaves behind, is ignored.
+    """
+    with open_capture(path) as f:
+        buf = b''
+        offset = 0
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            buf = buf[offset:] + chunk
+            offset = 0
+            while offset + RECORD_HEADER.size <= len(buf):
+                ts_mono, ts_real, can_id, flags, length = RECORD_HEADER.unpack_from(buf, offset)
+                end = offset + RECORD_HEADER.size + length
+                if end > len(buf):
+                    break
+                yield make_frame(ts_mono, ts_real, can_id, flags, buf[offset + RECORD_HEADER.size:end])
+                offset = end
+
+        if offset < len(buf):
+            logger.warning('%s: ignoring %d bytes of incomplete record at the end', path, len(buf) - offset)
+
+
+class CaptureWriter:
+    """
+    Streams frames to capture files from a background thread.
+    Frames are pushed from the GUI thread and handed over to the writer thread in batches by flush().
+    Optionally, the capture is split into multiple files once a file exceeds the size or duration limit;
+    in that case the file names are suffixed with the segment number.
+    If the writer thread falls behind by more than QUEUE_SIZE batches, further batches are dropped and counted.
+    """
+    QUEUE_SIZE = 1000       # Batches; flush() is normally invoked every few milliseconds
+    WRITE_BUFFER_SIZE = 1024 * 1024
+    COMPRESSION_LEVEL = 1
+
+    def __init__(self, path, compress=False, max_file_size=None, max_file_duration=None):
+        self._path = path
+        self._compress = compress
+        self._max_file_size = max_file_size or None
+        self._max_file_duration = max_file_duration or None
+
+        self._pending = []
+        self._queue = queue.Queue(self.QUEUE_SIZE)
+
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.bytes_written = 0
+        self.files = []
+        self.error = None
+
+        self._raw_file = None
+        self._file = None
+        self._file_opened_at = 0
+
+        self._thread = threading.Thread(target=self._run, name='capture_writer', daemon=True)
+        self._thread.start()
+
+    @property
+    def _rotation_enabled(self):
+        return self._max_file_size is not None or self._max_file_duration is not None
+
+    def _make_file_name(self):
+        base = self._path
+        for ext in (COMPRESSED_FILE_EXTENSION, FILE_EXTENSION):
+            if base.endswith(ext):
+                base = base[:-len(ext)]
+                break
+        if self._rotation_enabled:
+            base += '_%04d' % (len(self.files) + 1)
+        return base + (COMPRESSED_FILE_EXTENSION if self._compress else FILE_EXTENSION)
+
+    def _open_next_file(self):
+        self._close_file()
+        path = self._make_file_name()
+        logger.info('Opening capture file %r', path)
+        self._raw_file = open(path, 'wb', buffering=self.WRITE_BUFFER_SIZE)
+        if self._compress:
+            self._file = gzip.GzipFile(fileobj=self._raw_file, mode='wb', compresslevel=self.COMPRESSION_LEVEL)
+        else:
+            self._file = self._raw_file
+        self._file.write(FILE_HEADER.pack(CAPTURE_MAGIC, CAPTURE_FORMAT_VERSION))
+        self._file_opened_at = time.monotonic()
+        self.files.append(path)
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            if self._file is not self._raw_file:
+                self._raw_file.close()
+        self._file = None
+        self._raw_file = None
+
+    def _need_rotation(self):
+        # The size is checked on the underlying file, so that the limit applies to compressed data as well
+        if self._max_file_size is not None and self._raw_file.tell() >= self._max_file_size:
+            return True
+        if self._max_file_duration is not None and \
+                time.monotonic() - self._file_opened_at >= self._max_file_duration:
+            return True
+        return False
+
+    def _run(self):
+        try:
+            self._open_next_file()
+            while True:
+                batch = self._queue.get()
+                if batch is None:
+                    break
+                if self._need_rotation():
+                    self._open_next_file()
+                data = b''.join(pack_frame(d, f) for d, f in batch)
+                self._file.write(data)
+                self.bytes_written += len(data)
+                self.frames_written += len(batch)
+        except Exception as ex:
+            logger.error('Capture writer failed', exc_info=True)
+            self.error = ex
+        finally:
+            try:
+                self._close_file()
+            except Exception as ex:
+                logger.error('Could not close the capture file', exc_info=True)
+                self.error = self.error or ex
+
+    def push(self, direction, frame):
+        self._pending.append((direction, frame))
+
+    def flush(self):
+        if self._pending:
+            try:
+                self._queue.put_nowait(self._pending)
+            except queue.Full:
+                self.frames_dropped += len(self._pending)
+            self._pending = []
+
+    def close(self):
+        self.flush()
+        # The queue may be full, and the thread may have died on an error, in which case nobody would consume it
+        while self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=0.1)
+                break
+            except queue.Full:
+                pass
+        self._thread.join()
+        if self.frames_dropped:
+            logger.warning('Capture writer has dropped %d frames', self.frames_dropped)
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
@@ -0,0 +1,213 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import os
+import datetime
+import numpy
+from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QComboBox, \
+    QPlainTextEdit, QSplitter, QFileDialog, QProgressDialog, QApplication
+from PyQt5.QtGui import QTextOption
+from PyQt5.QtCore import Qt
+from logging import getLogger
+from .. import VirtualTable, get_monospace_font, get_app_icon, make_icon_button, flash, show_error
+from .capture import FILE_EXTENSION
+from .capture_index import MappedCapture
+from .can_id import compute_data_type_keys, get_data_type_name
+from .transfer_decoder import decode_transfer
+from .selection_stats import SelectionSummary, ranges_to_rows
+from .window import COLUMNS
+
+
+logger = getLogger(__name__)
+
+
+def parse_time(text, reference_ts):
+    """
+    Parses a local time in one of the formats below into a POSIX timestamp.
+    If the date is not specified, it is taken from the reference timestamp.
+    """
+    text = text.strip()
+    for fmt in ('%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%d %H:%M:%S'):
+        try:
+            return datetime.datetime.strptime(text, fmt).timestamp()
+        except ValueError:
+            pass
+    reference_date = datetime.datetime.fromtimestamp(reference_ts).date()
+    for fmt in ('%H:%M:%S.%f', '%H:%M:%S', '%H:%M'):
+        try:
+            t = datetime.datetime.strptime(text, fmt).time()
+            return datetime.datetime.combine(reference_date, t).timestamp()
+        except ValueError:
+            pass
+    raise ValueError('Could not parse time %r' % text)
+
+
+class CaptureBrowserWindow(QMainWindow):
+    """
+    Displays a capture file without loading it, see MappedCapture. Seeking and filtering are served by the indexes.
+    """
+    def __init__(self, capture):
+        super(CaptureBrowserWindow, self).__init__()
+        self.setWindowTitle('Capture browser (%s)' % os.path.basename(capture.path))
+        self.setWindowIcon(get_app_icon())
+
+        self._capture = capture
+
+        self._table = VirtualTable(self, columns=COLUMNS, store=capture, font=get_monospace_font())
+        self._table.cellClicked.connect(lambda row, col: self._decode_transfer_at_row(row))
+        self._table.selectionModel().selectionChanged.connect(self._on_selection_changed)
+
+        self._time_edit = QLineEdit(self)
+        self._time_edit.setPlaceholderText('HH:MM:SS.ffffff')
+        self._time_edit.setToolTip('Local time to go to; the date can be specified as YYYY-MM-DD HH:MM:SS')
+        self._time_edit.returnPressed.connect(self._seek)
+        seek_button = make_icon_button('clock-o', 'Go to the first frame not older than the specified time', self,
+                                       on_clicked=self._seek)
+
+        self._can_id_edit = QLineEdit(self)
+        self._can_id_edit.setPlaceholderText('CAN IDs (hex)')
+        self._can_id_edit.setToolTip('Comma-separated list of CAN IDs to show; all IDs are shown if empty')
+        self._can_id_edit.returnPressed.connect(self._apply_filter)
+
+        self._data_type_combo = QComboBox(self)
+        self._data_type_combo.addItem('All data types', None)
+        type_names = [(get_data_type_name(k), k, n) for k, n in capture.index.get_data_type_counts().items()]
+        for name, key, count in sorted(type_names):
+            self._data_type_combo.addItem('%s (%d)' % (name, count), key)
+        self._data_type_combo.currentIndexChanged.connect(self._apply_filter)
+
+        filter_button = make_icon_button('filter', 'Apply filter', self, on_clicked=self._apply_filter)
+
+        self._decoded_message_box = QPlainTextEdit(self)
+        self._decoded_message_box.setReadOnly(True)
+        self._decoded_message_box.setFont(get_monospace_font())
+        self._decoded_message_box.setPlainText('Click on a row to see decoded transfer')
+        self._decoded_message_box.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self._decoded_message_box.setWordWrapMode(QTextOption.NoWrap)
+
+        controls_layout = QHBoxLayout()
+        controls_layout.addWidget(QLabel('Go to:', self))
+        controls_layout.addWidget(self._time_edit)
+        controls_layout.addWidget(seek_button)
+        controls_layout.addWidget(QLabel('Filter:', self))
+        controls_layout.addWidget(self._can_id_edit)
+        controls_layout.addWidget(self._data_type_combo, 1)
+        controls_layout.addWidget(filter_button)
+
+        splitter = QSplitter(Qt.Vertical, self)
+        splitter.addWidget(self._table)
+        splitter.addWidget(self._decoded_message_box)
+        splitter.setStretchFactor(0, 4)
+        splitter.setStretchFactor(1, 1)
+
+        widget = QWidget(self)
+        layout = QVBoxLayout(widget)
+        layout.addLayout(controls_layout)
+        layout.addWidget(splitter, 1)
+        widget.setLayout(layout)
+
+        self.setCentralWidget(widget)
+        self.resize(1000, 700)
+
+        if len(capture):
+            self._table.resizeColumnsToContents()
+            ts_format = '%Y-%m-%d %H:%M:%S'
+            first = datetime.datetime.fromtimestamp(capture.get_ts_real(0)).strftime(ts_format)
+            last = datetime.datetime.fromtimestamp(capture.get_ts_real(len(capture) - 1)).strftime(ts_format)
+            self.statusBar().addPermanentWidget(QLabel('%d frames, %s - %s' % (len(capture), first, last), self))
+
+    def _seek(self):
+        if not len(self._capture) or not self._time_edit.text().strip():
+            return
+        try:
+            ts = parse_time(self._time_edit.text(), self._capture.get_ts_real(0))
+        except ValueError as ex:
+            flash(self, str(ex), duration=10)
+            return
+
+        model = self._table.model()
+        row = model.seq_to_row(self._capture.find_time(ts), nearest=True)
+        if row is None:
+            flash(self, 'Nothing found', duration=10)
+            return
+
+        self._table.selectRow(row)
+        self._table.scrollTo(model.index(row, 0), VirtualTable.PositionAtTop)
+
+    def _apply_filter(self):
+        try:
+            can_ids = [int(x, 16) for x in self._can_id_edit.text().replace(',', ' ').split()] or None
+        except ValueError:
+            flash(self, 'Invalid CAN ID list', duration=10)
+            return
+
+        data_type_key = self._data_type_combo.currentData()
+        data_type_keys = [data_type_key] if data_type_key is not None else None
+
+        model = self._table.model()
+        if can_ids is None and data_type_keys is None:
+            model.set_filter(None)
+            return
+
+        def predicate(seq):
+            direction, frame = self._capture.get(seq)
+            if can_ids is not None and frame.id not in can_ids:
+                return False
+            if data_type_keys is not None:
+                flags = numpy.array([1 if frame.extended else 0], dtype=numpy.uint8)
+                key = compute_data_type_keys(numpy.array([frame.id], dtype=numpy.uint32), flags)[0]
+                return key in data_type_keys
+            return True
+
+        model.set_filter(predicate, self._capture.index.lookup(can_ids, data_type_keys))
+        flash(self, '%d frames match the filter', model.rowCount(), duration=5)
+
+    def _on_selection_changed(self):
+        rows = ranges_to_rows([(r.top(), r.bottom()) for r in self._table.selectionModel().selection()])
+        if len(rows) < 2:
+            return
+        summary = SelectionSummary(self._capture, self._table.model().rows_to_seqs(rows))
+        flash(self, '%d frames, %d bytes, timedelta %.6f sec, %s',
+              summary.count, summary.num_bytes, summary.duration, summary.get_load_string())
+        self._decoded_message_box.setPlainText(summary.get_report())
+
+    def _decode_transfer_at_row(self, row):
+        try:
+            seq = self._table.model().row_to_seq(row)
+            _, text = decode_transfer(seq, self._capture, self._capture)
+        except Exception as ex:
+            text = 'Transfer could not be decoded:\n' + str(ex)
+
+        self._decoded_message_box.setPlainText(text.strip())
+
+
+def open_capture_browser(parent):
+    """Asks the user for a capture file, indexes it if needed and opens a browser window; returns the window"""
+    path = QFileDialog().getOpenFileName(parent, 'Select capture file to browse', os.path.expanduser('~'),
+                                         'DroneCAN capture (*%s)' % FILE_EXTENSION)[0]
+    if not path:
+        return None
+
+    progress = QProgressDialog('Indexing %s...' % os.path.basename(path), None, 0, 100, parent)
+    progress.setWindowModality(Qt.WindowModal)
+    progress.setMinimumDuration(500)
+
+    def on_progress(fraction):
+        progress.setValue(int(fraction * 100))
+        QApplication.processEvents()
+
+    try:
+        capture = MappedCapture(path, progress_callback=on_progress)
+    except Exception as ex:
+        logger.error('Could not open capture %r', path, exc_info=True)
+        show_error('Capture browser', 'Could not open the capture file', ex, parent)
+        return None
+    finally:
+        progress.close()
+
+    win = CaptureBrowserWindow(capture)
+    win.show()
+    return win
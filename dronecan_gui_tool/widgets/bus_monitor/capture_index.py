@@ -0,0 +1,349 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import os
+import struct
+import logging
+import numpy
+from .capture import FILE_HEADER, RECORD_HEADER, CaptureFormatError, open_capture, is_compressed, make_frame
+from .frame_buffer import FLAG_EXTENDED, FLAG_CANFD, FLAG_TX, MAX_PAYLOAD_LENGTH
+from .can_id import compute_data_type_keys
+from .transfer_decoder import DecodingFailedException, _get_transfer_id, _is_start_of_transfer, _is_end_of_transfer
+
+logger = logging.getLogger(__name__)
+
+
+SIDECAR_EXTENSION = '.idx'
+
+#
+# Sidecar file format, all values are little-endian:
+#   Header:         magic (8 bytes), format version (u16), reserved (6 bytes), capture file size (u64),
+#                   capture file modification time in ns (i64), number of arrays (u64)
+#   Array table:    name (16 bytes), numpy dtype string (8 bytes), offset (u64), length (u64), for every array
+#   Array data, aligned at 8 bytes
+# The sidecar is discarded and rebuilt if the size or the modification time of the capture does not match.
+#
+_INDEX_MAGIC = b'DCANIDX\x00'
+_INDEX_FORMAT_VERSION = 1
+_INDEX_HEADER = struct.Struct('<8sH6xQqQ')
+_INDEX_ARRAY_ENTRY = struct.Struct('<16s8sQQ')
+
+# Same layout as RECORD_HEADER
+_RECORD_HEADER_DTYPE = numpy.dtype([('ts_mono', '<f8'), ('ts_real', '<f8'), ('can_id', '<u4'),
+                                    ('flags', 'u1'), ('length', 'u1')])
+
+
+def _find_records(data, start, limit):
+    """
+    Locates the consecutive records that begin at the start offset and before the limit offset, without walking
+    them one by one: every byte that could begin a record header is linked to the end of that record, then the chain
+    of links from the start is followed by pointer doubling. Every record header passes the same sanity checks as
+    pack_frame() output would; the chain stops before a record that does not pass them or does not fit in the file.
+    Returns (record offsets, end offset of the last record); no records if there is no valid record at the start.
+    """
+    window = numpy.asarray(data[start:min(limit + RECORD_HEADER.size + MAX_PAYLOAD_LENGTH, len(data))])
+    top = max(0, min(limit - start, len(window) - RECORD_HEADER.size + 1))
+    fields = _RECORD_HEADER_DTYPE.fields
+
+    def column(name, byte=0):
+        offset = fields[name][1] + byte
+        return window[offset:offset + top]
+
+    length = column('length')
+    plausible = (length <= MAX_PAYLOAD_LENGTH) & \
+                ((column('flags') & ~numpy.uint8(FLAG_EXTENDED | FLAG_CANFD | FLAG_TX)) == 0) & \
+                (column('can_id', 3) < 0x20) & \
+                (numpy.arange(top) + RECORD_HEADER.size + length <= len(window))
+    candidates = numpy.flatnonzero(plausible)
+    num_candidates = len(candidates)
+    if not num_candidates or candidates[0] != 0:
+        return candidates[:0], start
+
+    # The candidate that follows every candidate; num_candidates means none
+    ends = candidates + RECORD_HEADER.size + length[candidates]
+    candidate_at = numpy.full(top + 1, num_candidates, dtype=numpy.intp)
+    candidate_at[candidates] = numpy.arange(num_candidates)
+    jump = numpy.append(candidate_at[numpy.minimum(ends, top)], num_candidates)
+
+    # jumps[k] leads 2**k records ahead; the records are at least the header long, which bounds the chain length
+    max_chain_length = min(num_candidates, -(-top // RECORD_HEADER.size))
+    jumps = [jump]
+    while (1 << len(jumps)) < max_chain_length:
+        jumps.append(jumps[-1][jumps[-1]])
+    chain = numpy.zeros(1, dtype=numpy.intp)
+    for jump in reversed(jumps):
+        ahead = jump[chain]
+        chain = numpy.concatenate((chain, ahead[ahead < num_candidates]))
+    chain.sort()
+
+    last = chain[-1]
+    return candidates[chain] + start, int(ends[last]) + start
+
+
+def _group_by_key(keys):
+    """Returns (unique keys, start of every group plus the end, record numbers grouped by key in original order)"""
+    order = numpy.argsort(keys, kind='stable').astype(numpy.uint32)
+    unique, starts = numpy.unique(keys[order], return_index=True)
+    starts = numpy.append(starts, len(keys)).astype(numpy.uint64)
+    return unique, starts, order
+
+
+class CaptureIndex:
+    """
+    Indexes of an uncompressed capture file:
+        offsets             - byte offset of every record, which provides random access by record number;
+        sparse_ts           - real timestamp of every SPARSE_TIME_INDEX_STEP-th record, for seeking by time;
+        id_* and type_*     - record numbers grouped by CAN ID and by data type key, for filtering.
+    """
+    SPARSE_TIME_INDEX_STEP = 1024
+    BUILD_CHUNK_SIZE = 65536        # Bytes of the capture that are scanned for records at once
+    ARRAYS = ['offsets', 'sparse_ts',
+              'id_keys', 'id_starts', 'id_records',
+              'type_keys', 'type_starts', 'type_records']
+
+    def __init__(self, **arrays):
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+
+    @classmethod
+    def build(cls, path, progress_callback=None):
+        if is_compressed(path):
+            raise CaptureFormatError('%s: compressed captures cannot be memory-mapped, decompress it first' % path)
+        open_capture(path).close()      # Validating the header
+
+        size = os.path.getsize(path)
+        data = numpy.memmap(path, dtype=numpy.uint8, mode='r')
+        chunks = []
+        offset = FILE_HEADER.size
+        while offset + RECORD_HEADER.size <= size:
+            found, end = _find_records(data, offset, offset + cls.BUILD_CHUNK_SIZE)
+            if not len(found):
+                break
+            chunks.append(found)
+            offset = end
+            if progress_callback is not None:
+                progress_callback(offset / size)
+        if offset < size:
+            logger.warning('%s: ignoring %d bytes of invalid or incomplete records at the end', path, size - offset)
+
+        offsets = numpy.concatenate(chunks).astype(numpy.uint64) if chunks else numpy.zeros(0, numpy.uint64)
+        if len(offsets) >= 2 ** 32:
+            raise CaptureFormatError('%s: too many records' % path)
+
+        can_ids = numpy.zeros(len(offsets), dtype=numpy.uint32)
+        flags = numpy.zeros(len(offsets), dtype=numpy.uint8)
+        chunk = 1024 * 1024
+        for start in range(0, len(offsets), chunk):
+            o = offsets[start:start + chunk].astype(numpy.int64)
+            raw = numpy.ascontiguousarray(data[o[:, None] + numpy.arange(RECORD_HEADER.size)])
+            headers = raw.view(_RECORD_HEADER_DTYPE).ravel()
+            can_ids[start:start + chunk] = headers['can_id']
+            flags[start:start + chunk] = headers['flags']
+
+        sparse_o = offsets[::cls.SPARSE_TIME_INDEX_STEP].astype(numpy.int64)
+        sparse_ts = numpy.ascontiguousarray(data[(sparse_o + 8)[:, None] + numpy.arange(8)]).view('<f8').ravel()
+        del data
+
+        id_keys, id_starts, id_records = _group_by_key(can_ids)
+        type_keys, type_starts, type_records = _group_by_key(compute_data_type_keys(can_ids, flags))
+        return cls(offsets=offsets, sparse_ts=sparse_ts.copy(),
+                   id_keys=id_keys.astype(numpy.uint32), id_starts=id_starts, id_records=id_records,
+                   type_keys=type_keys.astype(numpy.int64), type_starts=type_starts, type_records=type_records)
+
+    def save(self, sidecar_path, capture_path):
+        st = os.stat(capture_path)
+        arrays = [(name, numpy.ascontiguousarray(getattr(self, name))) for name in self.ARRAYS]
+        offset = _INDEX_HEADER.size + _INDEX_ARRAY_ENTRY.size * len(arrays)
+        table = []
+        for name, a in arrays:
+            offset = (offset + 7) // 8 * 8
+            table.append(_INDEX_ARRAY_ENTRY.pack(name.encode(), a.dtype.str.encode(), offset, len(a)))
+            offset += a.nbytes
+
+        with open(sidecar_path, 'wb') as f:
+            f.write(_INDEX_HEADER.pack(_INDEX_MAGIC, _INDEX_FORMAT_VERSION, st.st_size, st.st_mtime_ns, len(arrays)))
+            f.write(b''.join(table))
+            for name, a in arrays:
+                f.write(b'\0' * ((8 - f.tell() % 8) % 8))
+                f.write(a.tobytes())
+
+    @classmethod
+    def load(cls, sidecar_path, capture_path):
+        """Memory-maps the arrays of the sidecar; returns None if the sidecar is missing or stale"""
+        try:
+            with open(sidecar_path, 'rb') as f:
+                header = f.read(_INDEX_HEADER.size)
+                magic, version, capture_size, capture_mtime, num_arrays = _INDEX_HEADER.unpack(header)
+                table = f.read(_INDEX_ARRAY_ENTRY.size * num_arrays)
+        except (OSError, struct.error):
+            return None
+
+        st = os.stat(capture_path)
+        if magic != _INDEX_MAGIC or version != _INDEX_FORMAT_VERSION or \
+                capture_size != st.st_size or capture_mtime != st.st_mtime_ns:
+            logger.info('Sidecar index %r is stale', sidecar_path)
+            return None
+
+        arrays = {}
+        for name, dtype, offset, length in _INDEX_ARRAY_ENTRY.iter_unpack(table):
+            name = name.rstrip(b'\0').decode()
+            dtype = numpy.dtype(dtype.rstrip(b'\0').decode())
+            if length:
+                arrays[name] = numpy.memmap(sidecar_path, dtype=dtype, mode='r', offset=offset, shape=(length,))
+            else:
+                arrays[name] = numpy.zeros(0, dtype=dtype)
+        if set(arrays) != set(cls.ARRAYS):
+            return None
+        return cls(**arrays)
+
+    @staticmethod
+    def _lookup(keys, starts, records, wanted):
+        out = []
+        for key in wanted:
+            idx = numpy.searchsorted(keys, key)
+            if idx < len(keys) and keys[idx] == key:
+                out.append(records[int(starts[idx]):int(starts[idx + 1])])
+        if len(out) == 1:
+            return out[0]
+        return numpy.sort(numpy.concatenate(out)) if out else numpy.zeros(0, dtype=numpy.uint32)
+
+    def lookup(self, can_ids=None, data_type_keys=None):
+        """Returns the sorted record numbers matching any of the CAN IDs and any of the data type keys"""
+        out = None
+        if can_ids is not None:
+            out = self._lookup(self.id_keys, self.id_starts, self.id_records, can_ids)
+        if data_type_keys is not None:
+            by_type = self._lookup(self.type_keys, self.type_starts, self.type_records, data_type_keys)
+            out = by_type if out is None else numpy.intersect1d(out, by_type, assume_unique=True)
+        return out
+
+    def get_data_type_counts(self):
+        """Returns {data type key: number of frames}"""
+        return dict(zip((int(x) for x in self.type_keys), (int(x) for x in numpy.diff(self.type_starts))))
+
+
+class MappedCapture:
+    """
+    Read-only view of a memory-mapped capture file, indexed via CaptureIndex. Implements the read-only store
+    interface of VirtualTableModel, where sequence numbers are record numbers, so it can be displayed by VirtualTable.
+    """
+    MAX_TRANSFER_FRAMES = 1000
+
+    def __init__(self, path, progress_callback=None):
+        self.path = path
+        sidecar_path = path + SIDECAR_EXTENSION
+        self.index = CaptureIndex.load(sidecar_path, path)
+        if self.index is None:
+            logger.info('Building index of %r', path)
+            self.index = CaptureIndex.build(path, progress_callback)
+            try:
+                self.index.save(sidecar_path, path)
+            except OSError:
+                logger.warning('Could not save the sidecar index %r', sidecar_path, exc_info=True)
+        self._data = numpy.memmap(path, dtype=numpy.uint8, mode='r') if len(self.index.offsets) else b''
+
+    def __len__(self):
+        return len(self.index.offsets)
+
+    @property
+    def capacity(self):
+        return len(self)
+
+    @property
+    def first_seq(self):
+        return 0
+
+    @property
+    def next_seq(self):
+        return len(self)
+
+    def __contains__(self, seq):
+        return 0 <= seq < len(self)
+
+    def _unpack(self, seq):
+        offset = int(self.index.offsets[int(seq)])
+        ts_mono, ts_real, can_id, flags, length = RECORD_HEADER.unpack_from(self._data, offset)
+        return ts_mono, ts_real, can_id, flags, length, offset + RECORD_HEADER.size
+
+    def get_ts_real(self, seq):
+        return self._unpack(seq)[1]
+
+    def get_headers(self, seqs):
+        """Same as FrameBuffer.get_headers(); the record headers are gathered from the mapped file"""
+        if not len(self):
+            empty = numpy.zeros(0)
+            return empty, empty, empty.astype(numpy.uint32), empty.astype(numpy.uint8), empty.astype(numpy.uint8)
+        offsets = self.index.offsets[numpy.asarray(seqs, dtype=numpy.int64)].astype(numpy.int64)
+        raw = numpy.ascontiguousarray(self._data[offsets[:, None] + numpy.arange(RECORD_HEADER.size)])
+        headers = raw.view(_RECORD_HEADER_DTYPE).ravel()
+        return headers['ts_mono'], headers['ts_real'], headers['can_id'], headers['flags'], headers['length']
+
+    def get(self, seq):
+        ts_mono, ts_real, can_id, flags, length, offset = self._unpack(seq)
+        return make_frame(ts_mono, ts_real, can_id, flags, bytes(self._data[offset:offset + length]))
+
+    def get_frame(self, seq):
+        return self.get(seq)[1]
+
+    def get_entry(self, seq):
+        prev_ts_real = self.get_ts_real(seq - 1) if seq > 0 else None
+        direction, frame = self.get(seq)
+        return direction, frame, prev_ts_real
+
+    def line_count(self, seq):
+        return max(1, (self._unpack(seq)[4] + 7) // 8)
+
+    def find_time(self, ts_real):
+        """Returns the number of the first record not older than the specified real timestamp"""
+        step = CaptureIndex.SPARSE_TIME_INDEX_STEP
+        block = max(0, int(numpy.searchsorted(self.index.sparse_ts, ts_real, side='left')) - 1)
+        for seq in range(block * step, len(self)):
+            if self.get_ts_real(seq) >= ts_real:
+                return seq
+        return max(0, len(self) - 1)
+
+    def get_transfer_seqs(self, seq):
+        """Locates all frames of the transfer using the per-CAN-ID index; same semantics as TransferIndex"""
+        direction, frame = self.get(seq)
+        if not len(frame.data):
+            raise DecodingFailedException('Empty frame')
+        if _is_start_of_transfer(frame) and _is_end_of_transfer(frame):
+            return [seq]
+
+        same_id = self.index.lookup(can_ids=[frame.id])
+        pos = int(numpy.searchsorted(same_id, seq))
+        tid = _get_transfer_id(frame)
+
+        def scan(positions):
+            # Frames of other transfers sharing the same CAN ID are skipped
+            for p in positions:
+                s = int(same_id[p])
+                d, f = self.get(s)
+                if d == direction and len(f.data) and _get_transfer_id(f) == tid:
+                    yield s, f
+
+        seqs = [seq]
+        if not _is_start_of_transfer(frame):
+            for s, f in scan(range(pos - 1, max(-1, pos - 1 - self.MAX_TRANSFER_FRAMES), -1)):
+                if _is_end_of_transfer(f):
+                    break
+                seqs.insert(0, s)
+                if _is_start_of_transfer(f):
+                    break
+            if not _is_start_of_transfer(self.get_frame(seqs[0])):
+                raise DecodingFailedException('SOT not found')
+
+        if not _is_end_of_transfer(frame):
+            for s, f in scan(range(pos + 1, min(len(same_id), pos + 1 + self.MAX_TRANSFER_FRAMES))):
+                if _is_start_of_transfer(f):
+                    break
+                seqs.append(s)
+                if _is_end_of_transfer(f):
+                    break
+            if not _is_end_of_transfer(self.get_frame(seqs[-1])):
+                raise DecodingFailedException('EOT not found')
+
+        return seqs
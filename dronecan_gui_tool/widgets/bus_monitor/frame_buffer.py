@@ -0,0 +1,179 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import numpy
+from dronecan.driver import CANFrame
+
+
+FLAG_EXTENDED = 1
+FLAG_CANFD = 2
+FLAG_TX = 4
+
+MAX_PAYLOAD_LENGTH = 64
+
+
+def get_frame_flags(direction, frame):
+    return (FLAG_EXTENDED if frame.extended else 0) | \
+           (FLAG_CANFD if frame.canfd else 0) | \
+           (FLAG_TX if direction == 'tx' else 0)
+
+
+class FrameBuffer:
+    """
+    Fixed-capacity columnar ring buffer of CAN frames.
+    Every stored frame gets a monotonically increasing sequence number; the oldest frames are evicted once the
+    capacity is reached. Entries are materialized back into (direction, CANFrame) tuples only when requested,
+    which is what the table renderers expect.
+    """
+    DEFAULT_CAPACITY = 200000
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self._allocate(int(capacity))
+        self._first_seq = 0
+        self.on_append = lambda seq, direction, frame: None
+
+    def _allocate(self, capacity):
+        if capacity < 1:
+            raise ValueError('Invalid capacity: %r' % capacity)
+        self._capacity = capacity
+        self._head = 0          # Slot of the oldest entry
+        self._size = 0
+        self._ts_mono = numpy.zeros(capacity, dtype=numpy.float64)
+        self._ts_real = numpy.zeros(capacity, dtype=numpy.float64)
+        self._can_id = numpy.zeros(capacity, dtype=numpy.uint32)
+        self._flags = numpy.zeros(capacity, dtype=numpy.uint8)
+        self._dlc = numpy.zeros(capacity, dtype=numpy.uint8)       # Payload length in bytes, not the raw DLC code
+        self._payload = numpy.zeros((capacity, MAX_PAYLOAD_LENGTH), dtype=numpy.uint8)
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def first_seq(self):
+        """Sequence number of the oldest stored frame"""
+        return self._first_seq
+
+    @property
+    def next_seq(self):
+        """Sequence number that will be assigned to the next appended frame"""
+        return self._first_seq + self._size
+
+    def __contains__(self, seq):
+        return self._first_seq <= seq < self._first_seq + self._size
+
+    def _slot(self, seq):
+        if seq not in self:
+            raise IndexError('Frame %r is not in the buffer [%r, %r)' % (seq, self._first_seq, self.next_seq))
+        return (self._head + seq - self._first_seq) % self._capacity
+
+    def append(self, direction, frame):
+        if self._size >= self._capacity:
+            self.discard_oldest(1)
+
+        slot = (self._head + self._size) % self._capacity
+        data = bytes(frame.data[:MAX_PAYLOAD_LENGTH])
+        self._ts_mono[slot] = frame.ts_monotonic
+        self._ts_real[slot] = frame.ts_real
+        self._can_id[slot] = frame.id
+        self._flags[slot] = get_frame_flags(direction, frame)
+        self._dlc[slot] = len(data)
+        self._payload[slot, :len(data)] = numpy.frombuffer(data, dtype=numpy.uint8)
+        self._size += 1
+
+        seq = self._first_seq + self._size - 1
+        self.on_append(seq, direction, frame)
+        return seq
+
+    def discard_oldest(self, count):
+        count = min(count, self._size)
+        self._head = (self._head + count) % self._capacity
+        self._size -= count
+        self._first_seq += count
+
+    def clear(self):
+        self.discard_oldest(self._size)
+
+    def set_capacity(self, capacity):
+        """Reallocates the storage keeping the newest frames that fit; sequence numbers are preserved."""
+        capacity = int(capacity)
+        if capacity == self._capacity:
+            return
+        keep = min(self._size, capacity)
+        seqs = range(self.next_seq - keep, self.next_seq)
+        slots = numpy.array([self._slot(s) for s in seqs], dtype=numpy.int64)
+        old = self._ts_mono, self._ts_real, self._can_id, self._flags, self._dlc, self._payload
+        self._allocate(capacity)
+        for new, prev in zip((self._ts_mono, self._ts_real, self._can_id, self._flags, self._dlc, self._payload), old):
+            new[:keep] = prev[slots]
+        self._size = keep
+        self._first_seq = seqs.start
+
+    def get_payload(self, seq):
+        slot = self._slot(seq)
+        return self._payload[slot, :self._dlc[slot]].tobytes()
+
+    def get_direction(self, seq):
+        return 'tx' if self._flags[self._slot(seq)] & FLAG_TX else 'rx'
+
+    def get_frame(self, seq):
+        slot = self._slot(seq)
+        flags = int(self._flags[slot])
+        return CANFrame(int(self._can_id[slot]),
+                        self._payload[slot, :self._dlc[slot]].tobytes(),
+                        bool(flags & FLAG_EXTENDED),
+                        ts_monotonic=float(self._ts_mono[slot]),
+                        ts_real=float(self._ts_real[slot]),
+                        canfd=bool(flags & FLAG_CANFD))
+
+    def get(self, seq):
+        """Returns the stored frame as a (direction, CANFrame) tuple"""
+        return self.get_direction(seq), self.get_frame(seq)
+
+    def get_raw(self, seq):
+        """Returns (CAN ID, flags, payload) without constructing a frame object"""
+        slot = self._slot(seq)
+        return int(self._can_id[slot]), int(self._flags[slot]), self._payload[slot, :self._dlc[slot]].tobytes()
+
+    def get_headers(self, seqs):
+        """
+        Vectorized access to the stored frames without their payloads. Accepts an array of sequence numbers;
+        returns arrays (ts_monotonic, ts_real, can_id, flags, payload length).
+        """
+        seqs = numpy.asarray(seqs, dtype=numpy.int64)
+        if len(seqs) and (seqs.min() < self._first_seq or seqs.max() >= self.next_seq):
+            raise IndexError('Frames are not in the buffer [%r, %r)' % (self._first_seq, self.next_seq))
+        slots = (self._head + seqs - self._first_seq) % self._capacity
+        return self._ts_mono[slots], self._ts_real[slots], self._can_id[slots], self._flags[slots], self._dlc[slots]
+
+    def _segments(self):
+        """Slot ranges of the stored frames, oldest first; the ring wraps around at most once"""
+        first = min(self._size, self._capacity - self._head)
+        yield self._head, self._head + first
+        if self._size > first:
+            yield 0, self._size - first
+
+    def select(self, evaluate):
+        """
+        Evaluates a vectorized predicate evaluate(can_id, flags, dlc, payload) -> bool array over the stored
+        frames at once; returns the sorted list of sequence numbers of the matching frames.
+        The columns are passed as views, so the payload is not read unless the predicate looks at it.
+        """
+        masks = [evaluate(self._can_id[a:b], self._flags[a:b], self._dlc[a:b], self._payload[a:b])
+                 for a, b in self._segments()]
+        return (numpy.flatnonzero(numpy.concatenate(masks)) + self._first_seq).tolist()
+
+    def get_entry(self, seq):
+        """Same as get(), extended with the real timestamp of the preceding frame (None for the oldest frame)"""
+        prev_ts_real = float(self._ts_real[self._slot(seq - 1)]) if (seq - 1) in self else None
+        return self.get_direction(seq), self.get_frame(seq), prev_ts_real
+
+    def line_count(self, seq):
+        """Number of text lines the payload occupies when rendered 8 bytes per line"""
+        return max(1, (int(self._dlc[self._slot(seq)]) + 7) // 8)
@@ -0,0 +1,163 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import numpy
+from .frame_buffer import FLAG_EXTENDED, FLAG_CANFD, FLAG_TX, MAX_PAYLOAD_LENGTH
+from .can_id import compute_data_type_keys, get_data_type_key
+
+
+KIND_MESSAGE = 'message'
+KIND_SERVICE = 'service'
+
+
+class FrameFilter:
+    """
+    Structured filter evaluated on raw frames, before anything is rendered. All specified conditions must hold;
+    the conditions that are None are not checked. Node IDs and data type IDs are matched against DroneCAN frames only.
+        can_id_mask, can_id_value   - (CAN ID & mask) == value
+        can_id_min, can_id_max      - inclusive CAN ID range
+        src_nodes, dst_nodes        - sets of node IDs; anonymous frames have source node ID 0
+        data_type_keys              - set of data type keys, where service type IDs are distinguished from message
+                                      type IDs by SERVICE_TYPE_KEY_FLAG, see compute_data_type_keys()
+        kind                        - KIND_MESSAGE or KIND_SERVICE
+        direction                   - 'rx' or 'tx'
+        canfd                       - True or False
+        payload_masks               - list of (byte index, mask, value); negative indexes count from the end,
+                                      e.g. -1 is the tail byte. Frames that are too short do not match.
+    """
+    FIELDS = ['can_id_mask', 'can_id_value', 'can_id_min', 'can_id_max', 'src_nodes', 'dst_nodes',
+              'data_type_keys', 'kind', 'direction', 'canfd', 'payload_masks']
+
+    def __init__(self, **kwargs):
+        for name in self.FIELDS:
+            setattr(self, name, kwargs.pop(name, None))
+        if kwargs:
+            raise TypeError('Unknown filter fields: %r' % list(kwargs))
+        if (self.can_id_mask is None) != (self.can_id_value is None):
+            raise ValueError('CAN ID mask and value must be specified together')
+        if self.kind not in (None, KIND_MESSAGE, KIND_SERVICE):
+            raise ValueError('Invalid kind: %r' % self.kind)
+        if self.direction not in (None, 'rx', 'tx'):
+            raise ValueError('Invalid direction: %r' % self.direction)
+
+    @property
+    def empty(self):
+        return all(getattr(self, name) is None for name in self.FIELDS)
+
+    def _clauses(self):
+        """
+        Yields the conditions as Python expressions over the variables can_id, flags, data, which are valid both
+        for scalars (int, int, bytes) and for numpy columns (when data is a 2D array with the length in dlc).
+        Every clause is a pair of (scalar expression, vectorized expression).
+        """
+        extended = '(flags & %d)' % FLAG_EXTENDED
+        service = '((can_id >> 7) & 1)'
+
+        if self.can_id_mask is not None:
+            e = '(can_id & %d) == %d' % (self.can_id_mask, self.can_id_value)
+            yield e, e
+        if self.can_id_min is not None:
+            yield 'can_id >= %d' % self.can_id_min, 'can_id >= %d' % self.can_id_min
+        if self.can_id_max is not None:
+            yield 'can_id <= %d' % self.can_id_max, 'can_id <= %d' % self.can_id_max
+        if self.src_nodes is not None:
+            yield ('%s and (can_id & 0x7F) in src_nodes' % extended,
+                   '(%s != 0) & numpy.isin(can_id & 0x7F, src_nodes_array)' % extended)
+        if self.dst_nodes is not None:
+            yield ('%s and %s and ((can_id >> 8) & 0x7F) in dst_nodes' % (extended, service),
+                   '(%s != 0) & (%s != 0) & numpy.isin((can_id >> 8) & 0x7F, dst_nodes_array)' % (extended, service))
+        if self.data_type_keys is not None:
+            yield ('%s and get_data_type_key(can_id) in data_type_keys' % extended,
+                   'numpy.isin(compute_data_type_keys(can_id, flags), data_type_keys_array)')
+        if self.kind is not None:
+            value = 1 if self.kind == KIND_SERVICE else 0
+            yield ('%s and %s == %d' % (extended, service, value),
+                   '(%s != 0) & (%s == %d)' % (extended, service, value))
+        if self.direction is not None:
+            op = '!=' if self.direction == 'tx' else '=='
+            e = '(flags & %d) %s 0' % (FLAG_TX, op)
+            yield e, e
+        if self.canfd is not None:
+            op = '!=' if self.canfd else '=='
+            e = '(flags & %d) %s 0' % (FLAG_CANFD, op)
+            yield e, e
+        for index, mask, value in (self.payload_masks or []):
+            if index >= 0:
+                yield ('len(data) > %d and (data[%d] & %d) == %d' % (index, index, mask, value),
+                       '(dlc > %d) & ((data[:, %d] & %d) == %d)' % (index, index, mask, value))
+            else:
+                yield ('len(data) >= %d and (data[%d] & %d) == %d' % (-index, index, mask, value),
+                       '(dlc >= %d) & ((numpy.take_along_axis(data, numpy.maximum(dlc.astype(numpy.int64) + %d, 0)'
+                       '[:, None], 1)[:, 0] & %d) == %d)' % (-index, index, mask, value))
+
+    def compile(self):
+        """
+        Returns a CompiledFrameFilter. The conditions are compiled into a single expression, so a frame is
+        checked with one function call regardless of the number of conditions.
+        """
+        clauses = list(self._clauses())
+        namespace = {
+            'numpy': numpy,
+            'get_data_type_key': get_data_type_key,
+            'compute_data_type_keys': compute_data_type_keys,
+            'src_nodes': frozenset(self.src_nodes or ()),
+            'dst_nodes': frozenset(self.dst_nodes or ()),
+            'data_type_keys': frozenset(self.data_type_keys or ()),
+            'src_nodes_array': numpy.array(sorted(self.src_nodes or ()), dtype=numpy.int64),
+            'dst_nodes_array': numpy.array(sorted(self.dst_nodes or ()), dtype=numpy.int64),
+            'data_type_keys_array': numpy.array(sorted(self.data_type_keys or ()), dtype=numpy.int64),
+        }
+        scalar = ' and '.join('(%s)' % s for s, _ in clauses) or 'True'
+        vector = ' & '.join('(%s)' % v for _, v in clauses) or 'numpy.ones(len(can_id), dtype=bool)'
+        match = eval('lambda can_id, flags, data: bool(%s)' % scalar, namespace)
+        evaluate = eval('lambda can_id, flags, dlc, data: %s' % vector, namespace)
+        return CompiledFrameFilter(match, evaluate)
+
+
+class CompiledFrameFilter:
+    """
+        match(can_id, flags, data) -> bool                 - checks one frame; data is bytes
+        evaluate(can_id, flags, dlc, data) -> bool array    - checks columns; data is a 2D array of payload bytes
+    """
+    def __init__(self, match, evaluate):
+        self.match = match
+        self._evaluate = evaluate
+
+    def evaluate(self, can_id, flags, dlc, data):
+        return self._evaluate(can_id.astype(numpy.int64), flags, dlc, data)
+
+
+def parse_int_set(text):
+    """Parses a comma or space separated list of integers, ranges like 10-20 are allowed; returns None if empty"""
+    out = set()
+    for item in text.replace(',', ' ').split():
+        if '-' in item.strip('-'):
+            low, high = item.split('-', 1)
+            out.update(range(int(low, 0), int(high, 0) + 1))
+        else:
+            out.add(int(item, 0))
+    return out or None
+
+
+def parse_payload_masks(text):
+    """
+    Parses payload byte conditions in the form index:mask=value with hexadecimal mask and value, separated by
+    commas or spaces, e.g. "0:FF=01 -1:1F=05". The mask can be omitted: "2=7F" means "2:FF=7F".
+    """
+    out = []
+    for item in text.replace(',', ' ').split():
+        try:
+            location, value = item.split('=')
+            index, mask = location.split(':') if ':' in location else (location, 'FF')
+            index, mask, value = int(index), int(mask, 16), int(value, 16)
+        except ValueError:
+            raise ValueError('Invalid payload condition %r, expected index:mask=value' % item)
+        if not -MAX_PAYLOAD_LENGTH <= index < MAX_PAYLOAD_LENGTH:
+            raise ValueError('Invalid payload condition %r, byte index is out of range' % item)
+        if not (0 <= mask <= 0xFF and 0 <= value <= 0xFF):
+            raise ValueError('Invalid payload condition %r, mask and value must be bytes' % item)
+        out.append((index, mask, value & mask))
+    return out or None
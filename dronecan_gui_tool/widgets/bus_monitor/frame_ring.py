@@ -0,0 +1,149 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import struct
+import logging
+from multiprocessing import shared_memory
+from dronecan.driver import CANFrame
+from .frame_buffer import FLAG_EXTENDED, FLAG_CANFD, FLAG_TX, MAX_PAYLOAD_LENGTH, get_frame_flags
+
+logger = logging.getLogger(__name__)
+
+
+# Header: write sequence number (published after a batch is written), write-in-progress sequence number
+# (published before a batch is written), capacity in records.
+_HEADER = struct.Struct('<QQQ')
+_HEADER_SIZE = 64
+
+# Record: ts_monotonic, ts_real, CAN ID, flags, payload length, payload, padding to 8 bytes
+_RECORD = struct.Struct('<ddIBB%ds2x' % MAX_PAYLOAD_LENGTH)
+
+
+class FrameRingWriter:
+    """
+    Single-producer side of a shared memory broadcast ring of raw CAN frames.
+    Frames are accumulated and published in batches; every reader keeps its own cursor, so the writer never
+    waits for anyone. Readers that fall behind by more than the capacity lose the oldest frames.
+    """
+    DEFAULT_CAPACITY = 65536
+    MAX_BATCH_SIZE = 256
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self._capacity = int(capacity)
+        self._shm = shared_memory.SharedMemory(create=True, size=_HEADER_SIZE + self._capacity * _RECORD.size)
+        self._write_seq = 0
+        self._pending = []
+        _HEADER.pack_into(self._shm.buf, 0, 0, 0, self._capacity)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def push(self, direction, frame):
+        self._pending.append((direction, frame))
+        if len(self._pending) >= self.MAX_BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, []
+        buf = self._shm.buf
+        end_seq = self._write_seq + len(pending)
+
+        # Letting the readers know which records are about to be overwritten
+        _HEADER.pack_into(buf, 0, self._write_seq, end_seq, self._capacity)
+
+        # If the batch is larger than the ring, only its tail is written; the readers will see the rest as lost
+        seq = max(self._write_seq, end_seq - self._capacity)
+        for direction, frame in pending[seq - end_seq:]:
+            data = bytes(frame.data[:MAX_PAYLOAD_LENGTH])
+            _RECORD.pack_into(buf, _HEADER_SIZE + (seq % self._capacity) * _RECORD.size,
+                              frame.ts_monotonic, frame.ts_real, frame.id, get_frame_flags(direction, frame),
+                              len(data), data)
+            seq += 1
+
+        self._write_seq = end_seq
+        _HEADER.pack_into(buf, 0, end_seq, end_seq, self._capacity)
+
+    def close(self):
+        try:
+            self._shm.close()
+            self._shm.unlink()
+        except Exception:
+            logger.error('Could not release the shared memory frame ring', exc_info=True)
+
+
+class FrameRingReader:
+    """
+    Consumer side of the shared memory frame ring. Starts reading from the most recent frame at the moment of
+    attachment.
+    """
+    def __init__(self, name):
+        self._shm = shared_memory.SharedMemory(name=name)
+        self._cursor, _, self._capacity = _HEADER.unpack_from(self._shm.buf, 0)
+        self._overrun_count = 0
+        self._lag = 0
+
+    @property
+    def lag(self):
+        """Number of frames that were published but not yet read at the moment of the last read"""
+        return self._lag
+
+    @property
+    def overrun_count(self):
+        """Number of frames that were lost because this reader could not keep up"""
+        return self._overrun_count
+
+    def read(self, max_count=None):
+        """Returns a list of (direction, CANFrame); empty if there is nothing new"""
+        buf = self._shm.buf
+        write_seq, _, _ = _HEADER.unpack_from(buf, 0)
+
+        self._lag = write_seq - self._cursor
+        if self._lag > self._capacity:
+            self._overrun_count += self._lag - self._capacity
+            self._cursor = write_seq - self._capacity
+
+        end_seq = write_seq if max_count is None else min(write_seq, self._cursor + max_count)
+        if end_seq <= self._cursor:
+            return []
+
+        # Copying the records out, there may be up to two contiguous segments
+        chunks = []
+        seq = self._cursor
+        while seq < end_seq:
+            slot = seq % self._capacity
+            count = min(end_seq - seq, self._capacity - slot)
+            offset = _HEADER_SIZE + slot * _RECORD.size
+            chunks.append(bytes(buf[offset:offset + count * _RECORD.size]))
+            seq += count
+
+        # Discarding the records that might have been overwritten while we were copying them
+        _, write_in_progress_seq, _ = _HEADER.unpack_from(buf, 0)
+        first_valid_seq = max(self._cursor, write_in_progress_seq - self._capacity)
+        if first_valid_seq > self._cursor:
+            self._overrun_count += min(first_valid_seq, end_seq) - self._cursor
+
+        out = []
+        seq = self._cursor
+        for chunk in chunks:
+            for ts_mono, ts_real, can_id, flags, length, data in _RECORD.iter_unpack(chunk):
+                if seq >= first_valid_seq:
+                    frame = CANFrame(can_id, data[:length], bool(flags & FLAG_EXTENDED),
+                                     ts_monotonic=ts_mono, ts_real=ts_real, canfd=bool(flags & FLAG_CANFD))
+                    out.append(('tx' if flags & FLAG_TX else 'rx', frame))
+                seq += 1
+
+        self._cursor = end_seq
+        return out
+
+    def close(self):
+        try:
+            self._shm.close()
+        except Exception:
+            pass
@@ -0,0 +1,85 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+from PyQt5.QtGui import QColor
+
+
+BYTES_PER_LINE = 8
+
+# Every byte is two hex digits and a space; the last byte of a line has no trailing space
+_HEX_LINE_STRIDE = BYTES_PER_LINE * 3
+_HEX_LINE_LENGTH = _HEX_LINE_STRIDE - 1
+
+# Non-printable characters are rendered as dots
+_ASCII_TABLE = bytes((x if 32 <= x <= 126 else ord('.')) for x in range(256))
+
+
+def _split_lines(text, num_bytes, stride, length):
+    # A payload whose length is a multiple of BYTES_PER_LINE ends with an empty line, like it always did
+    return '\n'.join([text[i:i + length] for i in range(0, stride * (num_bytes // BYTES_PER_LINE) + 1, stride)])
+
+
+def format_hex_line(data):
+    """Hex dump in one line"""
+    return bytes(data).hex(' ').upper()
+
+
+def format_ascii_line(data):
+    return bytes(data).translate(_ASCII_TABLE).decode('ascii')
+
+
+def format_hex(data):
+    """Hex dump with BYTES_PER_LINE bytes per line"""
+    return _split_lines(format_hex_line(data), len(data), _HEX_LINE_STRIDE, _HEX_LINE_LENGTH)
+
+
+def format_ascii(data):
+    return _split_lines(format_ascii_line(data), len(data), BYTES_PER_LINE, BYTES_PER_LINE)
+
+
+def format_hex_batch(payloads):
+    """Same as format_hex() for every payload, but the conversion is done in one pass over all payloads"""
+    payloads = [bytes(p) for p in payloads]
+    text = b''.join(payloads).hex(' ').upper()
+    out = []
+    offset = 0
+    for p in payloads:
+        n = len(p)
+        out.append(_split_lines(text[offset:offset + 3 * n - 1], n, _HEX_LINE_STRIDE, _HEX_LINE_LENGTH))
+        offset += 3 * n
+    return out
+
+
+def format_ascii_batch(payloads):
+    payloads = [bytes(p) for p in payloads]
+    text = b''.join(payloads).translate(_ASCII_TABLE).decode('ascii')
+    out = []
+    offset = 0
+    for p in payloads:
+        n = len(p)
+        out.append(_split_lines(text[offset:offset + n], n, BYTES_PER_LINE, BYTES_PER_LINE))
+        offset += n
+    return out
+
+
+def _make_transfer_id_color(x):
+    red = ((x >> 6) & 0b111) * 25
+    green = ((x >> 3) & 0b111) * 25
+    blue = (x & 0b111) * 25
+    col = QColor()
+    col.setRgb(0xFF - red, 0xFF - green, 0xFF - blue)
+    return col
+
+
+# Shared instances; must not be modified by the users
+_TRANSFER_ID_PALETTE = [_make_transfer_id_color(x) for x in range(1 << 9)]
+
+
+def get_transfer_id_color(frame):
+    if len(frame.data) < 1:
+        return
+    # Making a rather haphazard hash using transfer ID and a part of CAN ID
+    return _TRANSFER_ID_PALETTE[(frame.data[-1] & 0b11111) | (((frame.id >> 16) & 0b1111) << 5)]
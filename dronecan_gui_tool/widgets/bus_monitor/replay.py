@@ -0,0 +1,128 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import time
+import queue
+import logging
+import threading
+from .capture import iter_capture
+
+logger = logging.getLogger(__name__)
+
+
+# OS sleeps may wake up late; the last stretch before a deadline is busy-waited
+SPIN_THRESHOLD = 0.0005
+
+
+def sleep_until(deadline, clock=time.perf_counter):
+    """Waits until the clock reaches the deadline; returns the lateness in seconds (never negative)"""
+    while True:
+        remaining = deadline - clock()
+        if remaining <= 0:
+            return -remaining
+        if remaining > SPIN_THRESHOLD:
+            time.sleep(remaining - SPIN_THRESHOLD)
+        else:
+            time.sleep(0)       # Releases the GIL, so that spinning does not starve the GUI thread
+
+
+class CaptureReplayer:
+    """
+    Feeds recorded frames into the bus monitor from a background thread.
+    At a finite speed, every frame is released when its original monotonic timestamp (scaled by the speed) comes due,
+    so the original inter-frame gaps are preserved; speed=None replays as fast as the consumer can take the frames.
+    The frames keep their original timestamps. get_frame() has the same semantics as the frame source of
+    BusMonitorWindow.
+    """
+    QUEUE_SIZE = 100000
+
+    def __init__(self, paths, speed=1.0):
+        if speed is not None and speed <= 0:
+            raise ValueError('Invalid replay speed: %r' % speed)
+        self._paths = list(paths)
+        self._speed = speed
+        self._queue = queue.Queue(self.QUEUE_SIZE)
+        self._stop_event = threading.Event()
+
+        self.frames_replayed = 0
+        self.max_timing_error = 0
+        self.total_timing_error = 0
+        self.error = None
+        self.started_at = time.perf_counter()
+        self.finished_at = None
+
+        self._thread = threading.Thread(target=self._run, name='capture_replayer', daemon=True)
+        self._thread.start()
+
+    @property
+    def speed(self):
+        return self._speed
+
+    @property
+    def finished(self):
+        return self.finished_at is not None
+
+    def _put(self, item):
+        while not self._stop_event.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _wait_until(self, deadline):
+        """Like sleep_until(), but can be interrupted by stop(); returns None if interrupted"""
+        remaining = deadline - time.perf_counter() - SPIN_THRESHOLD
+        if remaining > 0 and self._stop_event.wait(remaining):
+            return None
+        return sleep_until(deadline)
+
+    def _run(self):
+        try:
+            first_ts = None
+            start = None
+            for path in self._paths:
+                logger.info('Replaying %r at speed %r', path, self._speed)
+                for direction, frame in iter_capture(path):
+                    if self._speed is not None:
+                        if first_ts is None:
+                            first_ts, start = frame.ts_monotonic, time.perf_counter()
+                        lateness = self._wait_until(start + (frame.ts_monotonic - first_ts) / self._speed)
+                        if lateness is None:
+                            return
+                        self.max_timing_error = max(self.max_timing_error, lateness)
+                        self.total_timing_error += lateness
+                    if not self._put((direction, frame)):
+                        return
+                    self.frames_replayed += 1
+        except Exception as ex:
+            logger.error('Replay failed', exc_info=True)
+            self.error = ex
+        finally:
+            self.finished_at = time.perf_counter()
+            logger.info('Replay finished: %s', self.get_status_string())
+
+    def get_frame(self):
+        try:
+            return self._queue.get_nowait()
+        except queue.Empty:
+            pass
+
+    def stop(self):
+        self._stop_event.set()
+
+    def get_status_string(self):
+        elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+        out = 'Replay %s: %d frames in %.1f s, %.0f FPS' % \
+            ('finished' if self.finished else 'running', self.frames_replayed, elapsed,
+             self.frames_replayed / max(elapsed, 1e-9))
+        if self._speed is not None and self.frames_replayed > 0:
+            out += ', timing error avg %.3f ms, max %.3f ms' % \
+                (self.total_timing_error / self.frames_replayed * 1e3, self.max_timing_error * 1e3)
+        if self.error is not None:
+            out += ', error: %s' % self.error
+        return out
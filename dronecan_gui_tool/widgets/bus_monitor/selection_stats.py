@@ -0,0 +1,77 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import numpy
+from .can_id import compute_data_type_keys, get_data_type_name
+from .frame_buffer import FLAG_TX
+
+
+def ranges_to_rows(ranges):
+    """Converts a list of inclusive (first row, last row) ranges into a sorted array of unique rows"""
+    if not ranges:
+        return numpy.zeros(0, dtype=numpy.int64)
+    return numpy.unique(numpy.concatenate([numpy.arange(first, last + 1, dtype=numpy.int64)
+                                           for first, last in ranges]))
+
+
+class SelectionSummary:
+    """
+    Statistics of a set of frames computed from the stored numeric fields, so that the cost stays low for
+    hundreds of thousands of frames. The time span is measured with the monotonic driver timestamps; the real
+    timestamps are used only if the monotonic ones are not usable, e.g. when they were not recorded.
+    """
+    def __init__(self, store, seqs):
+        ts_mono, ts_real, can_ids, flags, lengths = store.get_headers(seqs)
+        self.count = len(seqs)
+        self.num_bytes = int(lengths.sum(dtype=numpy.int64))
+        self.num_tx = int(numpy.count_nonzero(flags & FLAG_TX))
+
+        self.duration = 0.0
+        if self.count > 1:
+            for ts in (ts_mono, ts_real):
+                duration = float(ts.max() - ts.min())
+                if duration > 0:
+                    self.duration = duration
+                    break
+
+        keys, counts = numpy.unique(compute_data_type_keys(can_ids, flags), return_counts=True)
+        order = numpy.argsort(-counts, kind='stable')
+        self.data_type_counts = [(int(keys[i]), int(counts[i])) for i in order]     # Most frequent first
+
+    @property
+    def frames_per_second(self):
+        return (self.count - 1) / self.duration if self.duration > 0 else None
+
+    @property
+    def bytes_per_second(self):
+        return self.num_bytes / self.duration if self.duration > 0 else None
+
+    def get_load_string(self):
+        if self.frames_per_second is None:
+            return 'average load is unknown'
+        return 'average load %.1f FPS, %.0f B/s' % (self.frames_per_second, self.bytes_per_second)
+
+    def get_report(self, max_data_types=50):
+        """Multi-line human-readable report, including the data type mix"""
+        lines = ['%d frames (%d RX, %d TX), %d payload bytes' %
+                 (self.count, self.count - self.num_tx, self.num_tx, self.num_bytes),
+                 'Time span %.6f sec, %s' % (self.duration, self.get_load_string()),
+                 '',
+                 '%8s %7s  %s' % ('Frames', 'Share', 'Data type')]
+        for key, count in self.data_type_counts[:max_data_types]:
+            lines.append('%8d %6.2f%%  %s' % (count, 100 * count / self.count, get_data_type_name(key)))
+        if len(self.data_type_counts) > max_data_types:
+            lines.append('... %d more data types' % (len(self.data_type_counts) - max_data_types))
+        return '\n'.join(lines)
+
+
+def get_timestamp_difference(store, earlier_seq, later_seq):
+    """Seconds between two stored frames according to the monotonic driver timestamps"""
+    ts_mono, ts_real, _, _, _ = store.get_headers([earlier_seq, later_seq])
+    dt = float(ts_mono[1] - ts_mono[0])
+    if dt == 0:
+        dt = float(ts_real[1] - ts_real[0])
+    return dt
@@ -0,0 +1,235 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import bisect
+import time
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QTableView, QHeaderView, QAbstractItemView, QLabel, \
+    QStyledItemDelegate, QStyleOptionViewItem, QStyle, QApplication
+from PyQt5.QtCore import Qt, QTimer, QAbstractTableModel, QModelIndex, QRect
+from PyQt5.QtGui import QColor, QPalette
+from .traffic_breakdown import SlidingWindowCounter
+from .. import make_icon_button, get_brush
+
+
+class SnifferEntry:
+    """
+    The latest state of one CAN ID. The renderers of the sniffer columns accept this object; direction and frame
+    have the same meaning as in the entries of the frame log.
+    """
+    __slots__ = ('direction', 'frame', 'count', 'rate', 'changed_at', '_counter')
+
+    def __init__(self, direction, frame):
+        self.direction = direction
+        self.frame = frame
+        self.count = 0
+        self.rate = 0
+        self.changed_at = []        # Local monotonic time of the last change of every byte
+        self._counter = SlidingWindowCounter()
+
+    def update(self, frame, now_local):
+        old, new = self.frame.data, frame.data
+        if self.count == 0:
+            self.changed_at = [now_local] * len(new)
+        elif old != new:
+            changed_at = self.changed_at
+            if len(changed_at) < len(new):
+                changed_at.extend([now_local] * (len(new) - len(changed_at)))
+            else:
+                del changed_at[len(new):]
+            for i, (a, b) in enumerate(zip(old, new)):
+                if a != b:
+                    changed_at[i] = now_local
+        self.frame = frame
+        self.count += 1
+        self._counter.add(frame.ts_monotonic, 0)
+
+    def update_rate(self, now, window):
+        self.rate, _ = self._counter.get_rates(now, window)
+
+
+class SnifferModel(QAbstractTableModel):
+    """
+    One row per (CAN ID, direction) updated in place, sorted by CAN ID, so the number of rows is bounded by the
+    number of distinct IDs on the bus regardless of the frame rate. Frames are accepted at any rate; the view is
+    notified only when refresh() is called. Columns are BasicTable.Column instances rendering SnifferEntry.
+    """
+    RATE_WINDOW = 1.0
+    HIGHLIGHT_DURATION = 1.0
+
+    def __init__(self, parent, columns):
+        super(SnifferModel, self).__init__(parent)
+        self.columns = columns
+        self._entries = {}          # (extended, CAN ID, direction) : SnifferEntry
+        self._keys = []             # Sorted keys of the displayed rows
+        self._new_keys = []
+        self._last_ts = None
+        self._last_ts_local = None
+
+    def add_frame(self, direction, frame):
+        now_local = time.monotonic()
+        self._last_ts = frame.ts_monotonic
+        self._last_ts_local = now_local
+
+        key = frame.extended, frame.id, direction
+        try:
+            entry = self._entries[key]
+        except KeyError:
+            entry = self._entries[key] = SnifferEntry(direction, frame)
+            self._new_keys.append(key)
+        entry.update(frame, now_local)
+
+    @property
+    def now(self):
+        if self._last_ts is None:
+            return 0
+        return self._last_ts + (time.monotonic() - self._last_ts_local)
+
+    def refresh(self):
+        """Inserts the rows of the newly seen IDs and re-renders all cells"""
+        for key in self._new_keys:
+            row = bisect.bisect_left(self._keys, key)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._keys.insert(row, key)
+            self.endInsertRows()
+        self._new_keys = []
+
+        now = self.now
+        for entry in self._entries.values():
+            entry.update_rate(now, self.RATE_WINDOW)
+
+        if self._keys:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._keys) - 1, len(self.columns) - 1))
+
+    def clear(self):
+        self.beginResetModel()
+        self._entries.clear()
+        self._keys = []
+        self._new_keys = []
+        self.endResetModel()
+
+    def get_entry(self, row):
+        return self._entries[self._keys[row]]
+
+    def get_change_intensities(self, row):
+        """Returns a list with a value in [0, 1] per byte of the last frame, 1 for the bytes that have just changed"""
+        now_local = time.monotonic()
+        return [max(0., 1. - (now_local - t) / self.HIGHLIGHT_DURATION)
+                for t in self.get_entry(row).changed_at]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._keys)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.columns[section].name
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.BackgroundRole, Qt.TextAlignmentRole):
+            return
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignVCenter | Qt.AlignLeft
+        value = self.columns[index.column()].render(self.get_entry(index.row()))
+        color = None
+        if isinstance(value, tuple):
+            value, color = value
+        if role == Qt.DisplayRole:
+            return str(value)
+        return get_brush(color) if color is not None else None
+
+
+class ChangedBytesDelegate(QStyledItemDelegate):
+    """Paints the payload bytes in hex, the bytes that have recently changed are highlighted"""
+    def paint(self, painter, option, index):
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.text = ''
+        style = opt.widget.style() if opt.widget else QApplication.style()
+        style.drawControl(QStyle.CE_ItemViewItem, opt, painter, opt.widget)
+
+        model = index.model()
+        data = model.get_entry(index.row()).frame.data
+        intensities = model.get_change_intensities(index.row())
+
+        selected = opt.state & QStyle.State_Selected
+        text_color = opt.palette.color(QPalette.HighlightedText if selected else QPalette.Text)
+        byte_width = opt.fontMetrics.width('00')
+        step = opt.fontMetrics.width('00 ')
+        x = opt.rect.left() + style.pixelMetric(QStyle.PM_FocusFrameHMargin, None, opt.widget) + 1
+
+        painter.save()
+        painter.setFont(opt.font)
+        for i, b in enumerate(data):
+            rect = QRect(x + i * step, opt.rect.top(), byte_width, opt.rect.height())
+            k = intensities[i] if i < len(intensities) else 0
+            if k > 0:
+                shade = 255 - int(155 * k)
+                painter.fillRect(rect, QColor(255, shade, shade))
+                painter.setPen(Qt.black)
+            else:
+                painter.setPen(text_color)
+            painter.drawText(rect, Qt.AlignVCenter | Qt.AlignLeft, '%02X' % b)
+        painter.restore()
+
+
+class SnifferWidget(QWidget):
+    """cansniffer-style in-place view of the latest frame of every CAN ID"""
+    REFRESH_INTERVAL_MS = 200
+
+    def __init__(self, parent, columns, data_column, font=None):
+        super(SnifferWidget, self).__init__(parent)
+        self.model = SnifferModel(self, columns)
+
+        self._table = QTableView(self)
+        self._table.setModel(self.model)
+        self._table.setItemDelegateForColumn(data_column, ChangedBytesDelegate(self._table))
+        self._table.setShowGrid(False)
+        self._table.setWordWrap(False)
+        self._table.verticalHeader().setVisible(False)
+        self._table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self._table.verticalHeader().setDefaultSectionSize(20)
+        self._table.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self._table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        for idx, col in enumerate(columns):
+            self._table.horizontalHeader().setSectionResizeMode(idx, col.resize_mode)
+        if font:
+            self._table.setFont(font)
+
+        self._row_count_display = QLabel(self)
+        self._clear_button = make_icon_button('trash-o', 'Forget all IDs', self, text='Clear',
+                                              on_clicked=self.model.clear)
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(False)
+        self._refresh_timer.timeout.connect(self._refresh)
+        self._refresh_timer.start(self.REFRESH_INTERVAL_MS)
+
+        controls_layout = QHBoxLayout()
+        controls_layout.addWidget(self._clear_button)
+        controls_layout.addStretch(1)
+        controls_layout.addWidget(self._row_count_display)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(controls_layout)
+        layout.addWidget(self._table, 1)
+        self.setLayout(layout)
+
+    def add_frame(self, direction, frame):
+        self.model.add_frame(direction, frame)
+
+    def _refresh(self):
+        if not self.isVisible():
+            return
+        self.model.refresh()
+        self._row_count_display.setText('%d IDs' % self.model.rowCount())
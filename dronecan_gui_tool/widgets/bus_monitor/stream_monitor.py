@@ -0,0 +1,263 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import time
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView, \
+    QAbstractItemView, QCheckBox, QLabel
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QBrush
+from .can_id import get_data_type_key, get_data_type_name, get_destination_node_id, get_source_node_id
+from .traffic_breakdown import SlidingWindowCounter
+from .. import make_icon_button
+
+
+# Transfer sessions are identified by the CAN ID without the priority bits: data type and source node for messages;
+# data type, request/response, destination and source node for services.
+SESSION_MASK = 0xFFFFFF
+
+
+class StreamStats:
+    """
+    Tail byte state machine of one transfer session with error counters:
+        tid_gaps            - transfers started with a transfer ID other than the previous one plus one
+        lost_transfers      - number of transfers skipped over by the gaps
+        toggle_errors       - frames with a wrong toggle bit; the transfer they belong to is broken, its remaining
+                              frames are skipped
+        missing_eot         - transfers that were not finished before the next one started
+        orphan_frames       - continuation frames without a start of transfer
+    """
+    __slots__ = ('source_node_id', 'destination_node_id', 'data_type_key', 'direction',
+                 'frames', 'transfers', 'tid_gaps', 'lost_transfers', 'toggle_errors', 'missing_eot', 'orphan_frames',
+                 'errors', '_last_tid', '_open_tid', '_broken_tid', '_next_toggle')
+
+    def __init__(self, can_id, direction):
+        self.source_node_id = get_source_node_id(can_id)
+        self.destination_node_id = get_destination_node_id(can_id)
+        self.data_type_key = get_data_type_key(can_id)
+        self.direction = direction
+
+        self.frames = 0
+        self.transfers = 0
+        self.tid_gaps = 0
+        self.lost_transfers = 0
+        self.toggle_errors = 0
+        self.missing_eot = 0
+        self.orphan_frames = 0
+        self.errors = SlidingWindowCounter()
+
+        self._last_tid = None
+        self._open_tid = None       # Transfer ID of the multi-frame transfer in progress
+        self._broken_tid = None     # Transfer ID of the broken transfer, its remaining frames are not errors
+        self._next_toggle = 0
+
+    @property
+    def error_count(self):
+        return self.tid_gaps + self.toggle_errors + self.missing_eot + self.orphan_frames
+
+    @property
+    def loss_ratio(self):
+        """Share of transfers that were lost or broken"""
+        lost = self.lost_transfers + self.toggle_errors + self.missing_eot
+        return lost / (self.transfers + lost) if lost else 0
+
+    def add_frame(self, ts, tail):
+        """Returns the number of errors detected"""
+        self.frames += 1
+        tid = tail & 0x1F
+        toggle = (tail >> 5) & 1
+        errors = 0
+
+        if tail & 0x80:
+            self._broken_tid = None
+            if self._open_tid is not None:
+                self.missing_eot += 1
+                errors += 1
+                self._open_tid = None
+
+            # Anonymous nodes share the session, so their transfer IDs are not sequential
+            if self._last_tid is not None and self.source_node_id and tid != self._last_tid:
+                gap = (tid - self._last_tid - 1) & 0x1F
+                if gap:
+                    self.tid_gaps += 1
+                    self.lost_transfers += gap
+                    errors += 1
+            self._last_tid = tid
+
+            if toggle:
+                self.toggle_errors += 1
+                errors += 1
+                if not tail & 0x40:
+                    self._broken_tid = tid
+            elif tail & 0x40:
+                self.transfers += 1
+            else:
+                self._open_tid = tid
+                self._next_toggle = 1
+
+        elif tid == self._broken_tid:
+            if tail & 0x40:
+                self._broken_tid = None
+
+        elif self._open_tid is None or tid != self._open_tid:
+            self.orphan_frames += 1
+            errors += 1
+
+        elif toggle != self._next_toggle:
+            self.toggle_errors += 1
+            errors += 1
+            self._open_tid = None
+            if not tail & 0x40:
+                self._broken_tid = tid
+
+        else:
+            self._next_toggle ^= 1
+            if tail & 0x40:
+                self.transfers += 1
+                self._open_tid = None
+
+        if errors:
+            self.errors.add(ts, errors)
+        return errors
+
+
+class StreamMonitor:
+    """
+    Tracks every transfer session on the bus, detecting transfer ID gaps, toggle errors, missing ends of transfers
+    and orphan frames as the frames arrive. Non-DroneCAN frames are ignored.
+    """
+    def __init__(self):
+        self._streams = {}          # (CAN ID & SESSION_MASK, direction) : StreamStats
+        self.total_errors = SlidingWindowCounter()
+        self._last_ts = None
+        self._last_ts_local = None
+
+    def add_frame(self, direction, frame):
+        """Returns the number of errors detected in this frame"""
+        if not frame.extended or not len(frame.data):
+            return 0
+        ts = frame.ts_monotonic
+        self._last_ts = ts
+        self._last_ts_local = time.monotonic()
+
+        key = frame.id & SESSION_MASK, direction
+        try:
+            stream = self._streams[key]
+        except KeyError:
+            stream = self._streams[key] = StreamStats(frame.id, direction)
+        errors = stream.add_frame(ts, frame.data[-1])
+        if errors:
+            self.total_errors.add(ts, errors)
+        return errors
+
+    @property
+    def now(self):
+        if self._last_ts is None:
+            return 0
+        return self._last_ts + (time.monotonic() - self._last_ts_local)
+
+    @property
+    def streams(self):
+        return self._streams.values()
+
+    def clear(self):
+        self._streams.clear()
+        self.total_errors = SlidingWindowCounter()
+
+
+class StreamMonitorWidget(QWidget):
+    """Sortable live table of StreamMonitor"""
+    UPDATE_INTERVAL_MS = 1000
+    RATE_WINDOW = 10.0
+
+    COLUMNS = ['Src', 'Dst', 'Data type', 'Dir', 'Frames', 'Transfers', 'Lost', 'TID gaps', 'Toggle err',
+               'No EOT', 'Orphans', 'Loss %', 'Err/s (%.0fs)' % RATE_WINDOW]
+
+    def __init__(self, parent, monitor):
+        super(StreamMonitorWidget, self).__init__(parent)
+        self._monitor = monitor
+
+        self._errors_only = QCheckBox('Only streams with errors', self)
+        self._errors_only.stateChanged.connect(self._update)
+
+        self._reset_button = make_icon_button('eraser', 'Reset counters', self, text='Reset',
+                                              on_clicked=self._reset)
+
+        self._total_display = QLabel(self)
+
+        self._table = QTableWidget(self)
+        self._table.setColumnCount(len(self.COLUMNS))
+        self._table.setHorizontalHeaderLabels(self.COLUMNS)
+        self._table.verticalHeader().setVisible(False)
+        self._table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self._table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self._table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self._table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
+        self._table.setSortingEnabled(True)
+        self._table.sortByColumn(len(self.COLUMNS) - 2, Qt.DescendingOrder)
+
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(False)
+        self._update_timer.timeout.connect(self._update)
+        self._update_timer.start(self.UPDATE_INTERVAL_MS)
+
+        controls_layout = QHBoxLayout()
+        controls_layout.addWidget(self._errors_only)
+        controls_layout.addWidget(self._reset_button)
+        controls_layout.addStretch(1)
+        controls_layout.addWidget(self._total_display)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(controls_layout)
+        layout.addWidget(self._table, 1)
+        self.setLayout(layout)
+
+    def _reset(self):
+        self._monitor.clear()
+        self._update()
+
+    def _update(self):
+        if not self.isVisible():
+            return
+
+        now = self._monitor.now
+        streams = list(self._monitor.streams)
+        total_lost = sum(s.lost_transfers + s.toggle_errors + s.missing_eot for s in streams)
+        total_transfers = sum(s.transfers for s in streams)
+        error_rate, _ = self._monitor.total_errors.get_rates(now, self.RATE_WINDOW)
+        self._total_display.setText('Streams: %d, lost or broken transfers: %d (%.2f%%), errors: %.1f/s' %
+                                    (len(streams), total_lost,
+                                     100 * total_lost / (total_lost + total_transfers) if total_lost else 0,
+                                     error_rate))
+
+        if self._errors_only.isChecked():
+            streams = [s for s in streams if s.error_count]
+
+        rows = []
+        for s in streams:
+            errors_per_second, _ = s.errors.get_rates(now, self.RATE_WINDOW)
+            rows.append((s.source_node_id,
+                         s.destination_node_id if s.destination_node_id is not None else '',
+                         get_data_type_name(s.data_type_key),
+                         s.direction.upper(),
+                         s.frames, s.transfers, s.lost_transfers, s.tid_gaps, s.toggle_errors, s.missing_eot,
+                         s.orphan_frames, round(100 * s.loss_ratio, 2), round(errors_per_second, 1)))
+
+        self._table.setSortingEnabled(False)
+        self._table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for col, value in enumerate(values):
+                item = QTableWidgetItem()
+                item.setData(Qt.DisplayRole, value)
+                item.setTextAlignment(Qt.AlignVCenter | (Qt.AlignLeft if col == 2 else Qt.AlignRight))
+                if col >= 6 and value:
+                    item.setForeground(QBrush(Qt.red))      # Error counters
+                self._table.setItem(row, col, item)
+        self._table.setSortingEnabled(True)
+
+    def showEvent(self, event):
+        super(StreamMonitorWidget, self).showEvent(event)
+        self._update()
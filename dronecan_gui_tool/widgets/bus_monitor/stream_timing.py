@@ -0,0 +1,280 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import math
+import numpy
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView, \
+    QAbstractItemView, QLabel, QSplitter
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QColor
+from pyqtgraph import PlotWidget, mkPen, mkBrush
+from .can_id import get_data_type_key, get_data_type_name, get_source_node_id, is_service
+from .. import make_icon_button
+
+
+class LogLinearHistogram:
+    """
+    HDR-style histogram of non-negative integers: values below 2^SUB_BUCKET_BITS are counted exactly, larger values
+    are counted in buckets whose width doubles with every power of two, so the relative error is below
+    1 / 2^(SUB_BUCKET_BITS - 1) over the whole range. Recording is O(1); the memory footprint is fixed.
+    """
+    SUB_BUCKET_BITS = 7
+    _SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+    _HALF_COUNT = _SUB_BUCKET_COUNT // 2
+
+    def __init__(self, max_value):
+        self._max_value = int(max_value)
+        self._counts = [0] * (self._index(self._max_value) + 1)
+        self.count = 0
+
+    @classmethod
+    def _index(cls, value):
+        if value < cls._SUB_BUCKET_COUNT:
+            return value
+        shift = value.bit_length() - cls.SUB_BUCKET_BITS
+        return shift * cls._HALF_COUNT + (value >> shift)
+
+    @classmethod
+    def _lower_bound(cls, index):
+        if index < cls._SUB_BUCKET_COUNT:
+            return index
+        shift = index // cls._HALF_COUNT - 1
+        return (index - shift * cls._HALF_COUNT) << shift
+
+    def record(self, value):
+        """Values above the maximum are counted in the last bucket"""
+        self._counts[self._index(min(value, self._max_value))] += 1
+        self.count += 1
+
+    def get_percentile(self, percentile):
+        """Returns the middle of the bucket containing the specified percentile, or None if empty"""
+        if not self.count:
+            return None
+        threshold = max(1, math.ceil(self.count * percentile / 100))
+        accumulated = 0
+        for index, c in enumerate(self._counts):
+            accumulated += c
+            if accumulated >= threshold:
+                return (self._lower_bound(index) + self._lower_bound(index + 1)) / 2
+
+    def get_buckets(self):
+        """Returns (bucket edges, counts) of the non-empty span of the histogram as arrays; edges are one longer"""
+        counts = numpy.array(self._counts, dtype=numpy.int64)
+        nonzero = numpy.flatnonzero(counts)
+        if not len(nonzero):
+            return numpy.zeros(1), numpy.zeros(0, dtype=numpy.int64)
+        first, last = int(nonzero[0]), int(nonzero[-1])
+        edges = numpy.array([self._lower_bound(i) for i in range(first, last + 2)], dtype=numpy.float64)
+        return edges, counts[first:last + 1]
+
+
+class StreamTiming:
+    """
+    Inter-arrival statistics of one message stream. Intervals are measured between the starts of transfers
+    using the driver timestamps and kept in microseconds.
+    """
+    MAX_INTERVAL_US = 100 * 1000000
+
+    __slots__ = ('source_node_id', 'data_type_key', 'histogram', 'max_interval', 'min_interval',
+                 '_last_ts', '_mean', '_m2')
+
+    def __init__(self, source_node_id, data_type_key):
+        self.source_node_id = source_node_id
+        self.data_type_key = data_type_key
+        self.histogram = LogLinearHistogram(self.MAX_INTERVAL_US)
+        self.max_interval = None
+        self.min_interval = None
+        self._last_ts = None
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    @property
+    def count(self):
+        return self.histogram.count
+
+    @property
+    def mean(self):
+        """Mean period in microseconds"""
+        return self._mean if self.count else None
+
+    @property
+    def stddev(self):
+        return math.sqrt(self._m2 / self.count) if self.count else None
+
+    def add(self, ts):
+        last_ts, self._last_ts = self._last_ts, ts
+        if last_ts is None:
+            return
+        interval = max(0, int((ts - last_ts) * 1e6))
+        self.histogram.record(interval)
+
+        # Welford's algorithm
+        delta = interval - self._mean
+        self._mean += delta / self.histogram.count
+        self._m2 += delta * (interval - self._mean)
+
+        if self.max_interval is None or interval > self.max_interval:
+            self.max_interval = interval
+        if self.min_interval is None or interval < self.min_interval:
+            self.min_interval = interval
+
+
+class StreamTimingAnalyzer:
+    """
+    Collects StreamTiming of every message stream. Streams are keyed by the CAN ID without the priority bits,
+    which for messages is the combination of the data type ID and the source node ID.
+    """
+    def __init__(self):
+        self._streams = {}
+
+    def add_frame(self, direction, frame):
+        if not frame.extended or not len(frame.data):
+            return
+        can_id = frame.id
+        # Only the starts of non-anonymous message transfers
+        if not frame.data[-1] & 0x80 or is_service(can_id) or not get_source_node_id(can_id):
+            return
+        key = can_id & 0xFFFFFF
+        try:
+            stream = self._streams[key]
+        except KeyError:
+            stream = self._streams[key] = StreamTiming(get_source_node_id(can_id), get_data_type_key(can_id))
+        stream.add(frame.ts_monotonic)
+
+    @property
+    def streams(self):
+        """Returns {key: StreamTiming}"""
+        return self._streams
+
+    def clear(self):
+        self._streams.clear()
+
+
+class StreamTimingWidget(QWidget):
+    """Live table of StreamTimingAnalyzer; the histogram of the selected stream is plotted below the table"""
+    UPDATE_INTERVAL_MS = 1000
+
+    COLUMNS = ['Src', 'Data type', 'Intervals', 'Rate, Hz', 'Mean, ms', 'Stddev, ms', 'p50, ms', 'p99, ms',
+               'p99.9, ms', 'Min, ms', 'Max gap, ms']
+
+    def __init__(self, parent, analyzer):
+        super(StreamTimingWidget, self).__init__(parent)
+        self._analyzer = analyzer
+        self._selected_key = None
+
+        self._reset_button = make_icon_button('eraser', 'Reset statistics', self, text='Reset',
+                                              on_clicked=self._reset)
+        self._summary_display = QLabel(self)
+
+        self._table = QTableWidget(self)
+        self._table.setColumnCount(len(self.COLUMNS))
+        self._table.setHorizontalHeaderLabels(self.COLUMNS)
+        self._table.verticalHeader().setVisible(False)
+        self._table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self._table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self._table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self._table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self._table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self._table.setSortingEnabled(True)
+        self._table.sortByColumn(3, Qt.DescendingOrder)
+        self._table.itemSelectionChanged.connect(self._on_selection_changed)
+
+        self._histogram_plot = PlotWidget(background=(0, 0, 0))
+        self._histogram_plot.showGrid(x=True, y=True, alpha=0.4)
+        self._histogram_plot.setLogMode(x=True, y=False)
+        self._histogram_plot.setLabel('bottom', 'Inter-arrival time, ms')
+        self._histogram_plot.setLabel('left', 'Count')
+        self._histogram_curve = self._histogram_plot.plot(stepMode='center', fillLevel=0,
+                                                          pen=mkPen(QColor(Qt.green), width=1),
+                                                          brush=mkBrush(QColor(0, 255, 0, 80)))
+
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(False)
+        self._update_timer.timeout.connect(self._update)
+        self._update_timer.start(self.UPDATE_INTERVAL_MS)
+
+        controls_layout = QHBoxLayout()
+        controls_layout.addWidget(self._reset_button)
+        controls_layout.addStretch(1)
+        controls_layout.addWidget(self._summary_display)
+
+        splitter = QSplitter(Qt.Vertical, self)
+        splitter.addWidget(self._table)
+        splitter.addWidget(self._histogram_plot)
+        splitter.setStretchFactor(0, 2)
+        splitter.setStretchFactor(1, 1)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(controls_layout)
+        layout.addWidget(splitter, 1)
+        self.setLayout(layout)
+
+    def _reset(self):
+        self._analyzer.clear()
+        self._selected_key = None
+        self._update()
+
+    def _on_selection_changed(self):
+        items = self._table.selectedItems()
+        self._selected_key = items[0].data(Qt.UserRole) if items else None
+        self._update_histogram()
+
+    def _update_histogram(self):
+        stream = self._analyzer.streams.get(self._selected_key)
+        if stream is None or not stream.count:
+            self._histogram_curve.setData([0, 1], [0])
+            self._summary_display.setText('Select a stream to see its histogram')
+            return
+        edges, counts = stream.histogram.get_buckets()
+        # Log mode of the X axis cannot display zero
+        self._histogram_curve.setData(numpy.maximum(edges, 1) / 1000, counts)
+        self._summary_display.setText('%s from %d: %d intervals' %
+                                      (get_data_type_name(stream.data_type_key), stream.source_node_id, stream.count))
+
+    def _update(self):
+        if not self.isVisible():
+            return
+
+        def ms(x):
+            return round(x / 1000, 3) if x is not None else ''
+
+        rows = []
+        for key, s in self._analyzer.streams.items():
+            if not s.count:
+                continue
+            h = s.histogram
+            rows.append((key,
+                         (s.source_node_id, get_data_type_name(s.data_type_key), s.count,
+                          round(1e6 / s.mean, 1) if s.mean else '', ms(s.mean), ms(s.stddev),
+                          ms(h.get_percentile(50)), ms(h.get_percentile(99)), ms(h.get_percentile(99.9)),
+                          ms(s.min_interval), ms(s.max_interval))))
+
+        self._table.blockSignals(True)
+        self._table.setSortingEnabled(False)
+        self._table.setRowCount(len(rows))
+        for row, (key, values) in enumerate(rows):
+            for col, value in enumerate(values):
+                item = QTableWidgetItem()
+                item.setData(Qt.DisplayRole, value)
+                item.setData(Qt.UserRole, key)
+                item.setTextAlignment(Qt.AlignVCenter | (Qt.AlignLeft if col == 1 else Qt.AlignRight))
+                self._table.setItem(row, col, item)
+        self._table.setSortingEnabled(True)
+
+        # Restoring the selection, the rows may have been reordered
+        self._table.clearSelection()
+        for row in range(self._table.rowCount()):
+            if self._table.item(row, 0).data(Qt.UserRole) == self._selected_key:
+                self._table.selectRow(row)
+                break
+        self._table.blockSignals(False)
+
+        self._update_histogram()
+
+    def showEvent(self, event):
+        super(StreamTimingWidget, self).showEvent(event)
+        self._update()
@@ -0,0 +1,205 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import time
+from collections import deque
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView, \
+    QAbstractItemView, QComboBox, QLabel
+from PyQt5.QtCore import Qt, QTimer
+from .can_id import NO_DATA_TYPE_KEY, get_data_type_key, get_data_type_name, get_priority, get_source_node_id
+
+
+class SlidingWindowCounter:
+    """
+    Frame and byte counter with rates over sliding windows. Counts are accumulated in time buckets, so that adding
+    a frame is O(1) and a rate query is proportional to the number of buckets in the window.
+    """
+    __slots__ = ('frames', 'bytes', '_buckets')
+
+    BUCKET_DURATION = 0.1
+    MAX_WINDOW = 10.0
+    _MAX_BUCKETS = int(round(MAX_WINDOW / BUCKET_DURATION))
+
+    def __init__(self):
+        self.frames = 0
+        self.bytes = 0
+        self._buckets = deque()         # [bucket number, frames, bytes]
+
+    def add(self, ts, num_bytes):
+        self.frames += 1
+        self.bytes += num_bytes
+        bucket_number = int(ts / self.BUCKET_DURATION)
+        buckets = self._buckets
+        if buckets and buckets[-1][0] == bucket_number:
+            b = buckets[-1]
+            b[1] += 1
+            b[2] += num_bytes
+        else:
+            buckets.append([bucket_number, 1, num_bytes])
+            while buckets[0][0] <= bucket_number - self._MAX_BUCKETS:
+                buckets.popleft()
+
+    def get_rates(self, now, window):
+        """Returns (frames per second, bytes per second) over the specified window ending now"""
+        first_bucket = int(now / self.BUCKET_DURATION) - int(round(window / self.BUCKET_DURATION))
+        frames, num_bytes = 0, 0
+        for bucket_number, f, b in reversed(self._buckets):
+            if bucket_number <= first_bucket:
+                break
+            frames += f
+            num_bytes += b
+        return frames / window, num_bytes / window
+
+
+class TrafficBreakdown:
+    """
+    Incremental per-source-node, per-data-type and per-priority traffic statistics.
+    The timestamps provided by the driver are used for the rates; when no frames arrive, the time is extrapolated
+    using the local clock, so the rates decay on a silent bus (and during replay of old captures as well).
+    """
+    GROUP_NODE = 'node'
+    GROUP_DATA_TYPE = 'data_type'
+    GROUP_PRIORITY = 'priority'
+
+    def __init__(self):
+        self._groups = {
+            self.GROUP_NODE: {},
+            self.GROUP_DATA_TYPE: {},
+            self.GROUP_PRIORITY: {},
+        }
+        self.total = SlidingWindowCounter()
+        self._last_ts = None
+        self._last_ts_local = None
+
+    @staticmethod
+    def _get_keys(frame):
+        """Returns (source node ID, data type key, priority); node ID and priority are None for non-DroneCAN frames"""
+        if not frame.extended:
+            return None, NO_DATA_TYPE_KEY, None
+        can_id = frame.id
+        return get_source_node_id(can_id), get_data_type_key(can_id), get_priority(can_id)
+
+    def add_frame(self, direction, frame):
+        ts = frame.ts_monotonic
+        self._last_ts = ts
+        self._last_ts_local = time.monotonic()
+
+        num_bytes = len(frame.data)
+        self.total.add(ts, num_bytes)
+        for group, key in zip((self.GROUP_NODE, self.GROUP_DATA_TYPE, self.GROUP_PRIORITY), self._get_keys(frame)):
+            counters = self._groups[group]
+            try:
+                counters[key].add(ts, num_bytes)
+            except KeyError:
+                counters[key] = SlidingWindowCounter()
+                counters[key].add(ts, num_bytes)
+
+    @property
+    def now(self):
+        if self._last_ts is None:
+            return 0
+        return self._last_ts + (time.monotonic() - self._last_ts_local)
+
+    def get_counters(self, group):
+        """Returns {key: SlidingWindowCounter}"""
+        return self._groups[group]
+
+    def clear(self):
+        for counters in self._groups.values():
+            counters.clear()
+        self.total = SlidingWindowCounter()
+
+    @classmethod
+    def render_key(cls, group, key):
+        if key is None or key == NO_DATA_TYPE_KEY:
+            return 'N/A'
+        if group == cls.GROUP_DATA_TYPE:
+            return get_data_type_name(key)
+        if group == cls.GROUP_NODE and key == 0:
+            return 'Anon'
+        return key
+
+
+class TrafficBreakdownWidget(QWidget):
+    """Sortable live table of TrafficBreakdown"""
+    UPDATE_INTERVAL_MS = 1000
+    SHORT_WINDOW = 1.0
+    LONG_WINDOW = 10.0
+
+    COLUMNS = ['Key', 'Frames', 'Bytes', 'FPS (%.0fs)' % SHORT_WINDOW, 'FPS (%.0fs)' % LONG_WINDOW,
+               'B/s (%.0fs)' % SHORT_WINDOW, 'B/s (%.0fs)' % LONG_WINDOW, 'Share %']
+
+    def __init__(self, parent, breakdown):
+        super(TrafficBreakdownWidget, self).__init__(parent)
+        self._breakdown = breakdown
+
+        self._group_selector = QComboBox(self)
+        self._group_selector.addItem('Source node', TrafficBreakdown.GROUP_NODE)
+        self._group_selector.addItem('Data type', TrafficBreakdown.GROUP_DATA_TYPE)
+        self._group_selector.addItem('Priority', TrafficBreakdown.GROUP_PRIORITY)
+        self._group_selector.currentIndexChanged.connect(self._update)
+
+        self._total_display = QLabel(self)
+
+        self._table = QTableWidget(self)
+        self._table.setColumnCount(len(self.COLUMNS))
+        self._table.setHorizontalHeaderLabels(self.COLUMNS)
+        self._table.verticalHeader().setVisible(False)
+        self._table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self._table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self._table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self._table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self._table.setSortingEnabled(True)
+        self._table.sortByColumn(3, Qt.DescendingOrder)
+
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(False)
+        self._update_timer.timeout.connect(self._update)
+        self._update_timer.start(self.UPDATE_INTERVAL_MS)
+
+        controls_layout = QHBoxLayout()
+        controls_layout.addWidget(QLabel('Breakdown by:', self))
+        controls_layout.addWidget(self._group_selector)
+        controls_layout.addStretch(1)
+        controls_layout.addWidget(self._total_display)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(controls_layout)
+        layout.addWidget(self._table, 1)
+        self.setLayout(layout)
+
+    def _update(self):
+        if not self.isVisible():
+            return
+
+        group = self._group_selector.currentData()
+        now = self._breakdown.now
+        total_fps, total_bps = self._breakdown.total.get_rates(now, self.LONG_WINDOW)
+        self._total_display.setText('Total: %.0f FPS, %.0f B/s (%.0fs)' % (total_fps, total_bps, self.LONG_WINDOW))
+
+        rows = []
+        for key, counter in self._breakdown.get_counters(group).items():
+            short_fps, short_bps = counter.get_rates(now, self.SHORT_WINDOW)
+            long_fps, long_bps = counter.get_rates(now, self.LONG_WINDOW)
+            share = 100 * long_fps / total_fps if total_fps > 0 else 0
+            rows.append((TrafficBreakdown.render_key(group, key), counter.frames, counter.bytes,
+                         round(short_fps, 1), round(long_fps, 1), round(short_bps), round(long_bps), round(share, 1)))
+
+        # Sorting is suspended while the items are replaced, otherwise the rows would be reordered halfway
+        self._table.setSortingEnabled(False)
+        self._table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for col, value in enumerate(values):
+                item = QTableWidgetItem()
+                item.setData(Qt.DisplayRole, value)
+                item.setTextAlignment(Qt.AlignVCenter | (Qt.AlignLeft if col == 0 else Qt.AlignRight))
+                self._table.setItem(row, col, item)
+        self._table.setSortingEnabled(True)
+
+    def showEvent(self, event):
+        super(TrafficBreakdownWidget, self).showEvent(event)
+        self._update()
@@ -7,11 +7,9 @@
 #
 
 import dronecan
+from collections import deque
 from dronecan.transport import Transfer, Frame
 
-# How many rows will be traversed while looking for beginning/end of a multi frame transfer
-TABLE_TRAVERSING_RANGE = 2000
-
 
 class DecodingFailedException(Exception):
     pass
@@ -32,38 +30,220 @@ def _is_end_of_transfer(frame):
         return frame.data[-1] & 0b01000000
 
 
-def decode_transfer_from_frame(entry_row, row_to_frame):
-    entry_frame, direction = row_to_frame(entry_row)
-    can_id = entry_frame.id
-    transfer_id = _get_transfer_id(entry_frame)
-    frames = [entry_frame]
-
-    related_rows = []
-
-    # Scanning backward looking for the first frame
-    row = entry_row - 1
-    while not _is_start_of_transfer(frames[0]):
-        if row < 0 or entry_row - row > TABLE_TRAVERSING_RANGE:
+def _get_toggle_bit(frame):
+    if len(frame.data):
+        return (frame.data[-1] >> 5) & 1
+
+
+class TransferIndex:
+    """
+    Keeps track of which frames of the frame buffer belong to which multi-frame transfer, as the frames arrive.
+    Transfers are keyed by (CAN ID, transfer ID, direction); the frames are referred to by their sequence numbers
+    in the frame buffer. Single-frame transfers are not indexed, since they can be decoded from the frame alone.
+    """
+    class Record:
+        __slots__ = ('seqs', 'complete')
+
+        def __init__(self, seq):
+            self.seqs = [seq]
+            self.complete = False
+
+    def __init__(self, frame_buffer):
+        self._frame_buffer = frame_buffer
+        self._open = {}                 # (CAN ID, transfer ID, direction) : Record
+        self._seq_to_record = {}
+        self._indexed_seqs = deque()    # In the order of arrival, for eviction
+
+    def __len__(self):
+        return len(self._seq_to_record)
+
+    def add_frame(self, seq, direction, frame):
+        self._evict()
+
+        if not len(frame.data):
+            return
+
+        key = frame.id, _get_transfer_id(frame), direction
+        if _is_start_of_transfer(frame):
+            self._open.pop(key, None)     # An unfinished transfer with the same key is abandoned
+            if _is_end_of_transfer(frame):
+                return
+            record = self.Record(seq)
+            self._open[key] = record
+        else:
+            record = self._open.get(key)
+            if record is None:
+                return                      # Orphan frame, the start of its transfer has not been seen
+            record.seqs.append(seq)
+            if _is_end_of_transfer(frame):
+                record.complete = True
+                del self._open[key]
+
+        self._seq_to_record[seq] = record
+        self._indexed_seqs.append(seq)
+
+    def _evict(self):
+        first_seq = self._frame_buffer.first_seq
+        while self._indexed_seqs and self._indexed_seqs[0] < first_seq:
+            del self._seq_to_record[self._indexed_seqs.popleft()]
+
+    def get_transfer_seqs(self, seq):
+        """
+        Returns the list of sequence numbers of all frames of the transfer the specified frame belongs to.
+        Throws DecodingFailedException if the transfer could not be fully located.
+        """
+        self._evict()
+        record = self._seq_to_record.get(seq)
+        if record is None:
+            frame = self._frame_buffer.get_frame(seq)
+            if _is_start_of_transfer(frame) and _is_end_of_transfer(frame):
+                return [seq]
             raise DecodingFailedException('SOT not found')
-        f, d = row_to_frame(row)
-        row -= 1
-        if f.id == can_id and _get_transfer_id(f) == transfer_id and d == direction:
-            frames.insert(0, f)
-            related_rows.insert(0, row)
-
-    # Scanning forward looking for the last frame
-    row = entry_row + 1
-    while not _is_end_of_transfer(frames[-1]):
-        f, d = row_to_frame(row)
-        if f is None or row - entry_row > TABLE_TRAVERSING_RANGE:
+
+        if not record.complete:
             raise DecodingFailedException('EOT not found')
-        row += 1
-        if f.id == can_id and _get_transfer_id(f) == transfer_id and d == direction:
-            frames.append(f)
-            related_rows.append(row)
 
-    # The transfer is now fully recovered
+        if record.seqs[0] not in self._frame_buffer:
+            raise DecodingFailedException('Beginning of the transfer has been evicted from the buffer')
+
+        return list(record.seqs)
+
+
+def decode_transfer(seq, frame_buffer, transfer_index):
+    """Returns the list of sequence numbers of the frames of the transfer, and the decoded transfer as YAML"""
+    seqs = transfer_index.get_transfer_seqs(seq)
+    frames = [frame_buffer.get_frame(x) for x in seqs]
+
     tr = Transfer()
     tr.from_frames([Frame(x.id, x.data, canfd=x.canfd) for x in frames])
 
-    return related_rows, dronecan.to_yaml(tr.payload)
+    return seqs, dronecan.to_yaml(tr.payload)
+
+
+class ReassembledTransfer:
+    """
+    A complete transfer collected from its frames. Mimics the CANFrame attributes used by the table renderers,
+    the payload is decoded only on request.
+    """
+    __slots__ = ('id', 'extended', 'canfd', 'ts_monotonic', 'ts_real', 'frames')
+
+    def __init__(self, frames):
+        self.id = frames[0].id
+        self.extended = frames[0].extended
+        self.canfd = frames[0].canfd
+        self.ts_monotonic = frames[0].ts_monotonic
+        self.ts_real = frames[0].ts_real
+        self.frames = frames
+
+    @property
+    def data(self):
+        """Data of the last frame, which contains the tail byte"""
+        return self.frames[-1].data
+
+    @property
+    def transfer_id(self):
+        return _get_transfer_id(self.frames[0])
+
+    @property
+    def payload_size(self):
+        size = sum(len(f.data) - 1 for f in self.frames)
+        return size - 2 if len(self.frames) > 1 else size      # Multi-frame transfers are prefixed with CRC
+
+    def decode(self):
+        tr = Transfer()
+        tr.from_frames([Frame(x.id, x.data, canfd=x.canfd) for x in self.frames])
+        return dronecan.to_yaml(tr.payload)
+
+
+class TransferReassembler:
+    """
+    Collects frames into transfers as they arrive, validating the start/end of transfer and toggle bits.
+    Frames of broken transfers are silently dropped.
+    """
+    def __init__(self):
+        self._open = {}     # (CAN ID, transfer ID, direction) : list of frames
+
+    def add_frame(self, direction, frame):
+        """Returns a ReassembledTransfer if the frame has completed one, otherwise None"""
+        if not len(frame.data) or not frame.extended:
+            return
+
+        key = frame.id, _get_transfer_id(frame), direction
+        if _is_start_of_transfer(frame):
+            self._open.pop(key, None)
+            if _get_toggle_bit(frame):
+                return
+            if _is_end_of_transfer(frame):
+                return ReassembledTransfer([frame])
+            self._open[key] = [frame]
+            return
+
+        frames = self._open.get(key)
+        if frames is None:
+            return
+        if _get_toggle_bit(frame) != len(frames) % 2:
+            del self._open[key]
+            return
+        frames.append(frame)
+        if _is_end_of_transfer(frame):
+            del self._open[key]
+            return ReassembledTransfer(frames)
+
+
+class TransferBuffer:
+    """
+    Fixed-capacity ring buffer of (direction, ReassembledTransfer), compatible with VirtualTableModel.
+    """
+    DEFAULT_CAPACITY = 100000
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self._capacity = int(capacity)
+        self._items = [None] * self._capacity
+        self._head = 0
+        self._size = 0
+        self._first_seq = 0
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, seq):
+        return self._first_seq <= seq < self._first_seq + self._size
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def first_seq(self):
+        return self._first_seq
+
+    @property
+    def next_seq(self):
+        return self._first_seq + self._size
+
+    def append(self, direction, transfer):
+        if self._size >= self._capacity:
+            self.discard_oldest(1)
+        self._items[(self._head + self._size) % self._capacity] = direction, transfer
+        self._size += 1
+
+    def discard_oldest(self, count):
+        count = min(count, self._size)
+        for i in range(count):
+            self._items[(self._head + i) % self._capacity] = None
+        self._head = (self._head + count) % self._capacity
+        self._size -= count
+        self._first_seq += count
+
+    def clear(self):
+        self.discard_oldest(self._size)
+
+    def get(self, seq):
+        if seq not in self:
+            raise IndexError('Transfer %r is not in the buffer' % seq)
+        return self._items[(self._head + seq - self._first_seq) % self._capacity]
+
+    def get_entry(self, seq):
+        direction, transfer = self.get(seq)
+        prev_ts_real = self.get(seq - 1)[1].ts_real if (seq - 1) in self else None
+        return direction, transfer, prev_ts_real
@@ -0,0 +1,301 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import os
+import time
+import logging
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView, \
+    QAbstractItemView, QLabel, QSpinBox, QFileDialog
+from .capture import iter_capture, FILE_EXTENSION, COMPRESSED_FILE_EXTENSION
+from .payload_format import format_hex
+from .stream_timing import LogLinearHistogram
+from .. import make_icon_button, show_error, flash
+
+logger = logging.getLogger(__name__)
+
+
+class TransmitJob:
+    """
+    A sequence of frames to be sent with the recorded inter-frame gaps, once or cyclically.
+    Every cycle starts period seconds after the start of the previous one, but not before the previous cycle is
+    finished; period=0 sends the cycles back to back. repeat=0 repeats the sequence until stopped.
+    The object contains only plain data, so it can be passed to another process.
+    """
+    # The job is unpickled in the GUI thread of the process that owns the node; 10k frames take a few milliseconds
+    MAX_FRAMES = 10000
+
+    def __init__(self, frames, repeat=1, period=0.0):
+        """frames is an iterable of (direction, CANFrame); the direction is ignored"""
+        self.frames = []        # (offset from the first frame in seconds, CAN ID, payload, extended, CAN FD)
+        first_ts = None
+        offset = 0.0
+        for _, f in frames:
+            if len(self.frames) >= self.MAX_FRAMES:
+                raise ValueError('Too many frames, the limit is %d' % self.MAX_FRAMES)
+            if first_ts is None:
+                first_ts = f.ts_monotonic
+            offset = max(offset, f.ts_monotonic - first_ts)     # The timestamps of a capture may step back
+            self.frames.append((offset, f.id, bytes(f.data), f.extended, getattr(f, 'canfd', False)))
+        if not self.frames:
+            raise ValueError('No frames to transmit')
+
+        self.repeat = int(repeat)
+        self.period = float(period)
+        if self.repeat < 0 or self.period < 0:
+            raise ValueError('Invalid repetition settings')
+        if self.repeat != 1 and self.cycle_length <= 0:
+            raise ValueError('The sequence has no duration, the period must be specified for cyclic transmission')
+
+    @property
+    def span(self):
+        """Time from the first frame to the last one"""
+        return self.frames[-1][0]
+
+    @property
+    def cycle_length(self):
+        if len(self.frames) > 1:
+            # Back to back cycles are separated by the average recorded gap
+            return max(self.period, self.span * len(self.frames) / (len(self.frames) - 1))
+        return self.period
+
+
+class TransmitScheduler:
+    """
+    Sends a TransmitJob via send(can_id, data, extended=..., canfd=...), which is normally node.can_driver.send.
+    poll() shall be invoked periodically from the thread that owns the node; it sends every frame whose offset has
+    come due, so the recorded gaps are preserved to the resolution of the polling interval. The lateness of every
+    frame against its requested time is collected as the timing error.
+    """
+    MAX_TIMING_ERROR_US = 10 * 1000000
+    MAX_FRAMES_PER_POLL = 1000      # Keeps the caller responsive if the frames come due faster than they are sent
+
+    def __init__(self, job, clock=time.perf_counter):
+        self._job = job
+        self._clock = clock
+        self._index = 0             # Next frame of the current cycle
+
+        self.frames_sent = 0
+        self.frames_failed = 0
+        self.cycles_completed = 0
+        self.timing_error = LogLinearHistogram(self.MAX_TIMING_ERROR_US)      # Microseconds
+        self.max_timing_error = 0
+        self.total_timing_error = 0
+        self.error = None
+        self.started_at = clock()
+        self.finished_at = None
+
+    @property
+    def finished(self):
+        return self.finished_at is not None
+
+    def _finish(self):
+        self.finished_at = self._clock()
+        logger.info('Transmission finished: %s', self.get_status_string())
+
+    def poll(self, send):
+        job = self._job
+        try:
+            for _ in range(self.MAX_FRAMES_PER_POLL):
+                if self.finished:
+                    return
+                offset, can_id, data, extended, canfd = job.frames[self._index]
+                lateness = self._clock() - (self.started_at + self.cycles_completed * job.cycle_length + offset)
+                if lateness < 0:
+                    return
+                try:
+                    if canfd:
+                        send(can_id, data, extended=extended, canfd=True)
+                    else:
+                        send(can_id, data, extended=extended)
+                except Exception as ex:
+                    # The driver may reject frames when its TX queue is full; the rest of the sequence goes on
+                    self.frames_failed += 1
+                    if self.frames_failed == 1:
+                        logger.warning('Could not send frame: %r', ex)
+                else:
+                    self.frames_sent += 1
+                    self.timing_error.record(int(lateness * 1e6))
+                    self.max_timing_error = max(self.max_timing_error, lateness)
+                    self.total_timing_error += lateness
+
+                self._index += 1
+                if self._index >= len(job.frames):
+                    self._index = 0
+                    self.cycles_completed += 1
+                    if job.repeat and self.cycles_completed >= job.repeat:
+                        self._finish()
+        except Exception as ex:
+            logger.error('Transmission failed', exc_info=True)
+            self.error = ex
+            self._finish()
+
+    def stop(self):
+        if not self.finished:
+            self._finish()
+
+    def get_status_string(self):
+        elapsed = (self.finished_at or self._clock()) - self.started_at
+        cycles = '%d/%s' % (self.cycles_completed, self._job.repeat or 'inf')
+        out = 'TX %s: cycle %s, %d frames in %.1f s, %.0f FPS' % \
+            ('finished' if self.finished else 'running', cycles, self.frames_sent, elapsed,
+             self.frames_sent / max(elapsed, 1e-9))
+        if self.frames_sent > 0:
+            # The percentile is estimated from the histogram bucket, it may exceed the exact maximum slightly
+            p99 = min(self.timing_error.get_percentile(99) / 1e6, self.max_timing_error)
+            out += ', timing error avg %.3f ms, p99 %.3f ms, max %.3f ms' % \
+                (self.total_timing_error / self.frames_sent * 1e3, p99 * 1e3, self.max_timing_error * 1e3)
+        if self.frames_failed:
+            out += ', %d frames rejected by the driver' % self.frames_failed
+        if self.error is not None:
+            out += ', error: %s' % self.error
+        return out
+
+
+class Transmitter:
+    """
+    Runs one TransmitScheduler at a time; this is the interface TransmitWidget expects.
+    poll() shall be invoked periodically from the thread that owns the node, that is where the frames are sent from.
+    """
+    def __init__(self, send, clock=time.perf_counter):
+        self._send = send
+        self._clock = clock
+        self._scheduler = None
+
+    def start(self, job):
+        self.stop()
+        self._scheduler = TransmitScheduler(job, clock=self._clock)
+
+    def stop(self):
+        if self._scheduler is not None:
+            self._scheduler.stop()
+
+    def poll(self):
+        if self._scheduler is not None:
+            self._scheduler.poll(self._send)
+
+    def get_status_string(self):
+        return self._scheduler.get_status_string() if self._scheduler is not None else None
+
+
+class TransmitWidget(QWidget):
+    """
+    Transmit pane: sends the frames selected in the log or loaded from a capture file, once or cyclically.
+    get_selected_frames() shall return a list of (direction, CANFrame).
+    """
+    PREVIEW_ROWS = 1000
+
+    def __init__(self, parent, transmitter, get_selected_frames):
+        super(TransmitWidget, self).__init__(parent)
+        self._transmitter = transmitter
+        self._get_selected_frames = get_selected_frames
+        self._frames = []
+
+        use_selection_button = make_icon_button('hand-o-up', 'Transmit the frames selected in the frame log', self,
+                                                text='Use selected rows', on_clicked=self._use_selection)
+        load_button = make_icon_button('folder-open-o', 'Transmit the frames from a capture file', self,
+                                       text='Load capture', on_clicked=self._load_capture)
+        self._sequence_display = QLabel('No frames', self)
+
+        self._repeat_spinbox = QSpinBox(self)
+        self._repeat_spinbox.setRange(0, 1000000000)
+        self._repeat_spinbox.setValue(1)
+        self._repeat_spinbox.setSpecialValueText('Forever')
+        self._repeat_spinbox.setToolTip('Number of times the sequence is sent')
+
+        self._period_spinbox = QSpinBox(self)
+        self._period_spinbox.setRange(0, 3600 * 1000)
+        self._period_spinbox.setValue(100)
+        self._period_spinbox.setSuffix(' ms')
+        self._period_spinbox.setSpecialValueText('Back to back')
+        self._period_spinbox.setToolTip('Interval between the starts of the cycles; a cycle never starts before '
+                                        'the previous one is finished')
+
+        self._start_button = make_icon_button('play', 'Start transmission', self, text='Start',
+                                              on_clicked=self._start)
+        self._stop_button = make_icon_button('stop', 'Stop transmission', self, text='Stop',
+                                             on_clicked=self._transmitter.stop)
+        self._status_display = QLabel(self)
+        self._status_display.setWordWrap(True)
+
+        self._preview = QTableWidget(self)
+        self._preview.setColumnCount(3)
+        self._preview.setHorizontalHeaderLabels(['Offset, ms', 'CAN ID', 'Data Hex'])
+        self._preview.verticalHeader().setVisible(False)
+        self._preview.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self._preview.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self._preview.horizontalHeader().setStretchLastSection(True)
+
+        source_layout = QHBoxLayout()
+        source_layout.addWidget(use_selection_button)
+        source_layout.addWidget(load_button)
+        source_layout.addWidget(self._sequence_display, 1)
+
+        control_layout = QHBoxLayout()
+        control_layout.addWidget(QLabel('Repeat:', self))
+        control_layout.addWidget(self._repeat_spinbox)
+        control_layout.addWidget(QLabel('Period:', self))
+        control_layout.addWidget(self._period_spinbox)
+        control_layout.addWidget(self._start_button)
+        control_layout.addWidget(self._stop_button)
+        control_layout.addStretch(1)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(source_layout)
+        layout.addLayout(control_layout)
+        layout.addWidget(self._status_display)
+        layout.addWidget(self._preview, 1)
+        self.setLayout(layout)
+
+    def _set_frames(self, frames, origin):
+        try:
+            TransmitJob(frames)         # Validation
+        except ValueError as ex:
+            flash(self, str(ex), duration=5)
+            return
+        self._frames = frames
+        span = frames[-1][1].ts_monotonic - frames[0][1].ts_monotonic
+        self._sequence_display.setText('%d frames from %s, %.3f s' % (len(frames), origin, span))
+
+        self._preview.setRowCount(min(len(frames), self.PREVIEW_ROWS))
+        first_ts = frames[0][1].ts_monotonic
+        for row, (_, f) in enumerate(frames[:self.PREVIEW_ROWS]):
+            values = ('%.3f' % ((f.ts_monotonic - first_ts) * 1e3),
+                      '%0*X' % (8 if f.extended else 3, f.id),
+                      format_hex(f.data).replace('\n', ' ').strip())
+            for col, value in enumerate(values):
+                self._preview.setItem(row, col, QTableWidgetItem(value))
+
+    def _use_selection(self):
+        self._set_frames(self._get_selected_frames(), 'selection')
+
+    def _load_capture(self):
+        path = QFileDialog().getOpenFileName(self, 'Select capture file to transmit', os.path.expanduser('~'),
+                                             'DroneCAN capture (*%s *%s)' %
+                                             (FILE_EXTENSION, COMPRESSED_FILE_EXTENSION))[0]
+        if not path:
+            return
+        frames = []
+        try:
+            for entry in iter_capture(path):
+                frames.append(entry)
+                if len(frames) > TransmitJob.MAX_FRAMES:
+                    raise ValueError('The capture is too large, the limit is %d frames' % TransmitJob.MAX_FRAMES)
+        except Exception as ex:
+            show_error('Transmit', 'Could not load capture file', ex, self)
+            return
+        self._set_frames(frames, os.path.basename(path))
+
+    def _start(self):
+        try:
+            job = TransmitJob(self._frames, self._repeat_spinbox.value(), self._period_spinbox.value() / 1e3)
+        except ValueError as ex:
+            show_error('Transmit', 'Could not start transmission', ex, self)
+            return
+        self._transmitter.start(job)
+
+    def update_status(self):
+        self._status_display.setText(self._transmitter.get_status_string() or 'Idle')
@@ -0,0 +1,63 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+from collections import deque
+
+
+class TriggerCapture:
+    """
+    Pre/post-trigger capture, like in a logic analyzer. While armed, the last pre_trigger_frames frames are kept in
+    a ring; once a frame matches the trigger, post_trigger_frames more frames are collected and the capture is
+    complete. The memory footprint is bounded by the sum of the two counts.
+    The trigger fires when match(direction, frame) returns True, or on any transfer error reported by the caller
+    if trigger_on_errors is set.
+    """
+    STATE_ARMED = 'armed'
+    STATE_TRIGGERED = 'triggered'
+    STATE_COMPLETE = 'complete'
+
+    def __init__(self, match, pre_trigger_frames, post_trigger_frames, trigger_on_errors=False):
+        if match is None and not trigger_on_errors:
+            raise ValueError('Trigger condition is not specified')
+        self._match = match
+        self._trigger_on_errors = trigger_on_errors
+        self._pre = deque(maxlen=max(1, int(pre_trigger_frames) + 1))      # Including the trigger frame
+        self._post = []
+        self._post_trigger_frames = int(post_trigger_frames)
+        self.state = self.STATE_ARMED
+
+    def add_frame(self, direction, frame, errors=0):
+        """Returns True if this frame has completed the capture"""
+        if self.state == self.STATE_ARMED:
+            self._pre.append((direction, frame))
+            if (errors and self._trigger_on_errors) or (self._match is not None and self._match(direction, frame)):
+                self.state = self.STATE_TRIGGERED
+                if self._post_trigger_frames <= 0:
+                    self.state = self.STATE_COMPLETE
+                    return True
+        elif self.state == self.STATE_TRIGGERED:
+            self._post.append((direction, frame))
+            if len(self._post) >= self._post_trigger_frames:
+                self.state = self.STATE_COMPLETE
+                return True
+        return False
+
+    @property
+    def frames(self):
+        """List of (direction, frame) captured so far, in the order of arrival"""
+        return list(self._pre) + self._post
+
+    @property
+    def trigger_index(self):
+        """Position of the trigger frame in frames, or None if the trigger has not fired yet"""
+        return len(self._pre) - 1 if self.state != self.STATE_ARMED else None
+
+    def get_status_string(self):
+        if self.state == self.STATE_ARMED:
+            return 'Armed, %d/%d pre-trigger' % (min(len(self._pre), self._pre.maxlen - 1), self._pre.maxlen - 1)
+        if self.state == self.STATE_TRIGGERED:
+            return 'Triggered, %d/%d post-trigger' % (len(self._post), self._post_trigger_frames)
+        return 'Complete, %d frames' % (len(self._pre) + len(self._post))
@@ -9,18 +9,35 @@
 import datetime
 import time
 import os
-from functools import partial
 import dronecan
-from dronecan.driver import CANFrame
+import numpy
 from PyQt5.QtWidgets import QMainWindow, QHeaderView, QLabel, QSplitter, QSizePolicy, QWidget, QHBoxLayout, \
-    QPlainTextEdit, QDialog, QVBoxLayout, QMenu, QAction
-from PyQt5.QtGui import QColor, QIcon, QTextOption
+    QPlainTextEdit, QDialog, QVBoxLayout, QMenu, QAction, QSpinBox, QTabWidget, QFileDialog, QCheckBox, QLineEdit, \
+    QPushButton, QFormLayout, QInputDialog, QComboBox
+from PyQt5.QtGui import QColor, QTextOption
 from PyQt5.QtCore import Qt, QTimer
 from pyqtgraph import PlotWidget, mkPen
 from logging import getLogger
 from .. import BasicTable, map_7bit_to_color, RealtimeLogWidget, get_monospace_font, get_icon, flash, get_app_icon, \
-    show_error
-from .transfer_decoder import decode_transfer_from_frame
+    show_error, make_icon_button
+from ..sample_ring import SampleRingBuffer
+from .transfer_decoder import decode_transfer, TransferIndex, TransferReassembler, TransferBuffer
+from .frame_buffer import FrameBuffer, get_frame_flags
+from .capture import CaptureWriter, FILE_EXTENSION, COMPRESSED_FILE_EXTENSION
+from .replay import CaptureReplayer
+from .bus_utilization import BusUtilizationEstimator
+from .traffic_breakdown import TrafficBreakdown, TrafficBreakdownWidget
+from .stream_monitor import StreamMonitor, StreamMonitorWidget
+from .stream_timing import StreamTimingAnalyzer, StreamTimingWidget
+from .sniffer import SnifferWidget
+from .payload_format import format_hex, format_ascii, format_hex_batch, format_ascii_batch, format_hex_line, \
+    format_ascii_line, get_transfer_id_color as colorize_transfer_id
+from .trigger import TriggerCapture
+from .transmit import TransmitWidget
+from .selection_stats import SelectionSummary, ranges_to_rows, get_timestamp_difference
+from .frame_filter import FrameFilter, KIND_MESSAGE, KIND_SERVICE, parse_int_set, parse_payload_masks
+from .can_id import SERVICE_TYPE_KEY_FLAG, NO_DATA_TYPE_KEY, get_data_type_key, get_data_type_name, \
+    get_destination_node_id, get_source_node_id
 
 
 logger = getLogger(__name__)
@@ -29,29 +46,14 @@ logger = getLogger(__name__)
 def parse_can_frame(frame):
     if frame.extended:
         can_id = frame.id
-        source_node_id = can_id & 0x7F
-
-        service_not_message = bool((can_id >> 7) & 1)
-        if service_not_message:
-            destination_node_id = (can_id >> 8) & 0x7F
-            request_not_response = bool((can_id >> 15) & 1)
-            service_type_id = (can_id >> 16) & 0xFF
-            try:
-                data_type_name = dronecan.DATATYPES[(service_type_id, dronecan.dsdl.CompoundType.KIND_SERVICE)].full_name
-            except KeyError:
-                data_type_name = '<unknown service %d>' % service_type_id
-        else:
-            message_type_id = (can_id >> 8) & 0xFFFF
-            if source_node_id == 0:
-                source_node_id = 'Anon'
-                message_type_id &= 0b11
+        data_type_name = get_data_type_name(get_data_type_key(can_id))
+        source_node_id = get_source_node_id(can_id)
+        destination_node_id = get_destination_node_id(can_id)
+        if destination_node_id is None:
+            source_node_id = source_node_id or 'Anon'
             destination_node_id = ''
-            try:
-                data_type_name = dronecan.DATATYPES[(message_type_id, dronecan.dsdl.CompoundType.KIND_MESSAGE)].full_name
-            except KeyError:
-                data_type_name = '<unknown message %d>' % message_type_id
     else:
-        data_type_name = 'N/A'
+        data_type_name = get_data_type_name(NO_DATA_TYPE_KEY)
         source_node_id = 'N/A'
         destination_node_id = 'N/A'
 
@@ -62,15 +64,67 @@ def parse_can_frame(frame):
     }
 
 
+class CANIDDecodeCache:
+    """
+    Remembers the results of parse_can_frame() together with the cell colors per CAN ID, because the same IDs
+    are repeated over and over again on a real bus. Must be invalidated when the set of known data types changes.
+    """
+    MAX_ENTRIES = 16384
+
+    # The priority field does not affect decoding
+    PRIORITY_MASK = 0x1F << 24
+
+    class Entry:
+        __slots__ = ('parsed', 'src_color', 'dst_color', 'data_type_color')
+
+        def __init__(self, frame):
+            self.parsed = parse_can_frame(frame)
+            src, dst, dtname = self.parsed['src'], self.parsed['dst'], self.parsed['data_type']
+            self.src_color = map_7bit_to_color(src) if isinstance(src, int) else None
+            self.dst_color = map_7bit_to_color(dst) if isinstance(dst, int) else None
+            self.data_type_color = map_7bit_to_color(sum(dtname.encode('ascii')) & 0xF7)
+
+    def __init__(self):
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, frame):
+        key = (frame.id & ~self.PRIORITY_MASK) if frame.extended else -1
+        try:
+            entry = self._entries[key]
+            self.hits += 1
+            return entry
+        except KeyError:
+            pass
+
+        self.misses += 1
+        if len(self._entries) >= self.MAX_ENTRIES:
+            self._entries.clear()
+        entry = self.Entry(frame)
+        self._entries[key] = entry
+        return entry
+
+    def invalidate(self):
+        logger.info('Invalidating CAN ID decode cache; %d entries, %d hits, %d misses',
+                    len(self._entries), self.hits, self.misses)
+        self._entries.clear()
+
+
+DECODE_CACHE = CANIDDecodeCache()
+
+
 def render_node_id_with_color(frame, field):
-    nid = parse_can_frame(frame)[field]
-    return nid, (map_7bit_to_color(nid) if isinstance(nid, int) else None)
+    entry = DECODE_CACHE.get(frame)
+    return entry.parsed[field], (entry.src_color if field == 'src' else entry.dst_color)
 
 
 def render_data_type_with_color(frame):
-    dtname = parse_can_frame(frame)['data_type']
-    color_hash = sum(dtname.encode('ascii')) & 0xF7
-    return dtname, map_7bit_to_color(color_hash)
+    entry = DECODE_CACHE.get(frame)
+    return entry.parsed['data_type'], entry.data_type_color
 
 
 def colorize_can_id(frame):
@@ -83,44 +137,24 @@ def colorize_can_id(frame):
     return col
 
 
-def colorize_transfer_id(frame):
-    if len(frame.data) < 1:
-        return
-
-    # Making a rather haphazard hash using transfer ID and a part of CAN ID
-    x = (frame.data[-1] & 0b11111) | (((frame.id >> 16) & 0b1111) << 5)
-    red = ((x >> 6) & 0b111) * 25
-    green = ((x >> 3) & 0b111) * 25
-    blue = (x & 0b111) * 25
+def formatted_data(frame):
+    return format_hex(frame.data).ljust(3 * 8), colorize_transfer_id(frame)
 
-    col = QColor()
-    col.setRgb(0xFF - red, 0xFF - green, 0xFF - blue)
-    return col
 
+def formatted_ascii(frame):
+    return format_ascii(frame.data), colorize_transfer_id(frame)
 
-def formatted_data(frame):
-    fmt_data = ''
-    data_len = len(frame.data)
-    for i in range(int(data_len/8)+1):
-        beg = i*8
-        end = min((i+1)*8, data_len)
-        fmt_data = "\n".join([fmt_data, ' '.join(['%02X' % x for x in frame.data[beg:end]])])
 
-    fmt_data = fmt_data[1:]
-    return fmt_data.ljust(3 * 8), colorize_transfer_id(frame)
+def formatted_data_batch(entries):
+    frames = [e[1] for e in entries]
+    return [(text.ljust(3 * 8), colorize_transfer_id(f))
+            for text, f in zip(format_hex_batch([f.data for f in frames]), frames)]
 
 
-def formatted_ascii(frame):
-    fmt_data = ''
-    data_len = len(frame.data)
-    for i in range(int(data_len/8)+1):
-        beg = i*8
-        end = min((i+1)*8, data_len)
-        fmt_data = "\n".join([fmt_data, 
-                    ''.join([(chr(x) if 32 <= x <= 126 else '.') for x in frame.data[beg:end]])])
+def formatted_ascii_batch(entries):
+    frames = [e[1] for e in entries]
+    return [(text, colorize_transfer_id(f)) for text, f in zip(format_ascii_batch([f.data for f in frames]), frames)]
 
-    fmt_data = fmt_data[1:]
-    return fmt_data, colorize_transfer_id(frame)
 
 class TimestampRenderer:
     FORMAT = '%H:%M:%S.%f'
@@ -132,8 +166,12 @@ class TimestampRenderer:
         ts = datetime.datetime.fromtimestamp(e[1].ts_real).strftime(self.FORMAT)
         col = QColor()
 
+        # Entries coming from the frame buffer carry the timestamp of the preceding frame, because they are
+        # rendered on demand in arbitrary order
+        prev_ts = (e[2] or 0) if len(e) > 2 else self._prev_ts
+
         # Constraining delta to [0, 1]
-        delta = min(1, e[1].ts_real - self._prev_ts)
+        delta = min(1, e[1].ts_real - prev_ts)
         if delta < 0:
             col.setRgb(255, 230, 230)
         else:
@@ -141,13 +179,6 @@ class TimestampRenderer:
             col.setRgb(*([255 - int(192 * delta)] * 3))
         return ts, col
 
-    @staticmethod
-    def compute_timestamp_difference(earlier, later):
-        def s2delta(string):
-            h, m, s = [float(x) for x in string.split(':')]
-            return datetime.timedelta(hours=h, minutes=m, seconds=s)
-        return (s2delta(later) - s2delta(earlier)).total_seconds()
-
 
 class TrafficStatCounter:
     MOVING_AVERAGE_LENGTH = 4
@@ -206,9 +237,36 @@ COLUMNS = [
                       lambda e: (('%0*X' % (8 if e[1].extended else 3, e[1].id)).rjust(8),
                                  colorize_can_id(e[1]))),
     BasicTable.Column('Data Hex',
-                      lambda e: formatted_data(e[1])),
+                      lambda e: formatted_data(e[1]),
+                      batch_renderer=formatted_data_batch),
     BasicTable.Column('Data ASCII',
-                      lambda e: formatted_ascii(e[1])),
+                      lambda e: formatted_ascii(e[1]),
+                      batch_renderer=formatted_ascii_batch),
+    BasicTable.Column('Src',
+                      lambda e: render_node_id_with_color(e[1], 'src')),
+    BasicTable.Column('Dst',
+                      lambda e: render_node_id_with_color(e[1], 'dst')),
+    BasicTable.Column('Data Type',
+                      lambda e: render_data_type_with_color(e[1]),
+                      resize_mode=QHeaderView.Stretch),
+]
+
+
+TRANSFER_COLUMNS = [
+    BasicTable.Column('Dir',
+                      lambda e: (e[0].upper()),
+                      searchable=False),
+    BasicTable.Column('Local Time', TimestampRenderer(), searchable=False),
+    BasicTable.Column('Frame',
+                      lambda e: ('FD' if e[1].canfd else 'NFD')),
+    BasicTable.Column('CAN ID',
+                      lambda e: (('%08X' % e[1].id).rjust(8), colorize_can_id(e[1]))),
+    BasicTable.Column('TID',
+                      lambda e: (e[1].transfer_id, colorize_transfer_id(e[1]))),
+    BasicTable.Column('Size',
+                      lambda e: e[1].payload_size),
+    BasicTable.Column('Frames',
+                      lambda e: len(e[1].frames)),
     BasicTable.Column('Src',
                       lambda e: render_node_id_with_color(e[1], 'src')),
     BasicTable.Column('Dst',
@@ -219,36 +277,308 @@ COLUMNS = [
 ]
 
 
-def row_to_frame(table, row_index):
-    if row_index >= table.rowCount():
-        return None, None
+# Rendering SnifferEntry; the data column is painted by the sniffer itself to highlight the changed bytes
+SNIFFER_COLUMNS = [
+    BasicTable.Column('Dir',
+                      lambda e: e.direction.upper()),
+    BasicTable.Column('Frame',
+                      lambda e: ('FD' if e.frame.canfd else 'NFD')),
+    BasicTable.Column('CAN ID',
+                      lambda e: (('%0*X' % (8 if e.frame.extended else 3, e.frame.id)).rjust(8),
+                                 colorize_can_id(e.frame))),
+    BasicTable.Column('Count',
+                      lambda e: e.count),
+    BasicTable.Column('Rate, Hz',
+                      lambda e: '%.1f' % e.rate),
+    BasicTable.Column('Data Hex',
+                      lambda e: format_hex_line(e.frame.data).ljust(3 * 8)),
+    BasicTable.Column('Data ASCII',
+                      lambda e: format_ascii_line(e.frame.data)),
+    BasicTable.Column('Src',
+                      lambda e: render_node_id_with_color(e.frame, 'src')),
+    BasicTable.Column('Dst',
+                      lambda e: render_node_id_with_color(e.frame, 'dst')),
+    BasicTable.Column('Data Type',
+                      lambda e: render_data_type_with_color(e.frame),
+                      resize_mode=QHeaderView.Stretch),
+]
+SNIFFER_DATA_COLUMN = 5
+
+
+def ask_capture_settings(parent):
+    """Returns the keyword arguments for CaptureWriter, or None if the user has cancelled"""
+    win = QDialog(parent)
+    win.setWindowTitle('Record to file')
+
+    path = QLineEdit(win)
+    path.setText(os.path.join(os.path.expanduser('~'),
+                              datetime.datetime.now().strftime('capture_%Y%m%d_%H%M%S') + FILE_EXTENSION))
+    path.setMinimumWidth(400)
+
+    def browse():
+        selected = QFileDialog().getSaveFileName(win, 'Select capture file', path.text(),
+                                                 'DroneCAN capture (*%s *%s)' %
+                                                 (FILE_EXTENSION, COMPRESSED_FILE_EXTENSION))[0]
+        if selected:
+            path.setText(selected)
+
+    browse_button = make_icon_button('folder-open-o', 'Browse', win, on_clicked=browse)
 
-    can_id = None
-    payload = None
-    extended = None
-    direction = None
-    canfd = False
-    for col_index, col_spec in enumerate(COLUMNS):
-        item = table.item(row_index, col_index).text()
-        if col_spec.name == 'CAN ID':
-            extended = len(item.strip()) > 3
-            can_id = int(item, 16)
-        if col_spec.name == 'Data Hex':
-            payload = bytes([int(x, 16) for x in item.split()])
-        if col_spec.name == 'Dir':
-            direction = item.strip()
-        if col_spec.name == 'Frame':
-            canfd = (True if item.strip() == 'FD' else False)
+    compress = QCheckBox('Compress (gzip)', win)
 
-    assert all(map(lambda x: x is not None, [can_id, payload, extended, direction]))
-    return CANFrame(can_id, payload, extended, ts_monotonic=-1, ts_real=-1, canfd=canfd), direction
+    max_file_size = QSpinBox(win)
+    max_file_size.setRange(0, 1024 * 1024)
+    max_file_size.setSuffix(' MB')
+    max_file_size.setSpecialValueText('Never')
+    max_file_size.setToolTip('Start a new file once the current one has reached this size')
+
+    max_file_duration = QSpinBox(win)
+    max_file_duration.setRange(0, 24 * 60)
+    max_file_duration.setSuffix(' min')
+    max_file_duration.setSpecialValueText('Never')
+    max_file_duration.setToolTip('Start a new file once the current one has been written for this long')
+
+    ok = QPushButton('Record', win)
+    ok.clicked.connect(win.accept)
+
+    path_layout = QHBoxLayout()
+    path_layout.addWidget(path, 1)
+    path_layout.addWidget(browse_button)
+
+    layout = QFormLayout(win)
+    layout.addRow('File:', path_layout)
+    layout.addRow('', compress)
+    layout.addRow('Rotate by size:', max_file_size)
+    layout.addRow('Rotate by time:', max_file_duration)
+    layout.addRow('', ok)
+    win.setLayout(layout)
+
+    if not win.exec_() or not path.text().strip():
+        return None
+
+    return {
+        'path': path.text().strip(),
+        'compress': compress.isChecked(),
+        'max_file_size': max_file_size.value() * 1024 * 1024,
+        'max_file_duration': max_file_duration.value() * 60,
+    }
+
+
+REPLAY_SPEEDS = [
+    ('1x', 1.0),
+    ('2x', 2.0),
+    ('5x', 5.0),
+    ('10x', 10.0),
+    ('100x', 100.0),
+    ('As fast as possible', None),
+]
+
+
+def ask_replay_settings(parent):
+    """Returns (list of capture files, replay speed), or None if the user has cancelled"""
+    paths = QFileDialog().getOpenFileNames(parent, 'Select capture files to replay', os.path.expanduser('~'),
+                                           'DroneCAN capture (*%s *%s)' %
+                                           (FILE_EXTENSION, COMPRESSED_FILE_EXTENSION))[0]
+    if not paths:
+        return None
+
+    speed_name, ok = QInputDialog.getItem(parent, 'Replay speed', 'Replay speed:',
+                                          [name for name, _ in REPLAY_SPEEDS], 0, False)
+    if not ok:
+        return None
+
+    # Rotated files are named in chronological order
+    return sorted(paths), dict(REPLAY_SPEEDS)[speed_name]
+
+
+def parse_data_type_keys(text):
+    """
+    Accepts a list of data type IDs and/or full data type names; returns a set of data type keys or None if empty.
+    A name selects the kind of its data type; a bare ID matches both a message and a service with that ID.
+    """
+    out = set()
+    for item in text.replace(',', ' ').split():
+        if item[0].isdigit():
+            ids = parse_int_set(item)
+            out |= ids | set(x | SERVICE_TYPE_KEY_FLAG for x in ids)
+        else:
+            try:
+                data_type = dronecan.TYPENAMES[item]
+            except KeyError:
+                raise ValueError('Unknown data type %r' % item)
+            is_service = data_type.kind == dronecan.dsdl.CompoundType.KIND_SERVICE
+            out.add(data_type.default_dtid | (SERVICE_TYPE_KEY_FLAG if is_service else 0))
+    return out or None
+
+
+class FrameFilterDialog(QDialog):
+    """Editor of FrameFilter; the text entered is kept by the dialog, so it should be reused"""
+    def __init__(self, parent):
+        super(FrameFilterDialog, self).__init__(parent)
+        self.setWindowTitle('Frame filter')
+
+        def make_edit(placeholder, tool_tip):
+            w = QLineEdit(self)
+            w.setPlaceholderText(placeholder)
+            w.setToolTip(tool_tip)
+            w.setFont(get_monospace_font())
+            return w
+
+        def make_combo(*items):
+            w = QComboBox(self)
+            for text, data in items:
+                w.addItem(text, data)
+            return w
+
+        self._can_id_mask = make_edit('mask=value, hex', 'Frames where (CAN ID & mask) == value, e.g. FFFF00=15500')
+        self._can_id_range = make_edit('min-max, hex', 'Inclusive CAN ID range, e.g. 100-7FF')
+        self._src_nodes = make_edit('e.g. 10, 20-30', 'Source node IDs; anonymous frames have source node ID 0')
+        self._dst_nodes = make_edit('e.g. 10, 20-30', 'Destination node IDs of service frames')
+        self._data_types = make_edit('e.g. 341, uavcan.protocol.GetNodeInfo',
+                                     'Data type IDs or full data type names; an ID matches both a message and '
+                                     'a service, a name matches only its own kind')
+        self._kind = make_combo(('Any', None), ('Messages', KIND_MESSAGE), ('Services', KIND_SERVICE))
+        self._direction = make_combo(('Any', None), ('RX', 'rx'), ('TX', 'tx'))
+        self._canfd = make_combo(('Any', None), ('FD', True), ('Non-FD', False))
+        self._payload = make_edit('index:mask=value, hex',
+                                  'Payload byte conditions; negative index counts from the end, e.g. -1:1F=05 '
+                                  'matches transfer ID 5')
+
+        self._apply_button = QPushButton('Apply', self)
+        self._apply_button.clicked.connect(self._on_apply)
+        clear_button = QPushButton('Clear', self)
+        clear_button.clicked.connect(self._on_clear)
+
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addWidget(clear_button)
+        buttons_layout.addStretch(1)
+        buttons_layout.addWidget(self._apply_button)
+
+        layout = QFormLayout(self)
+        layout.addRow('CAN ID mask:', self._can_id_mask)
+        layout.addRow('CAN ID range:', self._can_id_range)
+        layout.addRow('Source nodes:', self._src_nodes)
+        layout.addRow('Destination nodes:', self._dst_nodes)
+        layout.addRow('Data types:', self._data_types)
+        layout.addRow('Kind:', self._kind)
+        layout.addRow('Direction:', self._direction)
+        layout.addRow('Frame:', self._canfd)
+        layout.addRow('Payload:', self._payload)
+        layout.addRow(buttons_layout)
+        self.setLayout(layout)
+        self.setMinimumWidth(450)
+
+        self.frame_filter = None
+
+    def _parse(self):
+        kwargs = {}
+        if self._can_id_mask.text().strip():
+            mask, value = self._can_id_mask.text().split('=')
+            kwargs['can_id_mask'], kwargs['can_id_value'] = int(mask, 16), int(value, 16) & int(mask, 16)
+        if self._can_id_range.text().strip():
+            low, high = self._can_id_range.text().split('-')
+            kwargs['can_id_min'], kwargs['can_id_max'] = int(low, 16), int(high, 16)
+        kwargs['src_nodes'] = parse_int_set(self._src_nodes.text())
+        kwargs['dst_nodes'] = parse_int_set(self._dst_nodes.text())
+        kwargs['data_type_keys'] = parse_data_type_keys(self._data_types.text())
+        kwargs['kind'] = self._kind.currentData()
+        kwargs['direction'] = self._direction.currentData()
+        kwargs['canfd'] = self._canfd.currentData()
+        kwargs['payload_masks'] = parse_payload_masks(self._payload.text())
+        return FrameFilter(**kwargs)
+
+    def _on_apply(self):
+        try:
+            frame_filter = self._parse()
+        except Exception as ex:
+            show_error('Frame filter', 'Invalid filter', ex, self)
+            return
+        self.frame_filter = None if frame_filter.empty else frame_filter
+        self.accept()
+
+    def _on_clear(self):
+        for w in (self._can_id_mask, self._can_id_range, self._src_nodes, self._dst_nodes, self._data_types,
+                  self._payload):
+            w.clear()
+        for w in (self._kind, self._direction, self._canfd):
+            w.setCurrentIndex(0)
+        self.frame_filter = None
+        self.accept()
+
+
+class TriggerDialog(FrameFilterDialog):
+    """Settings of TriggerCapture: the trigger is a frame filter and/or a transfer error"""
+    def __init__(self, parent):
+        super(TriggerDialog, self).__init__(parent)
+        self.setWindowTitle('Trigger')
+        self._apply_button.setText('Arm')
+
+        def make_spinbox(value, tool_tip):
+            w = QSpinBox(self)
+            w.setRange(0, 1000000)
+            w.setValue(value)
+            w.setSuffix(' frames')
+            w.setToolTip(tool_tip)
+            return w
+
+        self._trigger_on_errors = QCheckBox('Also trigger on transfer errors', self)
+        self._trigger_on_errors.setToolTip('Transfer ID gaps, toggle errors, missing ends of transfers and orphan '
+                                           'frames, see the Frame loss tab')
+        self._pre_trigger_frames = make_spinbox(1000, 'Number of frames to keep before the trigger')
+        self._post_trigger_frames = make_spinbox(1000, 'Number of frames to capture after the trigger')
+        self._freeze = QCheckBox('Pause the frame log when the capture is complete', self)
+
+        layout = self.layout()
+        buttons_row = layout.rowCount() - 1
+        layout.insertRow(buttons_row, '', self._trigger_on_errors)
+        layout.insertRow(buttons_row + 1, 'Before trigger:', self._pre_trigger_frames)
+        layout.insertRow(buttons_row + 2, 'After trigger:', self._post_trigger_frames)
+        layout.insertRow(buttons_row + 3, '', self._freeze)
+
+    @property
+    def trigger_on_errors(self):
+        return self._trigger_on_errors.isChecked()
+
+    @property
+    def pre_trigger_frames(self):
+        return self._pre_trigger_frames.value()
+
+    @property
+    def post_trigger_frames(self):
+        return self._post_trigger_frames.value()
+
+    @property
+    def freeze(self):
+        return self._freeze.isChecked()
+
+    def _on_apply(self):
+        try:
+            frame_filter = self._parse()
+        except Exception as ex:
+            show_error('Trigger', 'Invalid trigger condition', ex, self)
+            return
+        if frame_filter.empty and not self.trigger_on_errors:
+            show_error('Trigger', 'Trigger condition is not specified',
+                       'Specify the frame to trigger on, or enable triggering on transfer errors', self)
+            return
+        self.frame_filter = None if frame_filter.empty else frame_filter
+        self.accept()
 
 
 class BusMonitorWindow(QMainWindow):
     DEFAULT_PLOT_X_RANGE = 120
-    BUS_LOAD_PLOT_MAX_SAMPLES = 50000
-
-    def __init__(self, get_frame, iface_name):
+    STAT_UPDATE_INTERVAL_MS = 500
+    BUS_LOAD_PLOT_HISTORY = 3 * 24 * 3600                  # Seconds; one sample per stat update
+    BUS_LOAD_PLOT_MAX_SAMPLES = BUS_LOAD_PLOT_HISTORY * 1000 // STAT_UPDATE_INTERVAL_MS
+    MAX_FRAME_BUFFER_CAPACITY = 10000000
+    MAX_FRAMES_PER_REDRAW = 100000      # Keeps the GUI responsive when the source is faster than the GUI
+
+    def __init__(self, get_frame, iface_name, frame_buffer_capacity=FrameBuffer.DEFAULT_CAPACITY,
+                 get_ipc_status=None, started=False, transmitter=None):
+        """
+        The transmitter sends frames to the bus, see transmit.Transmitter; the transmit pane is not available
+        if it is not provided.
+        """
         super(BusMonitorWindow, self).__init__()
         self.setWindowTitle('CAN bus monitor (%s)' % iface_name.split(os.path.sep)[-1])
         self.setWindowIcon(get_app_icon())
@@ -257,39 +587,120 @@ class BusMonitorWindow(QMainWindow):
         dsdl_directory = os.environ.get('DroneCAN_CUSTOM_DSDL_PATH',None)
         if dsdl_directory:
             dronecan.load_dsdl(dsdl_directory)
+            DECODE_CACHE.invalidate()
 
         self._get_frame = get_frame
+        self._get_ipc_status = get_ipc_status
+
+        self._frame_buffer = FrameBuffer(frame_buffer_capacity)
+        self._transfer_index = TransferIndex(self._frame_buffer)
+        self._frame_buffer.on_append = self._transfer_index.add_frame
 
         self._log_widget = RealtimeLogWidget(self, columns=COLUMNS, font=get_monospace_font(),
-                                             pre_redraw_hook=self._redraw_hook, multi_line_rows=True)
-        self._log_widget.on_selection_changed = self._update_measurement_display
+                                             pre_redraw_hook=self._redraw_hook, multi_line_rows=True,
+                                             store=self._frame_buffer, started_by_default=started)
+        self._log_widget.on_row_selection_changed = self._update_measurement_display
 
         self._log_widget.table.cellClicked.connect(lambda row, col: self._decode_transfer_at_row(row))
 
         self._log_widget.table.setContextMenuPolicy(Qt.CustomContextMenu)
         self._log_widget.table.customContextMenuRequested.connect(self._context_menu_requested)
 
+        # Transfer view: one row per reassembled transfer, decoded only when selected
+        self._transfer_reassembler = TransferReassembler()
+        self._transfer_buffer = TransferBuffer()
+        self._transfer_log_widget = RealtimeLogWidget(self, columns=TRANSFER_COLUMNS, font=get_monospace_font(),
+                                                      store=self._transfer_buffer, started_by_default=started)
+        self._transfer_log_widget.on_selection_changed = self._on_transfer_selection_changed
+        self._transfer_log_widget.table.cellClicked.connect(lambda row, col: self._decode_transfer_view_row(row))
+
+        self._view_tabs = QTabWidget(self)
+        self._view_tabs.addTab(self._log_widget, get_icon('list'), 'Frames')
+        self._view_tabs.addTab(self._transfer_log_widget, get_icon('th-list'), 'Transfers')
+
+        # In-place view: one row per CAN ID, readable at any frame rate
+        self._sniffer_widget = SnifferWidget(self, SNIFFER_COLUMNS, SNIFFER_DATA_COLUMN, font=get_monospace_font())
+        self._view_tabs.addTab(self._sniffer_widget, get_icon('table'), 'Sniffer')
+
+        self._traffic_breakdown = TrafficBreakdown()
+        self._traffic_breakdown_widget = TrafficBreakdownWidget(self, self._traffic_breakdown)
+        self._view_tabs.addTab(self._traffic_breakdown_widget, get_icon('bar-chart'), 'Statistics')
+
+        self._stream_monitor = StreamMonitor()
+        self._stream_monitor_widget = StreamMonitorWidget(self, self._stream_monitor)
+        self._view_tabs.addTab(self._stream_monitor_widget, get_icon('exclamation-triangle'), 'Frame loss')
+
+        self._stream_timing = StreamTimingAnalyzer()
+        self._stream_timing_widget = StreamTimingWidget(self, self._stream_timing)
+        self._view_tabs.addTab(self._stream_timing_widget, get_icon('clock-o'), 'Timing')
+
+        self._transmit_widget = None
+        if transmitter is not None:
+            self._transmit_widget = TransmitWidget(self, transmitter, self._get_selected_frames)
+            self._view_tabs.addTab(self._transmit_widget, get_icon('paper-plane'), 'Transmit')
+
         self._stat_display = QLabel('0 / 0 / 0', self)
         stat_display_label = QLabel('TX / RX / FPS: ', self)
         stat_display_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
         self._log_widget.custom_area_layout.addWidget(stat_display_label)
         self._log_widget.custom_area_layout.addWidget(self._stat_display)
 
+        self._capacity_spinbox = QSpinBox(self)
+        self._capacity_spinbox.setMinimum(1000)
+        self._capacity_spinbox.setMaximum(self.MAX_FRAME_BUFFER_CAPACITY)
+        self._capacity_spinbox.setSingleStep(10000)
+        self._capacity_spinbox.setValue(self._frame_buffer.capacity)
+        self._capacity_spinbox.setToolTip('Maximum number of frames kept in the table; the oldest frames are '
+                                          'discarded when the limit is reached')
+        self._capacity_spinbox.editingFinished.connect(self._update_frame_buffer_capacity)
+        capacity_label = QLabel('Max frames:', self)
+        capacity_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        self._log_widget.custom_area_layout.addWidget(capacity_label)
+        self._log_widget.custom_area_layout.addWidget(self._capacity_spinbox)
+
+        self._frame_filter_dialog = None
+        self._frame_filter_button = make_icon_button('sliders', 'Filter frames by CAN ID, node, data type, payload...',
+                                                     self, checkable=True, on_clicked=self._edit_frame_filter)
+        self._log_widget.custom_area_layout.addWidget(self._frame_filter_button)
+
+        # Recording is fed straight from the frame source, so it is not affected by the state of the table
+        self._capture_writer = None
+        self._record_button = make_icon_button('circle', 'Record all frames to a file', self, checkable=True,
+                                               on_clicked=self._on_record_button_clicked)
+        self._log_widget.custom_area_layout.addWidget(self._record_button)
+
+        self._trigger = None
+        self._trigger_dialog = None
+        self._freeze_on_trigger = False
+        self._trigger_windows = []
+        self._trigger_button = make_icon_button('crosshairs', 'Arm a pre/post-trigger capture', self,
+                                                checkable=True, on_clicked=self._on_trigger_button_clicked)
+        self._log_widget.custom_area_layout.addWidget(self._trigger_button)
+
+        self._replay_windows = []
+        self._replay_button = make_icon_button('play-circle', 'Replay recorded capture files in a new window', self,
+                                               on_clicked=self._open_replay)
+        self._log_widget.custom_area_layout.addWidget(self._replay_button)
+
+        self._browser_windows = []
+        self._browse_button = make_icon_button('folder-open-o', 'Browse a capture file of any size in a new window',
+                                               self, on_clicked=self._open_capture_browser)
+        self._log_widget.custom_area_layout.addWidget(self._browse_button)
+
         def flip_row_mark(row, col):
             if col == 0:
-                item = self._log_widget.table.item(row, col)
-                if item.icon().isNull():
-                    item.setIcon(get_icon('circle'))
+                if self._log_widget.table.model().flip_mark(row):
                     flash(self, 'Row %d was marked, click again to unmark', row, duration=3)
-                else:
-                    item.setIcon(QIcon())
 
         self._log_widget.table.cellPressed.connect(flip_row_mark)
 
+        self._ipc_status_display = QLabel(self)
+        self.statusBar().addPermanentWidget(self._ipc_status_display)
+
         self._stat_update_timer = QTimer(self)
         self._stat_update_timer.setSingleShot(False)
         self._stat_update_timer.timeout.connect(self._update_stat)
-        self._stat_update_timer.start(500)
+        self._stat_update_timer.start(self.STAT_UPDATE_INTERVAL_MS)
 
         self._traffic_stat = TrafficStatCounter()
 
@@ -310,18 +721,68 @@ class BusMonitorWindow(QMainWindow):
         self._load_plot.getPlotItem().getViewBox().setMouseEnabled(x=True, y=False)
         self._load_plot.enableAutoRange()
         self._bus_load_plot = self._load_plot.plot(name='Frames per second', pen=mkPen(QColor(Qt.lightGray), width=1))
-        self._bus_load_samples = [], []
+        self._bus_load_samples = SampleRingBuffer(self.BUS_LOAD_PLOT_MAX_SAMPLES, y_dtype=numpy.float32)
         self._started_at_mono = time.monotonic()
 
+        self._bus_utilization = BusUtilizationEstimator()
+        self._utilization_plot = PlotWidget(background=(0, 0, 0))
+        self._utilization_plot.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Minimum)
+        self._utilization_plot.showGrid(x=True, y=True, alpha=0.4)
+        self._utilization_plot.setToolTip('Bus utilization, percent')
+        self._utilization_plot.getPlotItem().getViewBox().setMouseEnabled(x=True, y=False)
+        self._utilization_plot.setYRange(0, 100, padding=0)
+        self._utilization_plot.setXLink(self._load_plot)
+        self._bus_utilization_plot = self._utilization_plot.plot(name='Bus utilization',
+                                                                 pen=mkPen(QColor(Qt.yellow), width=1))
+        self._bus_utilization_samples = SampleRingBuffer(self.BUS_LOAD_PLOT_MAX_SAMPLES, y_dtype=numpy.float32)
+        self._load_plot.sigXRangeChanged.connect(self._redraw_load_plots)
+
+        def make_bitrate_spinbox(value, tool_tip):
+            w = QSpinBox(self)
+            w.setRange(10, 20000)
+            w.setSingleStep(125)
+            w.setSuffix(' kbit/s')
+            w.setValue(value // 1000)
+            w.setToolTip(tool_tip)
+            w.valueChanged.connect(self._update_bus_utilization_settings)
+            return w
+
+        self._nominal_bitrate_spinbox = make_bitrate_spinbox(self._bus_utilization.nominal_bitrate,
+                                                             'Nominal (arbitration) bit rate')
+        self._data_bitrate_spinbox = make_bitrate_spinbox(self._bus_utilization.data_bitrate,
+                                                          'CAN FD data phase bit rate')
+        self._brs_checkbox = QCheckBox('BRS', self)
+        self._brs_checkbox.setToolTip('CAN FD frames use bit rate switching')
+        self._brs_checkbox.setChecked(self._bus_utilization.bit_rate_switching)
+        self._brs_checkbox.stateChanged.connect(self._update_bus_utilization_settings)
+
+        utilization_controls_layout = QHBoxLayout()
+        utilization_controls_layout.setContentsMargins(0, 0, 0, 0)
+        utilization_controls_layout.addWidget(QLabel('Utilization at', self))
+        utilization_controls_layout.addWidget(self._nominal_bitrate_spinbox)
+        utilization_controls_layout.addWidget(QLabel('data', self))
+        utilization_controls_layout.addWidget(self._data_bitrate_spinbox)
+        utilization_controls_layout.addWidget(self._brs_checkbox)
+        utilization_controls_layout.addStretch(1)
+
+        utilization_widget = QWidget(self)
+        utilization_layout = QVBoxLayout(utilization_widget)
+        utilization_layout.setContentsMargins(0, 0, 0, 0)
+        utilization_layout.addLayout(utilization_controls_layout)
+        utilization_layout.addWidget(self._utilization_plot, 1)
+        utilization_widget.setLayout(utilization_layout)
+
         self._footer_splitter = QSplitter(Qt.Horizontal, self)
         self._footer_splitter.addWidget(self._decoded_message_box)
         self._decoded_message_box.setMinimumWidth(400)
         self._footer_splitter.addWidget(self._load_plot)
         self._load_plot.setMinimumWidth(200)
+        self._footer_splitter.addWidget(utilization_widget)
+        utilization_widget.setMinimumWidth(200)
 
         splitter = QSplitter(Qt.Vertical, self)
-        splitter.addWidget(self._log_widget)
-        self._log_widget.setMinimumHeight(200)
+        splitter.addWidget(self._view_tabs)
+        self._view_tabs.setMinimumHeight(200)
         splitter.addWidget(self._footer_splitter)
 
         widget = QWidget(self)
@@ -337,6 +798,30 @@ class BusMonitorWindow(QMainWindow):
         # noinspection PyCallByClass,PyTypeChecker
         QTimer.singleShot(500, self._update_widget_sizes)
 
+    def _update_frame_buffer_capacity(self):
+        capacity = self._capacity_spinbox.value()
+        if capacity != self._frame_buffer.capacity:
+            logger.info('Changing frame buffer capacity %r --> %r', self._frame_buffer.capacity, capacity)
+            self._log_widget.table.model().set_capacity(capacity)
+
+    def _edit_frame_filter(self):
+        if self._frame_filter_dialog is None:
+            self._frame_filter_dialog = FrameFilterDialog(self)
+        self._frame_filter_dialog.exec_()
+
+        frame_filter = self._frame_filter_dialog.frame_filter
+        self._frame_filter_button.setChecked(frame_filter is not None)
+        table = self._log_widget.table
+        if frame_filter is None:
+            table.set_pre_filter(None)
+            return
+
+        compiled = frame_filter.compile()
+        frame_buffer = self._frame_buffer
+        table.set_pre_filter(lambda seq: compiled.match(*frame_buffer.get_raw(seq)),
+                             lambda: frame_buffer.select(compiled.evaluate))
+        flash(self, '%d of %d frames match the filter', table.rowCount(), len(frame_buffer), duration=5)
+
     def _update_widget_sizes(self):
         max_footer_height = int(self.centralWidget().height() * 0.4)
         self._footer_splitter.setMaximumHeight(max_footer_height)
@@ -345,76 +830,252 @@ class BusMonitorWindow(QMainWindow):
         super(BusMonitorWindow, self).resizeEvent(qresizeevent)
         self._update_widget_sizes()
 
-    def _update_stat(self):
-        bus_load, ts_mono = self._traffic_stat.get_frames_per_second()
+    def _on_record_button_clicked(self):
+        if self._capture_writer is not None:
+            self.stop_recording()
+            return
 
-        if len(self._bus_load_samples[0]) >= self.BUS_LOAD_PLOT_MAX_SAMPLES:
-            self._bus_load_samples[0].pop(0)
-            self._bus_load_samples[1].pop(0)
+        self._record_button.setChecked(False)
+        settings = ask_capture_settings(self)
+        if settings is None:
+            return
 
-        self._bus_load_samples[1].append(bus_load)
-        self._bus_load_samples[0].append(ts_mono - self._started_at_mono)
+        logger.info('Starting recording: %r', settings)
+        self._capture_writer = CaptureWriter(**settings)
+        self._record_button.setChecked(True)
+        self._record_button.setText('REC')
 
-        self._bus_load_plot.setData(*self._bus_load_samples)
+    def stop_recording(self):
+        writer, self._capture_writer = self._capture_writer, None
+        if writer is None:
+            return
 
+        writer.close()
+        self._record_button.setChecked(False)
+        self._record_button.setText('')
+        self._record_button.setToolTip('Record all frames to a file')
+        if writer.error is not None:
+            show_error('Recording error', 'Capture could not be written', writer.error, self)
+        else:
+            flash(self, 'Recorded %d frames (dropped %d) into %d file(s): %s', writer.frames_written,
+                  writer.frames_dropped, len(writer.files), ', '.join(writer.files), duration=10)
+
+    def _update_record_display(self):
+        writer = self._capture_writer
+        if writer is None:
+            return
+        if writer.error is not None or not writer.running:
+            self.stop_recording()
+            return
+        text = 'REC %d / %.1f MB' % (writer.frames_written, writer.bytes_written / 1024 / 1024)
+        if writer.frames_dropped:
+            text += ', dropped %d' % writer.frames_dropped
+        self._record_button.setText(text)
+        if writer.files:
+            self._record_button.setToolTip('Recording to %s; click to stop' % writer.files[-1])
+
+    def _on_trigger_button_clicked(self):
+        if self._trigger is not None:
+            self._disarm_trigger()
+            return
+
+        self._trigger_button.setChecked(False)
+        if self._trigger_dialog is None:
+            self._trigger_dialog = TriggerDialog(self)
+        if not self._trigger_dialog.exec_():
+            return
+
+        d = self._trigger_dialog
+        if d.frame_filter is None and not d.trigger_on_errors:
+            return      # Cleared
+        if d.frame_filter is None:
+            match = None
+        else:
+            compiled = d.frame_filter.compile()
+
+            def match(direction, frame):
+                return compiled.match(frame.id, get_frame_flags(direction, frame), frame.data)
+
+        self._trigger = TriggerCapture(match, d.pre_trigger_frames, d.post_trigger_frames,
+                                       trigger_on_errors=d.trigger_on_errors)
+        self._freeze_on_trigger = d.freeze
+        self._trigger_button.setChecked(True)
+        self._update_trigger_display()
+
+    def _disarm_trigger(self):
+        self._trigger = None
+        self._trigger_button.setChecked(False)
+        self._trigger_button.setText('')
+        self._trigger_button.setToolTip('Arm a pre/post-trigger capture')
+
+    def _update_trigger_display(self):
+        if self._trigger is not None:
+            self._trigger_button.setText(self._trigger.get_status_string())
+            self._trigger_button.setToolTip('Click to disarm')
+
+    def _on_trigger_complete(self):
+        trigger = self._trigger
+        self._disarm_trigger()
+        if self._freeze_on_trigger:
+            self._log_widget.paused = True
+
+        frames = iter(trigger.frames)
+        win = BusMonitorWindow(lambda: next(frames, None),
+                               'trigger capture, trigger at frame %d of %d' %
+                               (trigger.trigger_index + 1, len(trigger.frames)),
+                               started=True)
+        win.setAttribute(Qt.WA_DeleteOnClose)
+        win.destroyed.connect(lambda: self._trigger_windows.remove(win))
+        self._trigger_windows.append(win)
+        win.show()
+
+    def _open_replay(self):
+        settings = ask_replay_settings(self)
+        if settings is None:
+            return
+
+        paths, speed = settings
+        replayer = CaptureReplayer(paths, speed)
+        win = BusMonitorWindow(replayer.get_frame, 'replay of ' + os.path.basename(paths[0]),
+                               get_ipc_status=replayer.get_status_string, started=True)
+        win.setAttribute(Qt.WA_DeleteOnClose)
+        win.destroyed.connect(lambda: replayer.stop())
+        win.destroyed.connect(lambda: self._replay_windows.remove(win))
+        self._replay_windows.append(win)
+        win.show()
+
+    def _open_capture_browser(self):
+        from .capture_browser import open_capture_browser
+        win = open_capture_browser(self)
+        if win is not None:
+            win.setAttribute(Qt.WA_DeleteOnClose)
+            win.destroyed.connect(lambda: self._browser_windows.remove(win))
+            self._browser_windows.append(win)
+
+    def closeEvent(self, qcloseevent):
+        self.stop_recording()
+        super(BusMonitorWindow, self).closeEvent(qcloseevent)
+
+    def _update_stat(self):
+        if self._get_ipc_status is not None:
+            self._ipc_status_display.setText(self._get_ipc_status())
+
+        self._update_record_display()
+        self._update_trigger_display()
+        if self._transmit_widget is not None:
+            self._transmit_widget.update_status()
+
+        bus_load, ts_mono = self._traffic_stat.get_frames_per_second()
+        self._bus_load_samples.append(ts_mono - self._started_at_mono, bus_load)
+        # The estimator follows the clock of the frame timestamps, which is unknown until the first frame
+        if self._bus_utilization.now is not None:
+            self._bus_utilization_samples.append(self._bus_utilization.now - self._started_at_mono,
+                                                 self._bus_utilization.get_utilization())
+
+        # Following the latest sample; the plots are redrawn by the range change handler, unless the range stays
+        (old_xmin, old_xmax), _ = self._load_plot.viewRange()
+        xmax = self._bus_load_samples.last[0]
+        xmin = xmax - (old_xmax - old_xmin)
+        if (xmin, xmax) == (old_xmin, old_xmax):
+            self._redraw_load_plots()
+        else:
+            self._load_plot.setRange(xRange=(xmin, xmax), padding=0)
+
+    def _redraw_load_plots(self):
+        """Only the visible range is rendered, decimated to about two points per horizontal pixel"""
         (xmin, xmax), _ = self._load_plot.viewRange()
-        diff = xmax - xmin
-        xmax = self._bus_load_samples[0][-1]
-        xmin = self._bus_load_samples[0][-1] - diff
-        self._load_plot.setRange(xRange=(xmin, xmax), padding=0)
+        max_points = max(self._load_plot.width(), 100) * 2
+        self._bus_load_plot.setData(*self._bus_load_samples.get_range(xmin, xmax, max_points))
+        self._bus_utilization_plot.setData(*self._bus_utilization_samples.get_range(xmin, xmax, max_points))
+
+    def _update_bus_utilization_settings(self):
+        self._bus_utilization.nominal_bitrate = self._nominal_bitrate_spinbox.value() * 1000
+        self._bus_utilization.data_bitrate = self._data_bitrate_spinbox.value() * 1000
+        self._bus_utilization.bit_rate_switching = self._brs_checkbox.isChecked()
 
     def _redraw_hook(self):
-        while True:
+        frames = []
+        for _ in range(self.MAX_FRAMES_PER_REDRAW):
             item = self._get_frame()
             if item is None:
                 break
             direction, frame = item
+            frames.append(frame)
             self._traffic_stat.add_frame(direction, frame)
+            self._traffic_breakdown.add_frame(direction, frame)
+            errors = self._stream_monitor.add_frame(direction, frame)
+            if self._trigger is not None and self._trigger.add_frame(direction, frame, errors):
+                self._on_trigger_complete()
+            self._stream_timing.add_frame(direction, frame)
+            self._sniffer_widget.add_frame(direction, frame)
+            if self._capture_writer is not None:
+                self._capture_writer.push(direction, frame)
             # There is no need to maintain a second queue actually; should be refactored
             self._log_widget.add_item_async((direction, frame))
 
+            transfer = self._transfer_reassembler.add_frame(direction, frame)
+            if transfer is not None:
+                self._transfer_log_widget.add_item_async((direction, transfer))
+
+        self._bus_utilization.add_frames(frames)
+
+        if self._capture_writer is not None:
+            self._capture_writer.flush()
+
         bus_load, _ = self._traffic_stat.get_frames_per_second()
         self._stat_display.setText('%d / %d / %d' % (self._traffic_stat.tx, self._traffic_stat.rx, bus_load))
+        self._stat_display.setToolTip('CAN ID decode cache: %d entries, %d hits, %d misses' %
+                                      (len(DECODE_CACHE), DECODE_CACHE.hits, DECODE_CACHE.misses))
+
+    def _get_selected_frames(self):
+        rows = ranges_to_rows(self._log_widget.get_selected_row_ranges())
+        return [self._frame_buffer.get(int(seq)) for seq in self._log_widget.table.model().rows_to_seqs(rows)]
 
     def _decode_transfer_at_row(self, row):
         try:
-            rows, text = decode_transfer_from_frame(row, partial(row_to_frame, self._log_widget.table))
+            seq = self._log_widget.table.model().row_to_seq(row)
+            _, text = decode_transfer(seq, self._frame_buffer, self._transfer_index)
         except Exception as ex:
             text = 'Transfer could not be decoded:\n' + str(ex)
-            rows = [row]
 
         self._decoded_message_box.setPlainText(text.strip())
 
-    def _update_measurement_display(self, selected_rows_cols):
-        if not selected_rows_cols:
-            return
-
-        min_row = min([row for row, _ in selected_rows_cols])
-        max_row = max([row for row, _ in selected_rows_cols])
+    def _decode_transfer_view_row(self, row):
+        try:
+            text = self._transfer_log_widget.table.model().get_entry(row)[1].decode()
+        except Exception as ex:
+            text = 'Transfer could not be decoded:\n' + str(ex)
 
-        if min_row == max_row:
-            self._decode_transfer_at_row(min_row)
+        self._decoded_message_box.setPlainText(text.strip())
 
-        def get_ts_diff(row_earlier, row_later):
-            e = self._log_widget.table.item(row_earlier, 1).text()
-            l = self._log_widget.table.item(row_later, 1).text()
-            return TimestampRenderer.compute_timestamp_difference(e, l)
+    def _on_transfer_selection_changed(self, selected_rows_cols):
+        rows = set(row for row, _ in selected_rows_cols)
+        if len(rows) == 1:
+            self._decode_transfer_view_row(rows.pop())
 
-        def get_load_str(num_frames, dt):
-            if dt >= 1e-6:
-                return 'average load %.1f FPS' % (max(num_frames - 1, 1) / dt)
-            return 'average load is unknown'
+    def _update_measurement_display(self, selected_row_ranges):
+        rows = ranges_to_rows(selected_row_ranges)
+        if not len(rows):
+            return
 
-        if min_row == max_row:
-            num_frames = min_row
-            dt = get_ts_diff(0, min_row)
-            flash(self, '%d frames from beginning, %.3f sec since first frame, %s',
-                  num_frames, dt, get_load_str(num_frames, dt))
+        model = self._log_widget.table.model()
+        if len(rows) == 1:
+            row = int(rows[0])
+            self._decode_transfer_at_row(row)
+            seq = model.row_to_seq(row)
+            dt = get_timestamp_difference(self._frame_buffer, model.row_to_seq(0), seq)
+            since_previous = ''
+            if row > 0:
+                since_previous = ', %.6f sec since previous frame' % \
+                    get_timestamp_difference(self._frame_buffer, model.row_to_seq(row - 1), seq)
+            summary = SelectionSummary(self._frame_buffer, model.rows_to_seqs(numpy.arange(row + 1)))
+            flash(self, '%d frames from beginning, %.3f sec since first frame%s, %s',
+                  row, dt, since_previous, summary.get_load_string())
         else:
-            num_frames = max_row - min_row + 1
-            dt = get_ts_diff(min_row, max_row)
-            flash(self, '%d frames, timedelta %.6f sec, %s',
-                  num_frames, dt, get_load_str(num_frames, dt))
+            summary = SelectionSummary(self._frame_buffer, model.rows_to_seqs(rows))
+            flash(self, '%d frames, %d bytes, timedelta %.6f sec, %s',
+                  summary.count, summary.num_bytes, summary.duration, summary.get_load_string())
+            self._decoded_message_box.setPlainText(summary.get_report())
 
     def _context_menu_requested(self, pos):
         menu = QMenu(self)
@@ -428,7 +1089,7 @@ class BusMonitorWindow(QMainWindow):
 
     def _show_data_type_definition(self, row):
         try:
-            data_type_name = self._log_widget.table.item(row, self._log_widget.table.columnCount() - 1).text()
+            data_type_name = DECODE_CACHE.get(self._log_widget.table.model().get_entry(row)[1]).parsed['data_type']
             definition = dronecan.TYPENAMES[data_type_name].source_text
         except Exception as ex:
             show_error('Data type lookup error', 'Could not load data type definition', ex, self)
@@ -8,12 +8,12 @@
 
 import os
 import sys
-import queue
 import logging
 import multiprocessing
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import QTimer
 from .window import CANBootloaderWindow
+from ..ipc_channel import IPCChannel
 
 logger = logging.getLogger(__name__)
 
@@ -26,29 +26,6 @@ except AttributeError:
     PARENT_PID = os.getppid()
 
 
-class IPCChannel:
-    """
-    This class is built as an abstraction over the underlying IPC communication channel.
-    """
-    def __init__(self):
-        # Queue is slower than pipe, but it allows to implement non-blocking sending easier,
-        # and the buffer can be arbitrarily large.
-        self._q = multiprocessing.Queue()
-
-    def send_nonblocking(self, obj):
-        try:
-            self._q.put_nowait(obj)
-        except queue.Full:
-            pass
-
-    def receive_nonblocking(self):
-        """Returns: (True, object) if successful, (False, None) if no data to read """
-        try:
-            return True, self._q.get_nowait()
-        except queue.Empty:
-            return False, None
-
-
 IPC_COMMAND_STOP = 'stop'
 
 
@@ -76,7 +53,7 @@ def _process_entry_point(channel, iface_name):
             else:
                 return obj
 
-    win = CANBootloaderWindow(get_frame, iface_name)
+    win = CANBootloaderWindow(get_frame, iface_name, get_ipc_status=channel.get_status_string)
     win.show()
 
     logger.info('CAN bootloader process %r initialized successfully, now starting the event loop', os.getpid())
@@ -26,11 +26,23 @@ class CANBootloaderWindow(QMainWindow):
     DEFAULT_PLOT_X_RANGE = 120
     BUS_LOAD_PLOT_MAX_SAMPLES = 50000
 
-    def __init__(self, get_frame, iface_name):
+    def __init__(self, get_frame, iface_name, get_ipc_status=None):
         super(CANBootloaderWindow, self).__init__()
         self.setWindowTitle('CAN Bootloader (%s)' % iface_name.split(os.path.sep)[-1])
         self.setWindowIcon(get_app_icon())
 
+        self._get_frame = get_frame
+        self._get_ipc_status = get_ipc_status
+
+        # The frames are not used yet, but they have to be consumed, otherwise they pile up in the IPC channel
+        # and the stop command is never seen
+        self._ipc_status_display = QLabel(self)
+        self.statusBar().addPermanentWidget(self._ipc_status_display)
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setSingleShot(False)
+        self._poll_timer.timeout.connect(self._poll)
+        self._poll_timer.start(100)
+
         self.setGeometry(100, 100, 700, 300)
 
         file_choose_layout = QHBoxLayout(self)
@@ -81,6 +93,13 @@ class CANBootloaderWindow(QMainWindow):
         # noinspection PyCallByClass,PyTypeChecker
         # QTimer.singleShot(500, self._update_widget_sizes)
 
+    def _poll(self):
+        while self._get_frame() is not None:
+            pass
+
+        if self._get_ipc_status is not None:
+            self._ipc_status_display.setText(self._get_ipc_status())
+
     def toggle_address_edit(self):
         self.start_address_edit.setVisible(not self.use_address_checkbox.isChecked())
         self.start_address_lable.setVisible(not self.use_address_checkbox.isChecked())
@@ -0,0 +1,103 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import queue
+import logging
+import multiprocessing
+
+logger = logging.getLogger(__name__)
+
+
+class IPCChannel:
+    """
+    This class is built as an abstraction over the underlying IPC communication channel.
+    The channel is bounded; once it is full, the policy defines which objects are lost:
+        POLICY_DROP_OLDEST  - the new object is discarded, and the receiver that finds the channel full skips the
+                              oldest queued objects until the channel is half empty, so that it catches up with
+                              the sender instead of working through the stale backlog;
+        POLICY_DROP_NEWEST  - the new object is discarded;
+        POLICY_BLOCK        - the sender waits up to block_timeout seconds, then the new object is discarded.
+    Only POLICY_BLOCK may block the sender.
+    The counters are kept in shared memory, so that both the sender and the receiver can report them.
+    """
+    POLICY_DROP_OLDEST = 'drop-oldest'
+    POLICY_DROP_NEWEST = 'drop-newest'
+    POLICY_BLOCK = 'block'
+
+    DEFAULT_MAX_SIZE = 10000
+
+    _STAT_ENQUEUED = 0
+    _STAT_REJECTED = 1      # Never made it into the queue
+    _STAT_EVICTED = 2       # Skipped by the receiver
+    _STAT_RECEIVED = 3
+    _STAT_HIGH_WATER_MARK = 4
+    _NUM_STATS = 5
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, policy=POLICY_DROP_OLDEST, block_timeout=0.1):
+        if policy not in (self.POLICY_DROP_OLDEST, self.POLICY_DROP_NEWEST, self.POLICY_BLOCK):
+            raise ValueError('Invalid IPC channel policy: %r' % policy)
+        self._policy = policy
+        self._max_size = max_size
+        self._block_timeout = block_timeout
+        self._q = multiprocessing.Queue(max_size)
+        # Every counter has exactly one writer process, hence no locking
+        self._stats = multiprocessing.Array('Q', self._NUM_STATS, lock=False)
+
+    def _put(self, obj):
+        if self._policy == self.POLICY_BLOCK:
+            self._q.put(obj, timeout=self._block_timeout)
+        else:
+            self._q.put_nowait(obj)
+
+    def send_nonblocking(self, obj):
+        try:
+            self._put(obj)
+        except queue.Full:
+            # The oldest objects are not taken out here, that would block and unpickle them in the sender
+            self._stats[self._STAT_REJECTED] += 1
+            return
+
+        self._stats[self._STAT_ENQUEUED] += 1
+        depth = self.depth
+        if depth > self._stats[self._STAT_HIGH_WATER_MARK]:
+            self._stats[self._STAT_HIGH_WATER_MARK] = depth
+
+    def receive_nonblocking(self):
+        """Returns: (True, object) if successful, (False, None) if no data to read """
+        if self._policy == self.POLICY_DROP_OLDEST and self.depth >= self._max_size:
+            for _ in range(self.depth - self._max_size // 2):
+                try:
+                    self._q.get_nowait()
+                except queue.Empty:
+                    return False, None      # The rest is still on its way from the sender, it is skipped next time
+                self._stats[self._STAT_EVICTED] += 1
+        try:
+            obj = self._q.get_nowait()
+        except queue.Empty:
+            return False, None
+        self._stats[self._STAT_RECEIVED] += 1
+        return True, obj
+
+    @property
+    def enqueued(self):
+        return self._stats[self._STAT_ENQUEUED]
+
+    @property
+    def dropped(self):
+        return self._stats[self._STAT_REJECTED] + self._stats[self._STAT_EVICTED]
+
+    @property
+    def high_water_mark(self):
+        return self._stats[self._STAT_HIGH_WATER_MARK]
+
+    @property
+    def depth(self):
+        """Number of objects that were sent but not yet received, i.e. the receiver's lag"""
+        return max(0, self._stats[self._STAT_ENQUEUED] - self._stats[self._STAT_EVICTED] -
+                   self._stats[self._STAT_RECEIVED])
+
+    def get_status_string(self):
+        return 'IPC lag %d, dropped %d, peak %d' % (self.depth, self.dropped, self.high_water_mark)
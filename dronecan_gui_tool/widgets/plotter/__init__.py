@@ -8,13 +8,14 @@
 
 import os
 import sys
-import queue
+import time
 import dronecan
 import logging
 import multiprocessing
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import QTimer
 from .window import PlotterWindow
+from ..ipc_channel import IPCChannel
 
 logger = logging.getLogger(__name__)
 
@@ -27,33 +28,12 @@ except AttributeError:
     PARENT_PID = os.getppid()
 
 
-class IPCChannel:
-    """
-    This class is built as an abstraction over the underlying IPC communication channel.
-    """
-    def __init__(self):
-        # Queue is slower than pipe, but it allows to implement non-blocking sending easier,
-        # and the buffer can be arbitrarily large.
-        self._q = multiprocessing.Queue()
-
-    def send_nonblocking(self, obj):
-        try:
-            self._q.put_nowait(obj)
-        except queue.Full:
-            pass
-
-    def receive_nonblocking(self):
-        """Returns: (True, object) if successful, (False, None) if no data to read """
-        try:
-            return True, self._q.get_nowait()
-        except queue.Empty:
-            return False, None
-
-
 IPC_COMMAND_STOP = 'stop'
+IPC_ACTIVE_DATA_TYPES = 'active_data_types'             # Parent to plotter: data types seen on the bus
+IPC_COMMAND_SET_WANTED_DATA_TYPES = 'set_wanted'        # Plotter to parent: data types to be forwarded
 
 
-def _process_entry_point(channel):
+def _process_entry_point(channel, request_channel):
     logger.info('Plotter process started with PID %r', os.getpid())
     app = QApplication(sys.argv)    # Inheriting args from the parent process
 
@@ -69,15 +49,24 @@ def _process_entry_point(channel):
     exit_check_timer.start(2000)
 
     def get_transfer():
-        received, obj = channel.receive_nonblocking()
-        if received:
+        while True:
+            received, obj = channel.receive_nonblocking()
+            if not received:
+                return
             if obj == IPC_COMMAND_STOP:
                 logger.info('Plotter process has received a stop request, goodbye')
                 app.exit(0)
-            else:
-                return obj
+                return
+            if isinstance(obj, tuple) and obj[0] == IPC_ACTIVE_DATA_TYPES:
+                win.add_active_data_types(obj[1])
+                continue
+            return obj
+
+    def set_wanted_data_types(names):
+        request_channel.send_nonblocking((IPC_COMMAND_SET_WANTED_DATA_TYPES, names))
 
-    win = PlotterWindow(get_transfer)
+    win = PlotterWindow(get_transfer, get_ipc_status=channel.get_status_string,
+                        set_wanted_data_types=set_wanted_data_types)
     win.show()
 
     logger.info('Plotter process %r initialized successfully, now starting the event loop', os.getpid())
@@ -147,35 +136,88 @@ class MessageTransfer:
 
 
 class PlotterManager:
+    """
+    The messages are converted and forwarded only to the plotters that want their data types, which they report
+    via the request channel; the names of all data types seen on the bus are announced to every plotter instead.
+    Both channels drop objects when full, so both sides repeat the full state periodically rather than the changes.
+    """
+    REQUEST_POLL_INTERVAL = 0.1
+    ACTIVE_DATA_TYPES_RESEND_INTERVAL = 1.0
+
     def __init__(self, node):
         self._node = node
-        self._inferiors = []    # process object, channel
+        self._inferiors = []    # process object, channel, request channel, set of wanted data type names
         self._hook_handle = None
+        self._active_data_types = set()
+        self._last_request_poll_at = 0
+        self._last_announcement_at = 0
+
+    @staticmethod
+    def _process_requests(request_channel, wanted_data_types):
+        while True:
+            received, obj = request_channel.receive_nonblocking()
+            if not received:
+                break
+            command, argument = obj
+            if command == IPC_COMMAND_SET_WANTED_DATA_TYPES:
+                if wanted_data_types != set(argument):
+                    logger.info('Plotter wants data types %r', argument)
+                    wanted_data_types.clear()
+                    wanted_data_types.update(argument)
+            else:
+                logger.warning('Unknown plotter request %r', command)
 
     def _transfer_hook(self, tr):
         if tr.direction == 'rx' and not tr.service_not_message and len(self._inferiors):
-            msg = MessageTransfer(tr)
-            for proc, channel in self._inferiors[:]:
+            data_type_name = dronecan.get_dronecan_data_type(tr.payload).full_name
+            new_data_type = data_type_name not in self._active_data_types
+            if new_data_type:
+                self._active_data_types.add(data_type_name)
+
+            poll_requests = time.monotonic() - self._last_request_poll_at >= self.REQUEST_POLL_INTERVAL
+            if poll_requests:
+                self._last_request_poll_at = time.monotonic()
+
+            announcement = None
+            if new_data_type or \
+                    time.monotonic() - self._last_announcement_at >= self.ACTIVE_DATA_TYPES_RESEND_INTERVAL:
+                self._last_announcement_at = time.monotonic()
+                announcement = IPC_ACTIVE_DATA_TYPES, sorted(self._active_data_types)
+
+            msg = None      # The conversion is expensive, so it is done only if some plotter needs the message
+            for inferior in self._inferiors[:]:
+                proc, channel, request_channel, wanted_data_types = inferior
                 if proc.is_alive():
                     try:
-                        channel.send_nonblocking(msg)
+                        if poll_requests:
+                            self._process_requests(request_channel, wanted_data_types)
+                        if announcement is not None:
+                            channel.send_nonblocking(announcement)
+                        if data_type_name in wanted_data_types:
+                            if msg is None:
+                                msg = MessageTransfer(tr)
+                            channel.send_nonblocking(msg)
                     except Exception:
                         logger.error('Failed to send data to process %r', proc, exc_info=True)
                 else:
                     logger.info('Plotter process %r appears to be dead, removing', proc)
-                    self._inferiors.remove((proc, channel))
+                    self._inferiors.remove(inferior)
 
     def spawn_plotter(self):
-        channel = IPCChannel()
+        # Old data is useless for live plots, so the oldest transfers are dropped if the plotter can't keep up
+        channel = IPCChannel(policy=IPCChannel.POLICY_DROP_OLDEST)
+        # Only the latest request matters
+        request_channel = IPCChannel(max_size=10, policy=IPCChannel.POLICY_DROP_OLDEST)
 
         if self._hook_handle is None:
             self._hook_handle = self._node.add_transfer_hook(self._transfer_hook)
 
-        proc = multiprocessing.Process(target=_process_entry_point, name='plotter', args=(channel,))
+        proc = multiprocessing.Process(target=_process_entry_point, name='plotter', args=(channel, request_channel))
         proc.daemon = True
         proc.start()
 
-        self._inferiors.append((proc, channel))
+        channel.send_nonblocking((IPC_ACTIVE_DATA_TYPES, sorted(self._active_data_types)))
+        self._inferiors.append((proc, channel, request_channel, set()))
 
         logger.info('Spawned new plotter process %r', proc)
 
@@ -185,19 +227,19 @@ class PlotterManager:
         except Exception:
             pass
 
-        for _, channel in self._inferiors:
+        for _, channel, _, _ in self._inferiors:
             try:
                 channel.send_nonblocking(IPC_COMMAND_STOP)
             except Exception:
                 pass
 
-        for proc, _ in self._inferiors:
+        for proc, _, _, _ in self._inferiors:
             try:
                 proc.join(1)
             except Exception:
                 pass
 
-        for proc, _ in self._inferiors:
+        for proc, _, _, _ in self._inferiors:
             try:
                 proc.terminate()
             except Exception:
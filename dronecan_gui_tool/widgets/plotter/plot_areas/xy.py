@@ -14,6 +14,7 @@ from PyQt5.QtCore import Qt
 from pyqtgraph import PlotWidget, mkPen
 from . import AbstractPlotArea, add_crosshair
 from ... import make_icon_button
+from ...sample_ring import SampleRingBuffer
 
 
 logger = logging.getLogger(__name__)
@@ -22,19 +23,18 @@ logger = logging.getLogger(__name__)
 class AbstractPlotContainer:
     def __init__(self, plot):
         self.plot = plot
-        self.x = []
-        self.y = []
+        self.samples = None
 
     def add_point(self, x, y, max_data_points):
-        while len(self.x) >= max_data_points:
-            self.x.pop(0)
-            self.y.pop(0)
-        assert len(self.x) == len(self.y)
-        self.x.append(x)
-        self.y.append(y)
+        if self.samples is None:
+            self.samples = SampleRingBuffer(max_data_points, sorted_x=False)
+        elif self.samples.capacity != max_data_points:
+            self.samples.set_capacity(max_data_points)
+        self.samples.append(x, y)
 
     def update(self):
-        self.plot.setData(self.x, self.y)
+        if self.samples is not None:
+            self.plot.setData(self.samples.x, self.samples.y)
 
 
 class LinePlotContainer(AbstractPlotContainer):
@@ -13,29 +13,27 @@ from PyQt5.QtCore import Qt
 from pyqtgraph import PlotWidget, mkPen
 from . import AbstractPlotArea, add_crosshair
 from ... import make_icon_button
+from ...sample_history import SampleHistory
 
 
 logger = logging.getLogger(__name__)
 
 
 class CurveContainer:
-    MAX_DATA_POINTS = 200000
+    MAX_DATA_POINTS = 200000        # At full resolution; the older data is kept downsampled
 
-    def __init__(self, plot, base_color, darkening, pen):
+    def __init__(self, plot, base_color, darkening, pen, spill_history=False):
         self.base_color = base_color
         self.darkening = darkening
         self.pen = pen
         self.plot = plot
-        self.x = []
-        self.y = []
+        self.samples = SampleHistory(self.MAX_DATA_POINTS, spill=spill_history)
+        self._modified = True
+        self._rendered_view = None
 
     def add_point(self, x, y):
-        while len(self.x) >= self.MAX_DATA_POINTS:
-            self.x.pop(0)
-            self.y.pop(0)
-        assert len(self.x) == len(self.y)
-        self.x.append(x)
-        self.y.append(y)
+        self.samples.append(x, y)
+        self._modified = True
 
     def set_color(self, color):
         if self.base_color != color:
@@ -44,8 +42,15 @@ class CurveContainer:
             logger.info('Updating color %r --> %r', self.pen.color(), color)
             self.pen.setColor(color)
 
-    def update(self):
-        self.plot.setData(self.x, self.y, pen=self.pen)
+    def update(self, x_range, max_points):
+        """Renders the samples within the X range decimated to max_points; does nothing if nothing has changed"""
+        view = tuple(x_range), max_points
+        if not self._modified and view == self._rendered_view:
+            return
+        self._modified = False
+        self._rendered_view = view
+        x, y = self.samples.get_range(x_range[0], x_range[1], max_points, keep_bounds=True)
+        self.plot.setData(x, y, pen=self.pen)
 
 
 class PlotAreaYTWidget(QWidget, AbstractPlotArea):
@@ -64,6 +69,10 @@ class PlotAreaYTWidget(QWidget, AbstractPlotArea):
 
         self._clear_button = make_icon_button('eraser', 'Clear all curves', self, on_clicked=self._do_clear)
 
+        self._spill_history_checkbox = make_icon_button('hdd-o',
+                                                        'Keep the downsampled history of new curves in temporary '
+                                                        'files instead of RAM', self, checkable=True)
+
         self._plot = PlotWidget(self, background=QColor(Qt.black))
         self._plot.showButtons()
         self._plot.enableAutoRange()
@@ -71,12 +80,14 @@ class PlotAreaYTWidget(QWidget, AbstractPlotArea):
         self._legend = None
         # noinspection PyArgumentList
         self._plot.setRange(xRange=(0, self.INITIAL_X_RANGE), padding=0)
+        self._plot.sigXRangeChanged.connect(self._render_curves)
 
         layout = QHBoxLayout(self)
 
         controls_layout = QVBoxLayout(self)
         controls_layout.addWidget(self._clear_button)
         controls_layout.addWidget(self._autoscroll_checkbox)
+        controls_layout.addWidget(self._spill_history_checkbox)
         controls_layout.addStretch(1)
         layout.addLayout(controls_layout)
 
@@ -119,7 +130,8 @@ class PlotAreaYTWidget(QWidget, AbstractPlotArea):
                 pattern = dash_patterns[int(idx / len(darkening_values)) % len(dash_patterns)]
                 pen = mkPen(color=base_color.darker(darkening), width=1, dash=pattern)
                 plot = self._plot.plot(name=str(idx), pen=pen)
-                out.append(CurveContainer(plot, base_color, darkening, pen))
+                out.append(CurveContainer(plot, base_color, darkening, pen,
+                                          spill_history=self._spill_history_checkbox.isChecked()))
             except Exception:
                 logger.error('Could not add curve', exc_info=True)
         return out
@@ -174,12 +186,15 @@ class PlotAreaYTWidget(QWidget, AbstractPlotArea):
         # noinspection PyArgumentList
         self._plot.setRange(xRange=(0, self.INITIAL_X_RANGE), padding=0)
 
-    def update(self):
-        # Updating curves
+    def _render_curves(self):
+        """Only the visible range is rendered, decimated to about two points per horizontal pixel"""
+        x_range, _ = self._plot.viewRange()
+        max_points = max(self._plot.width(), 100) * 2
         for curves in self._extractor_associations.values():
             for c in curves:
-                c.update()
+                c.update(x_range, max_points)
 
+    def update(self):
         # Updating view range
         if self._autoscroll_checkbox.isChecked():
             (xmin, xmax), _ = self._plot.viewRange()
@@ -188,3 +203,5 @@ class PlotAreaYTWidget(QWidget, AbstractPlotArea):
             xmin = self._max_x - diff
             # noinspection PyArgumentList
             self._plot.setRange(xRange=(xmin, xmax), padding=0)
+
+        self._render_curves()
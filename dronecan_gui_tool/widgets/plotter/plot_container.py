@@ -17,7 +17,7 @@ logger = logging.getLogger(__name__)
 
 
 class PlotContainerWidget(QDockWidget):
-    def __init__(self, parent, plot_area_class, active_data_types):
+    def __init__(self, parent, plot_area_class, active_data_types, extractor_index):
         super(PlotContainerWidget, self).__init__(parent)
         self.setAttribute(Qt.WA_DeleteOnClose)              # This is required to stop background timers!
 
@@ -29,6 +29,7 @@ class PlotContainerWidget(QDockWidget):
         self.reset = self._plot_area.reset
 
         self._active_data_types = active_data_types
+        self._extractor_index = extractor_index
         self._extractors = []
 
         self._new_extractor_button = make_icon_button('plus', 'Add new value extractor', self,
@@ -75,12 +76,14 @@ class PlotContainerWidget(QDockWidget):
 
         def done(extractor):
             self._extractors.append(extractor)
+            self._extractor_index.add(extractor, self._process_transfer)
             widget = ExtractorWidget(self, extractor)
             self._extractors_layout.addWidget(widget)
 
             def remove():
                 self._plot_area.remove_curves_provided_by_extractor(extractor)
                 self._extractors.remove(extractor)
+                self._extractor_index.remove(extractor)
                 self._extractors_layout.removeWidget(widget)
 
             widget.on_remove = remove
@@ -89,16 +92,16 @@ class PlotContainerWidget(QDockWidget):
         win.on_done = done
         win.show()
 
-    def process_transfer(self, timestamp, tr):
-        for extractor in self._extractors:
-            try:
-                value = extractor.try_extract(tr)
-                if value is None:
-                    continue
+    def _process_transfer(self, extractor, timestamp, tr):
+        try:
+            value = extractor.try_extract(tr)
+            if value is not None:
                 self._plot_area.add_value(extractor, timestamp, value)
-            except Exception:
-                extractor.register_error()
+        except Exception:
+            extractor.register_error()
 
     def closeEvent(self, qcloseevent):
         super(PlotContainerWidget, self).closeEvent(qcloseevent)
+        for extractor in self._extractors:
+            self._extractor_index.remove(extractor)
         self.on_close()
@@ -39,21 +39,25 @@ class Expression:
 
 
 class Extractor:
-    def __init__(self, data_type_name, extraction_expression, filter_expressions, color):
+    def __init__(self, data_type_name, extraction_expression, filter_expressions, color, source_node_id=None):
         self.data_type_name = data_type_name
+        self.source_node_id = source_node_id        # None accepts any node
         self.extraction_expression = extraction_expression
         self.filter_expressions = filter_expressions
         self.color = color
         self._error_count = 0
 
     def __repr__(self):
-        return '%r %r %r' % (self.data_type_name, self.extraction_expression.source,
-                             [x.source for x in self.filter_expressions])
+        return '%r %r %r %r' % (self.data_type_name, self.source_node_id, self.extraction_expression.source,
+                                [x.source for x in self.filter_expressions])
 
     def try_extract(self, tr):
         if tr.data_type_name != self.data_type_name:
             return
 
+        if self.source_node_id is not None and tr.source_node_id != self.source_node_id:
+            return
+
         evaluation_kwargs = {
             EXPRESSION_VARIABLE_FOR_MESSAGE: tr.message,
             EXPRESSION_VARIABLE_FOR_SRC_NODE_ID: tr.source_node_id,
@@ -76,3 +80,36 @@ class Extractor:
     @property
     def error_count(self):
         return self._error_count
+
+
+class ExtractorIndex:
+    """
+    Maps the data type name and the source node ID of a transfer to the extractors that accept it, so that every
+    transfer is offered only to the relevant extractors rather than to all of them.
+    Every extractor is registered with the handler handler(extractor, timestamp, transfer) that processes it.
+    """
+    def __init__(self):
+        self._index = {}        # (data type name, source node ID or None) : [(extractor, handler)]
+
+    @staticmethod
+    def _get_key(extractor):
+        return extractor.data_type_name, extractor.source_node_id
+
+    def add(self, extractor, handler):
+        self._index.setdefault(self._get_key(extractor), []).append((extractor, handler))
+
+    def remove(self, extractor):
+        key = self._get_key(extractor)
+        entries = [e for e in self._index.get(key, []) if e[0] is not extractor]
+        if entries:
+            self._index[key] = entries
+        else:
+            self._index.pop(key, None)
+
+    def get_matching(self, data_type_name, source_node_id):
+        """Returns a list of (extractor, handler) that may accept a transfer of this type from this node"""
+        return self._index.get((data_type_name, None), []) + self._index.get((data_type_name, source_node_id), [])
+
+    @property
+    def data_type_names(self):
+        return set(name for name, _ in self._index.keys())
@@ -224,11 +224,6 @@ class NewValueExtractorWindow(QDialog):
 
         # Filter expressions
         filter_expressions = []
-        if self._node_id_filter_checkbox.isChecked():
-            node_id = self._node_id_filter_spinbox.value()
-            filter_expressions.append(
-                Expression('%s == %d' % (EXPRESSION_VARIABLE_FOR_SRC_NODE_ID, node_id)))
-
         if self._filter_expression_box.text().strip():
             try:
                 fe = Expression(self._filter_expression_box.text())
@@ -241,7 +236,10 @@ class NewValueExtractorWindow(QDialog):
         color = self._selected_color
 
         # Finally!
-        extractor = Extractor(data_type_name, extraction_expression, filter_expressions, color)
+        # The node ID filter is not an expression, so that the transfers can be dispatched by the source node
+        source_node_id = self._node_id_filter_spinbox.value() if self._node_id_filter_checkbox.isChecked() else None
+
+        extractor = Extractor(data_type_name, extraction_expression, filter_expressions, color, source_node_id)
         self.on_done(extractor)
 
         # Updating dependent states
@@ -332,11 +330,15 @@ class ExtractorWidget(QWidget):
             w.setMinimumWidth(text_size.width() + magic_number)
             return w
 
+        filters = [x.source for x in model.filter_expressions]
+        if model.source_node_id is not None:
+            filters.insert(0, '%s == %d' % (EXPRESSION_VARIABLE_FOR_SRC_NODE_ID, model.source_node_id))
+
         layout = QHBoxLayout(self)
         layout.addWidget(self._delete_button)
         layout.addWidget(self._color_button)
         layout.addWidget(box(model.data_type_name, 'Message type name'))
-        layout.addWidget(box(' AND '.join([x.source for x in model.filter_expressions]), 'Filter expressions'))
+        layout.addWidget(box(' AND '.join(filters), 'Filter expressions'))
         layout.addWidget(self._extraction_expression_box, 1)
         layout.addWidget(self._error_label)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -9,19 +9,23 @@
 import time
 import logging
 from functools import partial
-from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QAction
+from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QAction, QLabel
 from PyQt5.QtCore import QTimer, Qt
 from PyQt5.QtGui import QKeySequence
 from .. import get_app_icon, get_icon
 from .plot_areas import PLOT_AREAS
 from .plot_container import PlotContainerWidget
+from .value_extractor import ExtractorIndex
 
 
 logger = logging.getLogger(__name__)
 
 
 class PlotterWindow(QMainWindow):
-    def __init__(self, get_transfer_callback):
+    IPC_STATUS_UPDATE_INTERVAL = 0.5
+    WANTED_DATA_TYPES_RESEND_INTERVAL = 1.0
+
+    def __init__(self, get_transfer_callback, get_ipc_status=None, set_wanted_data_types=None):
         super(PlotterWindow, self).__init__()
         self.setWindowTitle('DroneCAN Plotter')
         self.setWindowIcon(get_app_icon())
@@ -30,6 +34,16 @@ class PlotterWindow(QMainWindow):
 
         self._get_transfer = get_transfer_callback
 
+        # The data source is told which data types are needed, so that it does not have to deliver the rest
+        self._set_wanted_data_types = set_wanted_data_types
+        self._wanted_data_types = None
+        self._wanted_data_types_sent_at = 0
+
+        self._get_ipc_status = get_ipc_status
+        self._ipc_status_display = QLabel(self)
+        self._ipc_status_updated_at = 0
+        self.statusBar().addPermanentWidget(self._ipc_status_display)
+
         self._update_timer = QTimer(self)
         self._update_timer.setSingleShot(False)
         self._update_timer.timeout.connect(self._update)
@@ -38,6 +52,7 @@ class PlotterWindow(QMainWindow):
         self._base_time = time.monotonic()
 
         self._plot_containers = []
+        self._extractor_index = ExtractorIndex()       # Shared by all plot containers
 
         #
         # Control menu
@@ -52,8 +67,8 @@ class PlotterWindow(QMainWindow):
         control_menu.addAction(self._stop_action)
 
         self._pause_action = QAction(get_icon('pause'), '&Pause Updates', self)
-        self._pause_action.setStatusTip('While paused, new data will be accumulated in memory '
-                                        'to be processed once un-paused')
+        self._pause_action.setStatusTip('While paused, the plots are frozen; the data that arrives meanwhile is '
+                                        'not plotted')
         self._pause_action.setShortcut(QKeySequence('Ctrl+Shift+P'))
         self._pause_action.setCheckable(True)
         self._pause_action.toggled.connect(self._on_pause_toggled)
@@ -96,7 +111,8 @@ class PlotterWindow(QMainWindow):
         def remove():
             self._plot_containers.remove(plc)
 
-        plc = PlotContainerWidget(self, PLOT_AREAS[plot_area_name], self._active_data_types)
+        plc = PlotContainerWidget(self, PLOT_AREAS[plot_area_name], self._active_data_types,
+                                  self._extractor_index)
         plc.on_close = remove
         self._plot_containers.append(plc)
 
@@ -123,7 +139,30 @@ class PlotterWindow(QMainWindow):
 
         logger.info('Reset done, new time base %r', self._base_time)
 
+    def add_active_data_types(self, names):
+        self._active_data_types.update(names)
+
+    def _update_wanted_data_types(self):
+        # Nothing is plotted while stopped, paused or hidden, so the data source stops forwarding anything at all
+        idle = self._stop_action.isChecked() or self._pause_action.isChecked() or \
+            not self.isVisible() or self.isMinimized()
+        wanted = set() if idle else self._extractor_index.data_type_names
+        # The request may be lost on the way, so it is repeated even if nothing has changed
+        if wanted != self._wanted_data_types or \
+                time.monotonic() - self._wanted_data_types_sent_at >= self.WANTED_DATA_TYPES_RESEND_INTERVAL:
+            self._wanted_data_types = wanted
+            self._wanted_data_types_sent_at = time.monotonic()
+            self._set_wanted_data_types(sorted(wanted))
+
     def _update(self):
+        if self._set_wanted_data_types is not None:
+            self._update_wanted_data_types()
+
+        if self._get_ipc_status is not None and \
+                time.monotonic() - self._ipc_status_updated_at >= self.IPC_STATUS_UPDATE_INTERVAL:
+            self._ipc_status_updated_at = time.monotonic()
+            self._ipc_status_display.setText(self._get_ipc_status())
+
         if self._stop_action.isChecked():
             while self._get_transfer() is not None:     # Discarding everything
                 pass
@@ -137,9 +176,9 @@ class PlotterWindow(QMainWindow):
 
                 self._active_data_types.add(tr.data_type_name)
 
-                for plc in self._plot_containers:
+                for extractor, handler in self._extractor_index.get_matching(tr.data_type_name, tr.source_node_id):
                     try:
-                        plc.process_transfer(tr.ts_mono - self._base_time, tr)
+                        handler(extractor, tr.ts_mono - self._base_time, tr)
                     except Exception:
                         logger.error('Plot container failed to process a transfer', exc_info=True)
 
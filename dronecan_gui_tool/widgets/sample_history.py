@@ -0,0 +1,157 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import numpy
+from .sample_ring import ColumnRingBuffer, SampleRingBuffer, allocate_mapped, decimate_min_max, get_extreme_indexes
+
+# Columns of the bucket levels
+_X_START, _X_MIN, _Y_MIN, _X_MAX, _Y_MAX = range(5)
+
+
+class SampleHistory:
+    """
+    Multi-resolution history of a time series, for plotting hours of data at any zoom level with bounded memory.
+    The newest samples are kept at full resolution. Every next level keeps buckets that aggregate REDUCTION_FACTOR
+    consecutive buckets of the previous level (or samples, for the first level) into their minimum and maximum,
+    so every level spans REDUCTION_FACTOR times more time than the previous one at the same memory cost.
+    A range is rendered from the finest level that covers it within the point budget; the newest samples that have
+    not been aggregated into that level yet are taken from the finer levels. The lookups require non-decreasing x,
+    so a sample that steps back is stored at the x of the previous sample.
+    If spill is set, the bucket levels are kept in temporary files rather than in RAM.
+    """
+    REDUCTION_FACTOR = 16
+    NUM_LEVELS = 4
+    LEVEL_CAPACITY = 65536          # Buckets per level
+
+    def __init__(self, capacity, spill=False):
+        self._samples = SampleRingBuffer(capacity)
+        self._levels = [ColumnRingBuffer(self.LEVEL_CAPACITY, [numpy.float64] * 5,
+                                         allocate=allocate_mapped if spill else numpy.zeros)
+                        for _ in range(self.NUM_LEVELS)]
+        self._pending = [None] * self.NUM_LEVELS       # Incomplete bucket of every level as a list of columns + count
+
+    def append(self, x, y):
+        last = self._samples.last
+        if last is not None and x < last[0]:
+            x = last[0]
+        self._samples.append(x, y)
+        bucket = x, x, y, x, y
+        for i, acc in enumerate(self._pending):
+            if acc is None:
+                self._pending[i] = list(bucket) + [1]
+                return
+            # The comparisons are arranged so that NaN is replaced by any number
+            if bucket[_Y_MIN] < acc[_Y_MIN] or acc[_Y_MIN] != acc[_Y_MIN]:
+                acc[_X_MIN], acc[_Y_MIN] = bucket[_X_MIN], bucket[_Y_MIN]
+            if bucket[_Y_MAX] > acc[_Y_MAX] or acc[_Y_MAX] != acc[_Y_MAX]:
+                acc[_X_MAX], acc[_Y_MAX] = bucket[_X_MAX], bucket[_Y_MAX]
+            acc[-1] += 1
+            if acc[-1] < self.REDUCTION_FACTOR:
+                return
+            self._pending[i] = None
+            bucket = acc[:5]
+            self._levels[i].append(*bucket)
+
+    def clear(self):
+        self._samples.clear()
+        for level in self._levels:
+            level.clear()
+        self._pending = [None] * self.NUM_LEVELS
+
+    def __len__(self):
+        """Number of samples available at full resolution"""
+        return len(self._samples)
+
+    def _get_x(self, level):
+        """Sample x or bucket start x of the level, oldest first"""
+        return self._levels[level - 1].column(_X_START) if level > 0 else self._samples.x
+
+    def _get_unaggregated_start(self, level):
+        """x of the oldest sample that is not in the complete buckets of the level, None if there are none"""
+        for acc in reversed(self._pending[:level]):
+            if acc is not None:
+                return acc[_X_START]
+        return None
+
+    def _get_level_points(self, level, lo, hi, extend_left, extend_right, floor=-numpy.inf):
+        """Buckets or samples starting within [lo, hi]; the extension to the left stops at floor"""
+        x_all = self._get_x(level)
+        first = max(int(numpy.searchsorted(x_all, lo, side='left')) - int(extend_left),
+                    int(numpy.searchsorted(x_all, floor, side='left')))
+        last = min(len(x_all), int(numpy.searchsorted(x_all, hi, side='right')) + int(extend_right))
+        if level == 0:
+            return x_all[first:last], self._samples.y[first:last]
+
+        # Every bucket yields its minimum and its maximum in their original order
+        columns = [self._levels[level - 1].column(c)[first:last] for c in (_X_MIN, _Y_MIN, _X_MAX, _Y_MAX)]
+        x_min, y_min, x_max, y_max = columns
+        swap = x_min > x_max
+        x = numpy.column_stack((numpy.where(swap, x_max, x_min), numpy.where(swap, x_min, x_max))).ravel()
+        y = numpy.column_stack((numpy.where(swap, y_max, y_min), numpy.where(swap, y_min, y_max))).ravel()
+        return x, y
+
+    def _collect(self, level, lo, hi, extend):
+        """
+        Points within [lo, hi] from the level, followed by the newer points from the finer levels.
+        If extend is set, the output is extended by one bucket or sample on either side.
+        """
+        xs, ys = [], []
+        extend_left = extend
+        floor = -numpy.inf
+        while True:
+            end = self._get_unaggregated_start(level)
+            is_last = end is None or end > hi
+            x, y = self._get_level_points(level, lo, hi, extend_left, extend and is_last, floor)
+            xs.append(x)
+            ys.append(y)
+            if is_last:
+                if end is None and level > 0:
+                    # The newest sample is already aggregated, it has to be added explicitly to end the line there
+                    x_last, y_last = self._samples.last
+                    if lo <= x_last <= hi and (not len(x) or x[-1] != x_last):
+                        xs.append(numpy.array([x_last]))
+                        ys.append(numpy.array([y_last]))
+                break
+            level -= 1
+            # The finer bucket that straddles lo contains the points from lo onwards, unless it is aggregated already
+            lo = max(lo, end)
+            extend_left = True
+            floor = end
+        return numpy.concatenate(xs), numpy.concatenate(ys)
+
+    def get_range(self, x_min, x_max, max_points, keep_bounds=False):
+        """
+        Same as SampleRingBuffer.get_range(), except that the older data may be rendered from the aggregated
+        levels, and max_points is mandatory.
+        """
+        if not len(self._samples):
+            return self._samples.x, self._samples.y
+
+        top = max([0] + [i + 1 for i, level in enumerate(self._levels) if len(level)])
+        oldest = self._get_x(top)[0]
+
+        # The finest level that contains the whole range and is not too detailed; the extra detail is decimated
+        budget = max_points * self.REDUCTION_FACTOR
+        level = top
+        for candidate in range(top):
+            x_all = self._get_x(candidate)
+            count = int(numpy.searchsorted(x_all, x_max, side='right') - numpy.searchsorted(x_all, x_min))
+            if x_all[0] <= max(x_min, oldest) and count * (2 if candidate > 0 else 1) <= budget:
+                level = candidate
+                break
+
+        x, y = decimate_min_max(*self._collect(level, x_min, x_max, extend=True), max_points)
+        if keep_bounds:
+            x_before, y_before = self._collect(top, -numpy.inf, x_min, extend=True)
+            x_after, y_after = self._collect(top, x_max, numpy.inf, extend=True)
+            if len(x):
+                # The extremes must not overlap with the extended range, the output has to stay ordered by x
+                x_before, y_before = x_before[x_before < x[0]], y_before[x_before < x[0]]
+                x_after, y_after = x_after[x_after > x[-1]], y_after[x_after > x[-1]]
+            before, after = get_extreme_indexes(y_before), get_extreme_indexes(y_after)
+            x = numpy.concatenate((x_before[before], x, x_after[after]))
+            y = numpy.concatenate((y_before[before], y, y_after[after]))
+        return x, y
@@ -0,0 +1,181 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import tempfile
+import numpy
+
+
+def allocate_mapped(size, dtype):
+    """
+    Allocates a zero-filled array backed by an anonymous temporary file instead of the swap, so that the OS can
+    page it out freely; meant for the bulky data that is rarely accessed, e.g. the older history.
+    """
+    return numpy.memmap(tempfile.TemporaryFile(prefix='dronecan_gui_tool_'), dtype=dtype, mode='w+', shape=(size,))
+
+
+class ColumnRingBuffer:
+    """
+    Fixed-capacity ring buffer of records consisting of several scalar columns, one array per column.
+    Every record is stored twice, at its slot and at the slot plus capacity, so every column can always be
+    accessed as one contiguous array without copying, at the cost of twice the memory.
+    The storage starts small and doubles as it fills up until the capacity is reached, so that the memory is not
+    committed for the records that may never arrive; appending is amortized O(1).
+    The arrays are created with allocate(size, dtype), which can be replaced with e.g. allocate_mapped().
+    """
+    INITIAL_STORAGE_CAPACITY = 1024
+
+    def __init__(self, capacity, dtypes, allocate=numpy.zeros):
+        self._allocate = allocate
+        self._capacity = None
+        self._storage_capacity = 0
+        self._columns = [numpy.zeros(0, dtype=dt) for dt in dtypes]
+        self._count = 0         # Total number of records appended since the last reallocation
+        self.set_capacity(capacity)
+
+    def __len__(self):
+        return min(self._count, self._storage_capacity)
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    def set_capacity(self, capacity):
+        """Changes the maximum number of stored records; the oldest records that do not fit are discarded"""
+        capacity = int(capacity)
+        if capacity < 1:
+            raise ValueError('Invalid capacity: %r' % capacity)
+        self._capacity = capacity
+        self._reallocate(max(len(self), min(capacity, self.INITIAL_STORAGE_CAPACITY)))
+
+    def _reallocate(self, storage_capacity):
+        storage_capacity = min(storage_capacity, self._capacity)
+        keep = min(len(self), storage_capacity)
+        columns = []
+        for i, old in enumerate(self._columns):
+            values = self.column(i)[len(self) - keep:]
+            a = self._allocate(storage_capacity * 2, dtype=old.dtype)
+            a[:keep] = a[storage_capacity:storage_capacity + keep] = values
+            columns.append(a)
+        self._columns = columns
+        self._storage_capacity = storage_capacity
+        self._count = keep
+
+    def append(self, *values):
+        storage_capacity = self._storage_capacity
+        if self._count >= storage_capacity < self._capacity:
+            self._reallocate(storage_capacity * 2)
+            storage_capacity = self._storage_capacity
+        slot = self._count % storage_capacity
+        for a, v in zip(self._columns, values):
+            a[slot] = a[slot + storage_capacity] = v
+        self._count += 1
+
+    def clear(self):
+        self._count = 0
+
+    def column(self, index):
+        """Read-only view of the stored values of the column, oldest first"""
+        a = self._columns[index]
+        if self._count <= self._storage_capacity:
+            v = a[:self._count]
+        else:
+            start = self._count % self._storage_capacity
+            v = a[start:start + self._storage_capacity]
+        v = v.view(numpy.ndarray)
+        v.flags.writeable = False
+        return v
+
+    @property
+    def last(self):
+        """Returns the newest record as a tuple or None if empty"""
+        if not self._count:
+            return None
+        slot = (self._count - 1) % self._storage_capacity
+        return tuple(a[slot] for a in self._columns)
+
+
+class SampleRingBuffer(ColumnRingBuffer):
+    """
+    Ring buffer of (x, y) samples, e.g. time series.
+    Range lookups require non-decreasing x, so unless sorted_x is cleared, a sample that steps back is stored at the
+    x of the previous sample. Buffers with sorted_x cleared, e.g. for X-Y plots, do not support range lookups.
+    """
+    def __init__(self, capacity, x_dtype=numpy.float64, y_dtype=numpy.float64, allocate=numpy.zeros, sorted_x=True):
+        super(SampleRingBuffer, self).__init__(capacity, (x_dtype, y_dtype), allocate=allocate)
+        self._sorted_x = sorted_x
+
+    def append(self, x, y):
+        if self._sorted_x:
+            last = self.last
+            if last is not None and x < last[0]:
+                x = last[0]
+        super(SampleRingBuffer, self).append(x, y)
+
+    @property
+    def x(self):
+        return self.column(0)
+
+    @property
+    def y(self):
+        return self.column(1)
+
+    def get_range(self, x_min, x_max, max_points=None, keep_bounds=False):
+        """
+        Returns (x, y) of the samples within [x_min, x_max], extended by one sample on either side so that lines
+        reach the edges of the range. If max_points is specified, the output is decimated with decimate_min_max().
+        If keep_bounds is set, the samples outside of the range are reduced to their extremes instead of being
+        dropped, so that the bounds of the output are the same as of the whole series, e.g. for auto ranging.
+        """
+        if not self._sorted_x:
+            raise ValueError('Range lookups require sorted x')
+        x_all, y_all = self.x, self.y
+        first = max(0, int(numpy.searchsorted(x_all, x_min, side='left')) - 1)
+        last = min(len(x_all), int(numpy.searchsorted(x_all, x_max, side='right')) + 1)
+        x, y = x_all[first:last], y_all[first:last]
+        if max_points is not None:
+            x, y = decimate_min_max(x, y, max_points)
+        if keep_bounds and (first > 0 or last < len(x_all)):
+            before = get_extreme_indexes(y_all[:first])
+            after = get_extreme_indexes(y_all[last:]) + last
+            x = numpy.concatenate((x_all[before], x, x_all[after]))
+            y = numpy.concatenate((y_all[before], y, y_all[after]))
+        return x, y
+
+
+def get_extreme_indexes(y):
+    """Indexes of the first, the minimum, the maximum and the last sample, in this order, without duplicates"""
+    if not len(y):
+        return numpy.zeros(0, dtype=numpy.int64)
+    return numpy.unique([0, int(y.argmin()), int(y.argmax()), len(y) - 1])
+
+
+def decimate_min_max(x, y, max_points):
+    """
+    Reduces the series to at most max_points (but no less than 4) points, keeping the minimum and the maximum of
+    every bin of consecutive samples in their original order, so that peaks are never lost.
+    The bins are formed by the sample index, so the points keep their spacing in x only if x is sorted.
+    """
+    n = len(y)
+    max_points = max(4, int(max_points))
+    if n <= max_points:
+        return x, y
+
+    num_bins = max_points // 2
+    bin_size = -(-n // num_bins)
+    num_full = (n // bin_size) * bin_size
+
+    bins = y[:num_full].reshape(-1, bin_size)
+    offsets = numpy.arange(0, num_full, bin_size)
+    i_min = bins.argmin(axis=1) + offsets
+    i_max = bins.argmax(axis=1) + offsets
+    indexes = numpy.column_stack((numpy.minimum(i_min, i_max), numpy.maximum(i_min, i_max))).ravel()
+
+    if num_full < n:
+        tail = y[num_full:]
+        tail_indexes = sorted({num_full + int(tail.argmin()), num_full + int(tail.argmax())})
+        indexes = numpy.concatenate((indexes, tail_indexes))
+
+    return x[indexes], y[indexes]
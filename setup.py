@@ -58,6 +58,7 @@ args = dict(
         'pyqtgraph',
         'qtwidgets'
     ],
+    python_requires='>=3.8',
     # We can't use "scripts" here, because generated shims don't work with multiprocessing pickler.
     entry_points={
         'gui_scripts': [
@@ -0,0 +1,23 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+from dronecan.driver import CANFrame
+from dronecan.transport import Transfer
+
+
+def make_frame(can_id, data=b'', extended=True, ts=1.0, canfd=False, ts_real=None):
+    # CANFrame substitutes the current time for zero timestamps, so the default is non-zero
+    return CANFrame(can_id, bytes(data), extended, ts_monotonic=ts, ts_real=ts if ts_real is None else ts_real,
+                    canfd=canfd)
+
+
+def make_transfer_frames(payload, transfer_id, source_node_id=10, dest_node_id=None, request=False, canfd=False,
+                         ts=1.0, direction='rx'):
+    """Serializes a DroneCAN message or service into a list of (direction, CANFrame)"""
+    transfer = Transfer(transfer_id=transfer_id, source_node_id=source_node_id, dest_node_id=dest_node_id,
+                        payload=payload, canfd=canfd, service_not_message=dest_node_id is not None,
+                        request_not_response=request)
+    return [(direction, make_frame(f.message_id, f.bytes, ts=ts, canfd=canfd)) for f in transfer.to_frames()]
@@ -0,0 +1,125 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import random
+import numpy
+import pytest
+from dronecan_gui_tool.widgets.bus_monitor.bus_utilization import compute_frame_bits, BusUtilizationEstimator, \
+    FD_LENGTHS
+from .frames import make_frame
+
+
+def bits_of(value, width):
+    return [(value >> i) & 1 for i in range(width - 1, -1, -1)]
+
+
+def count_stuff_bits(bits):
+    count, run, last = 0, 0, None
+    for bit in bits:
+        run = run + 1 if bit == last else 1
+        last = bit
+        if run == 5:
+            count += 1
+            run, last = 1, 1 - bit
+    return count
+
+
+def crc15(bits):
+    crc = 0
+    for bit in bits:
+        feedback = bit ^ (crc >> 14)
+        crc = ((crc << 1) & 0x7FFF) ^ (0x4599 if feedback else 0)
+    return crc
+
+
+def reference_frame_bits(can_id, extended, canfd, data):
+    """Bit-by-bit computation from the frame layout; returns (nominal bits, data phase bits)"""
+    if canfd:
+        dlc = next(i for i, x in enumerate(FD_LENGTHS) if x >= len(data))
+        data = data + bytes(FD_LENGTHS[dlc] - len(data))
+    else:
+        data = data[:8]
+        dlc = len(data)
+    if extended:
+        arbitration = [0] + bits_of(can_id >> 18, 11) + [1, 1] + bits_of(can_id & 0x3FFFF, 18)
+    else:
+        arbitration = [0] + bits_of(can_id, 11)
+    if canfd:
+        # RRS, (IDE,) FDF, res, BRS; then ESI in the data phase
+        nominal = arbitration + ([0, 1, 0, 1] if extended else [0, 0, 1, 0, 1])
+        rest = [0] + bits_of(dlc, 4) + [b for byte in data for b in bits_of(byte, 8)]
+        stuff_total = count_stuff_bits(nominal + rest)
+        stuff_nominal = count_stuff_bits(nominal)
+        crc_length = 21 if len(data) > 16 else 17
+        fixed_stuff_bits = 1 + (4 + crc_length) // 4
+        return (len(nominal) + stuff_nominal + 12,
+                len(rest) + stuff_total - stuff_nominal + 4 + crc_length + fixed_stuff_bits + 1)
+    bits = arbitration + [0, 0, 0] + bits_of(dlc, 4) + [b for byte in data for b in bits_of(byte, 8)]
+    bits += bits_of(crc15(bits), 15)
+    return len(bits) + count_stuff_bits(bits) + 13, 0
+
+
+def compute(frames):
+    """Accepts a list of (CAN ID, extended, CAN FD, payload)"""
+    payload = numpy.zeros((len(frames), 64), dtype=numpy.uint8)
+    for i, (_, _, _, data) in enumerate(frames):
+        payload[i, :len(data)] = list(data)
+    return compute_frame_bits([f[0] for f in frames], [f[1] for f in frames], [f[2] for f in frames],
+                              [len(f[3]) for f in frames], payload)
+
+
+def test_known_frames():
+    # 47 bits without stuffing, the 34 zero bits from SOF to the end of the CRC get 6 stuff bits
+    nominal, data = compute([(0, False, False, b'')])
+    assert (nominal[0], data[0]) == (53, 0)
+
+    # The worst case for a classic standard frame with 8 bytes of payload is 135 bits including the interframe space
+    payloads = b'\x00' * 8, b'\x0F' * 8
+    nominal, _ = compute([(can_id, False, False, data) for can_id in range(0x800) for data in payloads])
+    assert nominal.max() <= 135 and nominal.min() >= 111
+
+
+def test_agrees_with_reference():
+    rng = random.Random(0)
+    frames = []
+    for _ in range(500):
+        extended = rng.random() < 0.7
+        canfd = rng.random() < 0.5
+        can_id = rng.getrandbits(29 if extended else 11)
+        length = rng.randint(0, 64 if canfd else 8)
+        # Runs of equal bits are what the stuffing is about
+        data = bytes(rng.choice([0x00, 0xFF, 0xF0, rng.getrandbits(8)]) for _ in range(length))
+        frames.append((can_id, extended, canfd, data))
+
+    nominal, data_phase = compute(frames)
+    for i, frame in enumerate(frames):
+        assert (nominal[i], data_phase[i]) == reference_frame_bits(*frame), frame
+
+
+def test_empty_input():
+    nominal, data = compute_frame_bits([], [], [], [], numpy.zeros((0, 64), dtype=numpy.uint8))
+    assert len(nominal) == len(data) == 0
+
+
+def test_utilization():
+    frames = [make_frame(i, b'\x55' * 8, ts=100 + i * 0.001) for i in range(1000)]
+    expected_bits = compute([(f.id, True, False, f.data) for f in frames[-900:]])[0].sum()
+
+    # Queried right away, because the time is extrapolated with the local clock since the last frame
+    estimator = BusUtilizationEstimator(nominal_bitrate=1000000, data_bitrate=4000000)
+    assert estimator.now is None and estimator.get_utilization() == 0
+    estimator.add_frames(frames)
+    assert estimator.now >= frames[-1].ts_monotonic
+    assert estimator.get_utilization(0.9) == pytest.approx(100 * expected_bits / 1e6 / 0.9, rel=0.02)
+
+    fd = BusUtilizationEstimator(nominal_bitrate=1000000, data_bitrate=4000000)
+    fd.add_frames([make_frame(1, b'\x55' * 64, canfd=True, ts=100)])
+    with_brs = fd.get_utilization()
+    fd.bit_rate_switching = False
+    assert fd.get_utilization() > with_brs * 2
+
+    fd.clear()
+    assert fd.get_utilization() == 0
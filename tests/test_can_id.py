@@ -0,0 +1,44 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import random
+import numpy
+from dronecan_gui_tool.widgets.bus_monitor.can_id import SERVICE_TYPE_KEY_FLAG, NO_DATA_TYPE_KEY, get_priority, \
+    get_source_node_id, get_destination_node_id, is_service, get_data_type_key, compute_data_type_keys, \
+    get_data_type_name
+from dronecan_gui_tool.widgets.bus_monitor.frame_buffer import FLAG_EXTENDED
+from .test_can_id_decode import message_id, service_id
+
+
+def test_fields():
+    can_id = message_id(341, 42, priority=3)
+    assert (get_priority(can_id), get_source_node_id(can_id), is_service(can_id)) == (3, 42, False)
+    assert get_destination_node_id(can_id) is None
+    assert get_data_type_key(can_id) == 341
+
+    can_id = service_id(1, 10, 20, request=False, priority=31)
+    assert (get_priority(can_id), get_source_node_id(can_id), is_service(can_id)) == (31, 10, True)
+    assert get_destination_node_id(can_id) == 20
+    assert get_data_type_key(can_id) == 1 | SERVICE_TYPE_KEY_FLAG
+
+    # Anonymous messages carry only the two lowest bits of the type ID
+    assert get_data_type_key(message_id(0x4D01, 0)) == 1
+
+
+def test_vectorized_keys_agree():
+    rng = random.Random(0)
+    can_ids = [rng.getrandbits(29) & ~(0x7F if rng.random() < 0.3 else 0) for _ in range(5000)]
+    flags = numpy.array([FLAG_EXTENDED if rng.random() < 0.9 else 0 for _ in can_ids], dtype=numpy.uint8)
+    keys = compute_data_type_keys(numpy.array(can_ids, dtype=numpy.uint32), flags)
+    assert keys.tolist() == [get_data_type_key(c) if f else NO_DATA_TYPE_KEY for c, f in zip(can_ids, flags)]
+
+
+def test_data_type_names():
+    assert get_data_type_name(341) == 'uavcan.protocol.NodeStatus'
+    assert get_data_type_name(1 | SERVICE_TYPE_KEY_FLAG) == 'uavcan.protocol.GetNodeInfo'
+    assert get_data_type_name(1) == 'uavcan.protocol.dynamic_node_id.Allocation'
+    assert get_data_type_name(250 | SERVICE_TYPE_KEY_FLAG) == '<unknown service 250>'
+    assert get_data_type_name(NO_DATA_TYPE_KEY) == 'N/A'
@@ -0,0 +1,67 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+from dronecan_gui_tool.widgets.bus_monitor.window import parse_can_frame, CANIDDecodeCache
+from .frames import make_frame
+
+
+def message_id(type_id, src, priority=16):
+    return (priority << 24) | (type_id << 8) | src
+
+
+def service_id(type_id, src, dst, request, priority=16):
+    return (priority << 24) | (type_id << 16) | (int(request) << 15) | (dst << 8) | (1 << 7) | src
+
+
+def test_parse_message():
+    parsed = parse_can_frame(make_frame(message_id(341, 42)))
+    assert parsed == {'data_type': 'uavcan.protocol.NodeStatus', 'src': 42, 'dst': ''}
+
+
+def test_parse_anonymous_message():
+    # Only the two lowest bits of the type ID are transferred by anonymous frames
+    parsed = parse_can_frame(make_frame(message_id((0xABCD << 2) | 1, 0)))
+    assert parsed['src'] == 'Anon'
+    assert parsed['data_type'] == 'uavcan.protocol.dynamic_node_id.Allocation'
+
+
+def test_parse_service():
+    parsed = parse_can_frame(make_frame(service_id(1, 10, 20, request=True)))
+    assert parsed == {'data_type': 'uavcan.protocol.GetNodeInfo', 'src': 10, 'dst': 20}
+
+
+def test_parse_unknown_and_standard_frames():
+    assert parse_can_frame(make_frame(message_id(12345, 1)))['data_type'] == '<unknown message 12345>'
+    assert parse_can_frame(make_frame(service_id(250, 1, 2, False)))['data_type'] == '<unknown service 250>'
+    assert parse_can_frame(make_frame(0x123, extended=False)) == {'data_type': 'N/A', 'src': 'N/A', 'dst': 'N/A'}
+
+
+def test_cache_ignores_priority(qapp):
+    cache = CANIDDecodeCache()
+    first = cache.get(make_frame(message_id(341, 42, priority=0)))
+    second = cache.get(make_frame(message_id(341, 42, priority=31)))
+    assert first is second
+    assert (cache.hits, cache.misses, len(cache)) == (1, 1, 1)
+    assert first.parsed['src'] == 42
+    assert first.src_color is not None and first.dst_color is None
+
+    other = cache.get(make_frame(message_id(341, 43)))
+    assert other is not first and other.src_color != first.src_color
+    assert cache.get(make_frame(0x123, extended=False)).parsed['src'] == 'N/A'
+
+
+def test_cache_is_bounded_and_can_be_invalidated(qapp):
+    cache = CANIDDecodeCache()
+    cache.MAX_ENTRIES = 10
+    for src in range(1, 26):
+        cache.get(make_frame(message_id(341, src)))
+    assert len(cache) <= 10
+    assert cache.misses == 25
+
+    cache.invalidate()
+    assert len(cache) == 0
+    cache.get(make_frame(message_id(341, 25)))
+    assert cache.misses == 26
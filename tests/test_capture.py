@@ -0,0 +1,89 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import pytest
+from dronecan_gui_tool.widgets.bus_monitor.capture import CaptureWriter, CaptureFormatError, iter_capture, \
+    FILE_EXTENSION, COMPRESSED_FILE_EXTENSION
+from .frames import make_frame
+
+
+def make_entries(count):
+    return [('tx' if i % 4 == 0 else 'rx',
+             make_frame(i * 7, bytes(range(i % 65)), extended=i % 2 == 0, canfd=i % 65 > 8, ts=1 + i * 0.001,
+                        ts_real=1e9 + i)) for i in range(count)]
+
+
+def write(path, entries, batch=100, **kwargs):
+    writer = CaptureWriter(str(path), **kwargs)
+    for i, entry in enumerate(entries):
+        writer.push(*entry)
+        if i % batch == batch - 1:
+            writer.flush()
+    writer.close()
+    assert writer.error is None
+    return writer
+
+
+def assert_same(a, b):
+    assert len(a) == len(b)
+    for (da, fa), (db, fb) in zip(a, b):
+        assert da == db
+        assert (fa.id, fa.data, fa.extended, fa.canfd, fa.ts_monotonic, fa.ts_real) == \
+               (fb.id, fb.data, fb.extended, fb.canfd, fb.ts_monotonic, fb.ts_real)
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_round_trip(tmp_path, compress):
+    entries = make_entries(1000)
+    writer = write(tmp_path / 'capture', entries, compress=compress)
+    [path] = writer.files
+    assert path.endswith(COMPRESSED_FILE_EXTENSION if compress else FILE_EXTENSION)
+    assert writer.frames_written == 1000
+    assert_same(list(iter_capture(path, chunk_size=4096)), entries)
+
+
+def test_rotation_by_size(tmp_path):
+    entries = make_entries(1000)
+    writer = write(tmp_path / ('capture' + FILE_EXTENSION), entries, batch=50, max_file_size=10000)
+    assert len(writer.files) > 1
+    assert writer.files[0].endswith('capture_0001' + FILE_EXTENSION)
+    assert_same([e for p in writer.files for e in iter_capture(p)], entries)
+
+
+def test_truncated_capture(tmp_path):
+    writer = write(tmp_path / 'capture', make_entries(10))
+    with open(writer.files[0], 'rb+') as f:
+        f.seek(-3, 2)
+        f.truncate()
+    assert_same(list(iter_capture(writer.files[0])), make_entries(9))
+
+
+def test_invalid_files(tmp_path):
+    not_capture = tmp_path / 'a.dcap'
+    not_capture.write_bytes(b'definitely not a capture file')
+    with pytest.raises(CaptureFormatError):
+        list(iter_capture(str(not_capture)))
+
+    short = tmp_path / 'b.dcap'
+    short.write_bytes(b'DCAN')
+    with pytest.raises(CaptureFormatError):
+        list(iter_capture(str(short)))
+
+
+def test_full_queue_drops_frames(tmp_path):
+    class Writer(CaptureWriter):
+        QUEUE_SIZE = 2
+
+    # The writer thread fails to open the file, so nothing is taken off the queue
+    writer = Writer(str(tmp_path / 'missing' / 'capture'))
+    for i, entry in enumerate(make_entries(50)):
+        writer.push(*entry)
+        if i % 10 == 9:
+            writer.flush()
+    assert writer.frames_dropped == 30
+    writer.close()
+    assert writer.error is not None
+    assert writer.frames_written == 0
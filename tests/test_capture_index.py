@@ -0,0 +1,128 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import os
+import dronecan
+import numpy
+import pytest
+from dronecan_gui_tool.widgets.bus_monitor.capture import CaptureWriter, CaptureFormatError
+from dronecan_gui_tool.widgets.bus_monitor.capture_index import CaptureIndex, MappedCapture, SIDECAR_EXTENSION
+from dronecan_gui_tool.widgets.bus_monitor.can_id import SERVICE_TYPE_KEY_FLAG, NO_DATA_TYPE_KEY
+from .frames import make_frame, make_transfer_frames
+
+
+def make_entries():
+    """Interleaved node status messages, multi-frame GetNodeInfo responses and some classic CAN frames"""
+    entries = []
+    for i in range(300):
+        entries += make_transfer_frames(dronecan.uavcan.protocol.NodeStatus(uptime_sec=i), i % 32, ts=1 + i)
+        if i % 10 == 0:
+            msg = dronecan.uavcan.protocol.GetNodeInfo.Response()
+            msg.name = 'org.dronecan.test.%d' % i
+            entries += make_transfer_frames(msg, i % 32, source_node_id=11, dest_node_id=12, ts=1 + i)
+        if i % 7 == 0:
+            entries.append(('tx', make_frame(0x123, bytes(i % 9), extended=False, ts=1 + i)))
+    for i, (_, frame) in enumerate(entries):
+        frame.ts_real = 1000 + i
+    return entries
+
+
+def write_capture(path, entries):
+    writer = CaptureWriter(str(path))
+    for entry in entries:
+        writer.push(*entry)
+    writer.close()
+    assert writer.error is None
+    return writer.files[0]
+
+
+@pytest.fixture
+def capture(tmp_path):
+    entries = make_entries()
+    return write_capture(tmp_path / 'capture', entries), entries
+
+
+@pytest.mark.parametrize('chunk_size', [50, 1000, CaptureIndex.BUILD_CHUNK_SIZE])
+def test_build(capture, chunk_size, monkeypatch):
+    path, entries = capture
+    monkeypatch.setattr(CaptureIndex, 'BUILD_CHUNK_SIZE', chunk_size)
+    progress = []
+    index = CaptureIndex.build(path, progress.append)
+    assert len(index.offsets) == len(entries)
+    assert progress[-1] == 1
+
+    ids = numpy.array([f.id for _, f in entries], dtype=numpy.uint32)
+    for can_id in set(ids):
+        assert list(index.lookup(can_ids=[can_id])) == list(numpy.flatnonzero(ids == can_id))
+
+    counts = index.get_data_type_counts()
+    assert counts[dronecan.uavcan.protocol.NodeStatus.default_dtid] == 300
+    assert counts[dronecan.uavcan.protocol.GetNodeInfo.default_dtid | SERVICE_TYPE_KEY_FLAG] > 30
+    assert counts[NO_DATA_TYPE_KEY] == len([1 for _, f in entries if not f.extended])
+
+
+def test_invalid_tail(capture):
+    path, entries = capture
+    with open(path, 'ab') as f:
+        f.write(b'\xff' * 100)
+    assert len(CaptureIndex.build(path).offsets) == len(entries)
+
+    with open(path, 'rb+') as f:
+        f.truncate(os.path.getsize(path) - 103)
+    assert len(CaptureIndex.build(path).offsets) == len(entries) - 1
+
+
+def test_compressed_capture_is_rejected(tmp_path):
+    writer = CaptureWriter(str(tmp_path / 'capture'), compress=True)
+    writer.close()
+    with pytest.raises(CaptureFormatError):
+        CaptureIndex.build(writer.files[0])
+
+
+def test_mapped_capture(capture):
+    path, entries = capture
+    mapped = MappedCapture(path)
+    assert os.path.exists(path + SIDECAR_EXTENSION)
+    assert len(mapped) == len(entries)
+
+    for seq in (0, 1, len(entries) // 2, len(entries) - 1):
+        direction, frame = mapped.get(seq)
+        assert direction == entries[seq][0]
+        assert (frame.id, frame.data, frame.extended, frame.ts_monotonic, frame.ts_real) == \
+               (entries[seq][1].id, entries[seq][1].data, entries[seq][1].extended,
+                entries[seq][1].ts_monotonic, entries[seq][1].ts_real)
+    assert mapped.get_entry(5)[2] == entries[4][1].ts_real
+
+    ts_mono, ts_real, can_ids, flags, lengths = mapped.get_headers([3, 1, 2])
+    assert list(can_ids) == [entries[i][1].id for i in (3, 1, 2)]
+    assert list(lengths) == [len(entries[i][1].data) for i in (3, 1, 2)]
+
+    assert mapped.find_time(1000 + 123.5) == 124
+    assert mapped.find_time(0) == 0
+
+
+def test_sidecar_reuse(capture):
+    path, entries = capture
+    MappedCapture(path)
+    sidecar = path + SIDECAR_EXTENSION
+    assert CaptureIndex.load(sidecar, path) is not None
+
+    # Appending frames makes the sidecar stale
+    with open(path, 'ab') as f:
+        f.write(open(path, 'rb').read()[16:16 + 22 + len(entries[0][1].data)])
+    assert CaptureIndex.load(sidecar, path) is None
+    assert len(MappedCapture(path)) == len(entries) + 1
+
+
+def test_get_transfer_seqs(capture):
+    path, entries = capture
+    mapped = MappedCapture(path)
+    service_seqs = [i for i, (_, f) in enumerate(entries) if f.id & 0x80]
+    first, last = service_seqs[0], service_seqs[0]
+    while last + 1 < len(entries) and entries[last + 1][1].id == entries[first][1].id:
+        last += 1
+    assert last - first > 1
+    assert mapped.get_transfer_seqs(first + 1) == list(range(first, last + 1))
@@ -0,0 +1,57 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+from types import SimpleNamespace
+from dronecan_gui_tool.widgets.plotter.value_extractor import Expression, Extractor, ExtractorIndex
+
+NODE_STATUS = 'uavcan.protocol.NodeStatus'
+ESC_STATUS = 'uavcan.equipment.esc.Status'
+
+
+def make_extractor(data_type_name, source_node_id=None, expression='msg.value'):
+    return Extractor(data_type_name, Expression(expression), [], None, source_node_id=source_node_id)
+
+
+def handler(extractor, timestamp, transfer):
+    pass
+
+
+def test_matching():
+    index = ExtractorIndex()
+    any_node = make_extractor(NODE_STATUS)
+    node_5 = make_extractor(NODE_STATUS, 5)
+    esc = make_extractor(ESC_STATUS, 5)
+    for e in (any_node, node_5, esc):
+        index.add(e, handler)
+
+    assert [e for e, _ in index.get_matching(NODE_STATUS, 5)] == [any_node, node_5]
+    assert [e for e, _ in index.get_matching(NODE_STATUS, 6)] == [any_node]
+    assert [e for e, _ in index.get_matching(ESC_STATUS, 6)] == []
+    assert index.get_matching('uavcan.protocol.GetNodeInfo', 5) == []
+    assert index.get_matching(ESC_STATUS, 5) == [(esc, handler)]
+    assert index.data_type_names == {NODE_STATUS, ESC_STATUS}
+
+    # The index agrees with the checks of the extractors themselves
+    for name in (NODE_STATUS, ESC_STATUS):
+        for node_id in (5, 6):
+            transfer = SimpleNamespace(data_type_name=name, source_node_id=node_id, message=SimpleNamespace(value=1))
+            accepting = [e for e in (any_node, node_5, esc) if e.try_extract(transfer) is not None]
+            assert [e for e, _ in index.get_matching(name, node_id)] == accepting
+
+
+def test_removal():
+    index = ExtractorIndex()
+    a, b = make_extractor(NODE_STATUS), make_extractor(NODE_STATUS)
+    index.add(a, handler)
+    index.add(b, handler)
+
+    index.remove(a)
+    assert [e for e, _ in index.get_matching(NODE_STATUS, 1)] == [b]
+    index.remove(a)                 # Not registered anymore, nothing happens
+    index.remove(make_extractor(ESC_STATUS))
+    index.remove(b)
+    assert index.get_matching(NODE_STATUS, 1) == []
+    assert index.data_type_names == set()
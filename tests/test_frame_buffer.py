@@ -0,0 +1,88 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import numpy
+import pytest
+from dronecan_gui_tool.widgets.bus_monitor.frame_buffer import FrameBuffer, FLAG_EXTENDED, FLAG_CANFD, FLAG_TX
+from .frames import make_frame
+
+
+def fill(buf, count, start=0):
+    for i in range(start, start + count):
+        buf.append('tx' if i % 3 == 0 else 'rx', make_frame(i, bytes([i & 0xFF] * (i % 9)), ts=i * 0.5,
+                                                            ts_real=1000 + i))
+
+
+def test_append_and_get():
+    buf = FrameBuffer(10)
+    assert buf.append('rx', make_frame(0x123, b'\x01\x02', extended=False, ts=1.5, ts_real=2.5)) == 0
+    assert buf.append('tx', make_frame(0x1234567, bytes(range(64)), canfd=True, ts=2.0)) == 1
+    assert len(buf) == 2 and buf.first_seq == 0 and buf.next_seq == 2
+
+    direction, frame = buf.get(0)
+    assert direction == 'rx'
+    assert (frame.id, frame.data, frame.extended, frame.canfd) == (0x123, b'\x01\x02', False, False)
+    assert (frame.ts_monotonic, frame.ts_real) == (1.5, 2.5)
+
+    direction, frame = buf.get(1)
+    assert direction == 'tx'
+    assert (frame.id, frame.data, frame.extended, frame.canfd) == (0x1234567, bytes(range(64)), True, True)
+    assert buf.get_raw(1) == (0x1234567, FLAG_EXTENDED | FLAG_CANFD | FLAG_TX, bytes(range(64)))
+    assert buf.line_count(0) == 1 and buf.line_count(1) == 8
+
+
+def test_eviction_keeps_sequence_numbers():
+    buf = FrameBuffer(5)
+    fill(buf, 12)
+    assert len(buf) == 5
+    assert (buf.first_seq, buf.next_seq) == (7, 12)
+    assert 6 not in buf and 7 in buf and 12 not in buf
+    assert [buf.get_frame(s).id for s in range(7, 12)] == list(range(7, 12))
+    with pytest.raises(IndexError):
+        buf.get(6)
+    # The timestamp of the preceding frame is available for all but the oldest frame
+    assert buf.get_entry(7)[2] is None
+    assert buf.get_entry(8)[2] == 1007
+
+
+def test_set_capacity():
+    buf = FrameBuffer(8)
+    fill(buf, 20)
+    buf.set_capacity(3)
+    assert (buf.first_seq, buf.next_seq, buf.capacity) == (17, 20, 3)
+    assert [buf.get_frame(s).id for s in range(17, 20)] == [17, 18, 19]
+    buf.set_capacity(10)
+    fill(buf, 4, start=20)
+    assert [buf.get_frame(s).id for s in range(17, 24)] == list(range(17, 24))
+    with pytest.raises(ValueError):
+        buf.set_capacity(0)
+
+
+def test_clear():
+    buf = FrameBuffer(4)
+    fill(buf, 6)
+    buf.clear()
+    assert len(buf) == 0 and buf.first_seq == buf.next_seq == 6
+    fill(buf, 1)
+    assert buf.get_frame(6).id == 0
+
+
+def test_headers_and_select():
+    buf = FrameBuffer(7)
+    fill(buf, 10)
+    seqs = numpy.arange(buf.first_seq, buf.next_seq)
+    ts_mono, ts_real, can_id, flags, length = buf.get_headers(seqs)
+    assert can_id.tolist() == list(range(3, 10))
+    assert ts_mono.tolist() == [i * 0.5 for i in range(3, 10)]
+    assert ts_real.tolist() == [1000 + i for i in range(3, 10)]
+    assert length.tolist() == [i % 9 for i in range(3, 10)]
+    assert ((flags & FLAG_TX) != 0).tolist() == [i % 3 == 0 for i in range(3, 10)]
+    with pytest.raises(IndexError):
+        buf.get_headers([2])
+
+    assert buf.select(lambda can_id, flags, dlc, payload: can_id % 2 == 0) == [4, 6, 8]
+    assert buf.select(lambda can_id, flags, dlc, payload: (dlc > 0) & (payload[:, 0] == 5)) == [5]
+    assert FrameBuffer(3).select(lambda can_id, flags, dlc, payload: can_id >= 0) == []
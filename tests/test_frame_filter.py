@@ -0,0 +1,121 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import random
+import dronecan
+import pytest
+from dronecan_gui_tool.widgets.bus_monitor.frame_buffer import FrameBuffer, get_frame_flags
+from dronecan_gui_tool.widgets.bus_monitor.frame_filter import FrameFilter, KIND_MESSAGE, KIND_SERVICE, \
+    parse_int_set, parse_payload_masks
+from dronecan_gui_tool.widgets.bus_monitor.can_id import SERVICE_TYPE_KEY_FLAG
+from .frames import make_frame, make_transfer_frames
+
+GET_NODE_INFO_ID = dronecan.uavcan.protocol.GetNodeInfo.default_dtid
+
+
+def random_entries(count, seed=0):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(count):
+        extended = rng.random() < 0.9
+        can_id = rng.getrandbits(29) if extended else rng.getrandbits(11)
+        if extended and rng.random() < 0.3:
+            can_id &= ~0x7F         # Anonymous message or a service from node 0
+        if extended and rng.random() < 0.3:
+            can_id = (can_id & ~0xFF0000) | (GET_NODE_INFO_ID << 16) | 0x80
+        canfd = rng.random() < 0.2
+        data = bytes(rng.getrandbits(8) for _ in range(rng.randint(0, 64 if canfd else 8)))
+        out.append((rng.choice(['rx', 'tx']), make_frame(can_id, data, extended=extended, canfd=canfd)))
+    return out
+
+
+FILTERS = [
+    {},
+    {'can_id_mask': 0xFF, 'can_id_value': 0x0A},
+    {'can_id_min': 0x100, 'can_id_max': 0x1000000},
+    {'src_nodes': {0, 1, 2, 3, 10}},
+    {'dst_nodes': set(range(0, 128, 3))},
+    {'data_type_keys': {1}},
+    {'data_type_keys': {1 | SERVICE_TYPE_KEY_FLAG}},
+    {'data_type_keys': {0, 2, GET_NODE_INFO_ID | SERVICE_TYPE_KEY_FLAG}},
+    {'kind': KIND_MESSAGE},
+    {'kind': KIND_SERVICE, 'direction': 'tx'},
+    {'direction': 'rx', 'canfd': True},
+    {'canfd': False},
+    {'payload_masks': [(0, 0x80, 0x80)]},
+    {'payload_masks': [(-1, 0x1F, 0x05)]},
+    {'payload_masks': [(7, 0x01, 0x01), (-9, 0x01, 0x00)], 'kind': KIND_MESSAGE},
+]
+
+
+@pytest.mark.parametrize('kwargs', FILTERS)
+def test_scalar_and_vectorized_agree(kwargs):
+    entries = random_entries(3000)
+    buf = FrameBuffer(2000)         # The ring wraps around
+    for entry in entries:
+        buf.append(*entry)
+
+    compiled = FrameFilter(**kwargs).compile()
+    expected = [seq for seq in range(buf.first_seq, buf.next_seq) if compiled.match(*buf.get_raw(seq))]
+    assert buf.select(compiled.evaluate) == expected
+    if kwargs:
+        assert 0 < len(expected) < len(buf)
+    else:
+        assert len(expected) == len(buf)
+
+
+def test_data_type_kind():
+    status = make_transfer_frames(dronecan.uavcan.protocol.NodeStatus(), 0)[0]
+    request = make_transfer_frames(dronecan.uavcan.protocol.GetNodeInfo.Request(), 0, dest_node_id=5,
+                                   request=True)[0]
+    anonymous = ('rx', make_frame((1 << 8) | 0, b'\xC0'))
+
+    def matches(keys, entry):
+        direction, frame = entry
+        match = FrameFilter(data_type_keys=keys).compile().match
+        return match(frame.id, get_frame_flags(direction, frame), frame.data)
+
+    node_status_id = dronecan.uavcan.protocol.NodeStatus.default_dtid
+    assert matches({node_status_id}, status)
+    assert not matches({node_status_id | SERVICE_TYPE_KEY_FLAG}, status)
+    assert matches({GET_NODE_INFO_ID | SERVICE_TYPE_KEY_FLAG}, request)
+    assert not matches({GET_NODE_INFO_ID}, request)
+    assert matches({1}, anonymous)
+    assert not matches({1 | SERVICE_TYPE_KEY_FLAG}, anonymous)
+
+
+def test_validation():
+    assert FrameFilter().empty
+    assert not FrameFilter(kind=KIND_SERVICE).empty
+    with pytest.raises(TypeError):
+        FrameFilter(data_type_ids={1})
+    with pytest.raises(ValueError):
+        FrameFilter(can_id_mask=0xFF)
+    with pytest.raises(ValueError):
+        FrameFilter(kind='broadcast')
+    with pytest.raises(ValueError):
+        FrameFilter(direction='both')
+
+
+def test_parsing():
+    assert parse_int_set('1, 3-5 0x10') == {1, 3, 4, 5, 16}
+    assert parse_int_set('  ') is None
+    assert parse_payload_masks('0:F0=1F -1=05') == [(0, 0xF0, 0x10), (-1, 0xFF, 0x05)]
+    assert parse_payload_masks('') is None
+    for text in ('0:FFF=1', '64=00', 'x=1', '0:FF'):
+        with pytest.raises(ValueError):
+            parse_payload_masks(text)
+
+
+def test_parse_data_type_keys():
+    from dronecan_gui_tool.widgets.bus_monitor.window import parse_data_type_keys
+    node_status_id = dronecan.uavcan.protocol.NodeStatus.default_dtid
+    assert parse_data_type_keys('uavcan.protocol.GetNodeInfo') == {GET_NODE_INFO_ID | SERVICE_TYPE_KEY_FLAG}
+    assert parse_data_type_keys('uavcan.protocol.NodeStatus') == {node_status_id}
+    assert parse_data_type_keys('1-2') == {1, 2, 1 | SERVICE_TYPE_KEY_FLAG, 2 | SERVICE_TYPE_KEY_FLAG}
+    assert parse_data_type_keys('') is None
+    with pytest.raises(ValueError):
+        parse_data_type_keys('uavcan.NoSuchType')
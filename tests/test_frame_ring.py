@@ -0,0 +1,82 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import pytest
+from dronecan_gui_tool.widgets.bus_monitor.frame_ring import FrameRingWriter, FrameRingReader
+from .frames import make_frame
+
+
+@pytest.fixture
+def writer():
+    w = FrameRingWriter(capacity=16)
+    yield w
+    w.close()
+
+
+def frame(i):
+    return make_frame(i, bytes([i & 0xFF]) * (i % 65), extended=bool(i % 2), canfd=i % 65 > 8,
+                      ts=i * 0.25, ts_real=1000.0 + i)
+
+
+def attach(writer):
+    reader = FrameRingReader(writer.name)
+    return reader
+
+
+def test_round_trip(writer):
+    reader = attach(writer)
+    sent = [('tx' if i % 3 else 'rx', frame(i)) for i in range(10)]
+    for entry in sent:
+        writer.push(*entry)
+    assert reader.read() == []          # Not published until flushed
+    writer.flush()
+
+    received = reader.read()
+    assert [d for d, _ in received] == [d for d, _ in sent]
+    for (_, a), (_, b) in zip(received, sent):
+        assert (a.id, a.data, a.extended, a.canfd, a.ts_monotonic, a.ts_real) == \
+               (b.id, b.data, b.extended, b.canfd, b.ts_monotonic, b.ts_real)
+    assert reader.read() == []
+    assert reader.overrun_count == 0
+    reader.close()
+
+
+def test_batches_are_published_when_full(writer):
+    reader = attach(writer)
+    for i in range(writer.MAX_BATCH_SIZE):
+        writer.push('rx', frame(i))
+    # The batch is larger than the ring, so only its tail survives
+    received = reader.read()
+    assert [f.id for _, f in received] == list(range(writer.MAX_BATCH_SIZE - 16, writer.MAX_BATCH_SIZE))
+    assert reader.overrun_count == writer.MAX_BATCH_SIZE - 16
+    reader.close()
+
+
+def test_slow_reader_loses_oldest_frames(writer):
+    fast, slow = attach(writer), attach(writer)
+    for i in range(40):
+        writer.push('rx', frame(i))
+        writer.flush()
+        assert [f.id for _, f in fast.read()] == [i]
+    received = slow.read(max_count=5)
+    assert [f.id for _, f in received] == list(range(24, 29))
+    assert slow.overrun_count == 24 and slow.lag == 40
+    assert [f.id for _, f in slow.read()] == list(range(29, 40))
+    assert fast.overrun_count == 0
+    fast.close()
+    slow.close()
+
+
+def test_late_reader_starts_from_now(writer):
+    for i in range(5):
+        writer.push('rx', frame(i))
+    writer.flush()
+    reader = attach(writer)
+    assert reader.read() == []
+    writer.push('rx', frame(5))
+    writer.flush()
+    assert [f.id for _, f in reader.read()] == [5]
+    reader.close()
@@ -0,0 +1,77 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import time
+import pytest
+from dronecan_gui_tool.widgets.ipc_channel import IPCChannel
+
+
+def receive_all(channel, expected_count, timeout=5):
+    """The objects reach the receiving end asynchronously, so the receiver polls for a while"""
+    out = []
+    deadline = time.monotonic() + timeout
+    while len(out) < expected_count and time.monotonic() < deadline:
+        received, obj = channel.receive_nonblocking()
+        if received:
+            out.append(obj)
+        else:
+            time.sleep(0.001)
+    assert channel.receive_nonblocking() == (False, None)
+    return out
+
+
+def test_delivery_and_telemetry():
+    channel = IPCChannel(max_size=10)
+    for i in range(4):
+        channel.send_nonblocking(i)
+    assert channel.depth == 4 and channel.high_water_mark == 4
+    assert receive_all(channel, 4) == [0, 1, 2, 3]
+    assert channel.depth == 0 and channel.dropped == 0 and channel.enqueued == 4
+    assert channel.get_status_string() == 'IPC lag 0, dropped 0, peak 4'
+
+
+def test_drop_oldest_skips_stale_backlog():
+    channel = IPCChannel(max_size=10, policy=IPCChannel.POLICY_DROP_OLDEST)
+    started_at = time.monotonic()
+    for i in range(20):
+        channel.send_nonblocking(i)
+    assert time.monotonic() - started_at < 0.05        # The sender never waits
+    assert channel.high_water_mark == 10
+    time.sleep(0.1)                                     # Letting the feeder thread deliver the objects
+
+    # The receiver finds the channel full and skips the oldest half of the backlog
+    assert receive_all(channel, 5) == [5, 6, 7, 8, 9]
+    assert channel.dropped == 15 and channel.depth == 0
+
+    # Once the receiver has caught up, nothing is lost
+    for i in range(20, 25):
+        channel.send_nonblocking(i)
+    assert receive_all(channel, 5) == [20, 21, 22, 23, 24]
+    assert channel.dropped == 15
+
+
+def test_drop_newest_keeps_oldest():
+    channel = IPCChannel(max_size=5, policy=IPCChannel.POLICY_DROP_NEWEST)
+    for i in range(20):
+        channel.send_nonblocking(i)
+    assert receive_all(channel, 5) == [0, 1, 2, 3, 4]
+    assert channel.dropped == 15
+
+
+def test_block_waits_then_drops():
+    channel = IPCChannel(max_size=2, policy=IPCChannel.POLICY_BLOCK, block_timeout=0.05)
+    channel.send_nonblocking('a')
+    channel.send_nonblocking('b')
+    started_at = time.monotonic()
+    channel.send_nonblocking('c')
+    assert time.monotonic() - started_at >= 0.04
+    assert receive_all(channel, 2) == ['a', 'b']
+    assert channel.dropped == 1
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        IPCChannel(policy='whatever')
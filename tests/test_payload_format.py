@@ -0,0 +1,67 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+from PyQt5.QtGui import QColor
+from dronecan_gui_tool.widgets.bus_monitor.payload_format import format_hex, format_ascii, format_hex_batch, \
+    format_ascii_batch, format_hex_line, format_ascii_line, get_transfer_id_color
+from .frames import make_frame
+
+
+# The per-frame renderers the batched ones have replaced; the output must stay the same
+def legacy_colorize_transfer_id(frame):
+    if len(frame.data) < 1:
+        return
+    x = (frame.data[-1] & 0b11111) | (((frame.id >> 16) & 0b1111) << 5)
+    col = QColor()
+    col.setRgb(0xFF - ((x >> 6) & 0b111) * 25, 0xFF - ((x >> 3) & 0b111) * 25, 0xFF - (x & 0b111) * 25)
+    return col
+
+
+def legacy_format(data, render_line):
+    fmt_data = ''
+    for i in range(len(data) // 8 + 1):
+        fmt_data = '\n'.join([fmt_data, render_line(data[i * 8:min((i + 1) * 8, len(data))])])
+    return fmt_data[1:]
+
+
+def legacy_format_hex(data):
+    return legacy_format(data, lambda line: ' '.join(['%02X' % x for x in line])).ljust(3 * 8)
+
+
+def legacy_format_ascii(data):
+    return legacy_format(data, lambda line: ''.join([(chr(x) if 32 <= x <= 126 else '.') for x in line]))
+
+
+def make_frames():
+    frames = [make_frame((i * 7919) & 0x1FFFFFFF, bytes((i * 31 + k) & 0xFF for k in range((i % 64) + 1)))
+              for i in range(200)]
+    return frames + [make_frame(0, b'')]
+
+
+def test_single():
+    for frame in make_frames():
+        assert format_hex(frame.data).ljust(3 * 8) == legacy_format_hex(frame.data), frame.data
+        assert format_ascii(frame.data) == legacy_format_ascii(frame.data), frame.data
+
+
+def test_batch():
+    payloads = [f.data for f in make_frames()]
+    assert format_hex_batch(payloads) == [format_hex(p) for p in payloads]
+    assert format_ascii_batch(payloads) == [format_ascii(p) for p in payloads]
+    assert format_hex_batch([]) == format_ascii_batch([]) == []
+
+
+def test_transfer_id_color():
+    for frame in make_frames():
+        color, legacy = get_transfer_id_color(frame), legacy_colorize_transfer_id(frame)
+        assert (color is None and legacy is None) or color.rgba() == legacy.rgba()
+
+
+def test_single_line():
+    data = bytes(range(28, 48))
+    assert format_hex_line(data) == ' '.join('%02X' % x for x in data)
+    assert format_ascii_line(data) == '....' + ''.join(chr(x) for x in range(32, 48))
+    assert format_hex_line(b'') == format_ascii_line(b'') == ''
@@ -0,0 +1,102 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import time
+from types import SimpleNamespace
+import dronecan
+from dronecan_gui_tool.widgets.ipc_channel import IPCChannel
+from dronecan_gui_tool.widgets.plotter.value_extractor import Expression, Extractor
+from dronecan_gui_tool.widgets.plotter import PlotterManager, MessageTransfer, IPC_ACTIVE_DATA_TYPES, \
+    IPC_COMMAND_SET_WANTED_DATA_TYPES
+
+NODE_STATUS = 'uavcan.protocol.NodeStatus'
+
+
+class AliveProcess:
+    @staticmethod
+    def is_alive():
+        return True
+
+
+def make_transfer():
+    return SimpleNamespace(direction='rx', service_not_message=False, source_node_id=5, ts_monotonic=1.0,
+                           payload=dronecan.uavcan.protocol.NodeStatus(uptime_sec=123))
+
+
+def drain(channel, timeout=0.5):
+    """The objects reach the queue via a feeder thread, so an empty queue is trusted only after a while"""
+    out = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        received, obj = channel.receive_nonblocking()
+        if received:
+            out.append(obj)
+            deadline = time.monotonic() + timeout
+    return out
+
+
+def test_announcements_are_repeated():
+    manager = PlotterManager(None)
+    channel = IPCChannel(max_size=3, policy=IPCChannel.POLICY_DROP_OLDEST)
+    request_channel = IPCChannel(max_size=10, policy=IPCChannel.POLICY_DROP_OLDEST)
+    wanted = set()
+    manager._inferiors.append((AliveProcess(), channel, request_channel, wanted))
+    request_channel.send_nonblocking((IPC_COMMAND_SET_WANTED_DATA_TYPES, [NODE_STATUS]))
+    time.sleep(0.1)
+
+    # The announcement of the new data type is skipped with the backlog of the transfers that follow it
+    for _ in range(4):
+        manager._transfer_hook(make_transfer())
+    assert wanted == {NODE_STATUS}
+    received = drain(channel)
+    assert received and all(isinstance(obj, MessageTransfer) for obj in received)
+    assert received[-1].message.uptime_sec == 123
+
+    manager.ACTIVE_DATA_TYPES_RESEND_INTERVAL = 0
+    manager._transfer_hook(make_transfer())
+    assert (IPC_ACTIVE_DATA_TYPES, [NODE_STATUS]) in drain(channel)
+
+    # Repeated requests replace the wanted set
+    request_channel.send_nonblocking((IPC_COMMAND_SET_WANTED_DATA_TYPES, []))
+    time.sleep(0.1)
+    manager.REQUEST_POLL_INTERVAL = 0
+    manager._transfer_hook(make_transfer())
+    assert wanted == set()
+    assert drain(channel) == [(IPC_ACTIVE_DATA_TYPES, [NODE_STATUS])]
+
+
+def test_wanted_data_types(qapp):
+    from dronecan_gui_tool.widgets.plotter.window import PlotterWindow
+    requests = []
+    win = PlotterWindow(lambda: None, set_wanted_data_types=requests.append)
+    try:
+        win._update_timer.stop()
+        win._extractor_index.add(Extractor(NODE_STATUS, Expression('msg.uptime_sec'), [], None),
+                                 lambda *_: None)
+
+        # Nothing is forwarded to a hidden window
+        win._update_wanted_data_types()
+        assert requests == [[]]
+
+        win.show()
+        win._update_wanted_data_types()
+        win._update_wanted_data_types()
+        assert requests == [[], [NODE_STATUS]]
+
+        # The request is repeated in case it has been lost
+        win.WANTED_DATA_TYPES_RESEND_INTERVAL = 0
+        win._update_wanted_data_types()
+        assert requests[-1] == [NODE_STATUS] and len(requests) == 3
+
+        for action in (win._pause_action, win._stop_action):
+            action.setChecked(True)
+            win._update_wanted_data_types()
+            assert requests[-1] == []
+            action.setChecked(False)
+            win._update_wanted_data_types()
+            assert requests[-1] == [NODE_STATUS]
+    finally:
+        win.close()
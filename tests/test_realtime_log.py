@@ -0,0 +1,73 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import pytest
+from dronecan_gui_tool.widgets import RealtimeLogWidget, VirtualTableModel, BasicTable
+from dronecan_gui_tool.widgets.bus_monitor.frame_buffer import FrameBuffer
+from .frames import make_frame
+
+COLUMNS = [BasicTable.Column('CAN ID', lambda e: '%08X' % e[1].id)]
+
+
+def entries(start, count):
+    return [('rx', make_frame(i)) for i in range(start, start + count)]
+
+
+@pytest.fixture
+def model(qapp):
+    return VirtualTableModel(None, COLUMNS, FrameBuffer(10))
+
+
+def test_model_appends_and_evicts(model):
+    model.append_entries(entries(0, 4))
+    assert model.rowCount() == 4
+    model.append_entries(entries(4, 8))
+    assert model.rowCount() == 10
+    assert model.row_to_seq(0) == 2
+    assert [model.render(r, 0)[0] for r in (0, 9)] == ['00000002', '0000000B']
+    # More entries than the capacity at once
+    model.append_entries(entries(100, 25))
+    assert model.rowCount() == 10 and model.render(0, 0)[0] == '%08X' % 115
+
+
+def test_model_filter(model):
+    model.append_entries(entries(0, 10))
+    model.set_filter(lambda seq: seq % 3 == 0)
+    assert model.rowCount() == 4
+    assert model.rows_to_seqs([0, 1, 3]).tolist() == [0, 3, 9]
+    assert model.seq_to_row(4) is None and model.seq_to_row(4, nearest=True) == 2
+    # The filtered rows are evicted together with the stored entries
+    model.append_entries(entries(10, 4))
+    assert [model.row_to_seq(r) for r in range(model.rowCount())] == [6, 9, 12]
+    model.set_filter(None)
+    assert model.rowCount() == 10
+
+
+def test_paused_log_is_bounded_by_store(qapp):
+    widget = RealtimeLogWidget(None, started_by_default=True, store=FrameBuffer(50), columns=COLUMNS)
+    widget.paused = True
+    for e in entries(0, 1000):
+        widget.add_item_async(e)
+    widget._redraw()
+    assert widget.table.rowCount() == 0
+    assert len(widget._queue) == 50
+
+    widget.paused = False
+    widget._redraw()
+    assert widget.table.rowCount() == 50
+    assert widget.table.model().render(0, 0)[0] == '%08X' % 950
+
+
+def test_queue_follows_store_capacity(qapp):
+    widget = RealtimeLogWidget(None, started_by_default=True, store=FrameBuffer(50), columns=COLUMNS)
+    widget.paused = True
+    for e in entries(0, 40):
+        widget.add_item_async(e)
+    widget.table.model().set_capacity(20)
+    widget.paused = False
+    widget._redraw()
+    assert widget.table.rowCount() == 20
+    assert widget._queue.maxlen == 20
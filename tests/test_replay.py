@@ -0,0 +1,87 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import time
+import pytest
+from dronecan_gui_tool.widgets.bus_monitor.capture import CaptureWriter
+from dronecan_gui_tool.widgets.bus_monitor.replay import CaptureReplayer, sleep_until
+from .frames import make_frame
+
+
+def write_capture(path, count, interval):
+    writer = CaptureWriter(str(path))
+    for i in range(count):
+        writer.push('rx', make_frame(i, bytes([i % 256]), ts=1 + i * interval))
+    writer.close()
+    assert writer.error is None
+    return writer.files
+
+
+def replay(paths, speed, timeout=10):
+    replayer = CaptureReplayer(paths, speed=speed)
+    out = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        item = replayer.get_frame()
+        if item is not None:
+            out.append(item)
+        elif replayer.finished:
+            break
+        else:
+            time.sleep(0.001)
+    replayer.stop()
+    return replayer, out
+
+
+def test_sleep_until():
+    deadline = time.perf_counter() + 0.01
+    lateness = sleep_until(deadline)
+    assert time.perf_counter() >= deadline
+    assert lateness >= 0
+
+    assert sleep_until(time.perf_counter() - 1) >= 1
+
+
+@pytest.mark.parametrize('speed', [None, 10.0])
+def test_replay(tmp_path, speed):
+    paths = write_capture(tmp_path / 'capture', 200, 0.001)
+    started_at = time.perf_counter()
+    replayer, out = replay(paths + write_capture(tmp_path / 'more', 10, 0.001), speed)
+    elapsed = time.perf_counter() - started_at
+
+    assert replayer.error is None
+    assert replayer.frames_replayed == 210
+    assert [f.id for _, f in out] == list(range(200)) + list(range(10))
+    assert all(d == 'rx' for d, _ in out)
+    assert 'finished' in replayer.get_status_string()
+    if speed is not None:
+        # 0.2 s of recorded time at 10x; the second capture starts over at the same timestamps
+        assert elapsed >= 0.199 / speed
+        assert 'timing error' in replayer.get_status_string()
+
+
+def test_stop_during_long_gap(tmp_path):
+    writer = CaptureWriter(str(tmp_path / 'capture'))
+    writer.push('rx', make_frame(1, ts=1.0))
+    writer.push('rx', make_frame(2, ts=1000.0))
+    writer.close()
+
+    replayer = CaptureReplayer(writer.files, speed=1.0)
+    deadline = time.monotonic() + 5
+    while replayer.get_frame() is None:
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+    started_at = time.monotonic()
+    replayer.stop()
+    while not replayer.finished:
+        assert time.monotonic() - started_at < 1
+        time.sleep(0.001)
+    assert replayer.frames_replayed == 1 and replayer.error is None
+
+
+def test_invalid_speed():
+    with pytest.raises(ValueError):
+        CaptureReplayer([], speed=0)
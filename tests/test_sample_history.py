@@ -0,0 +1,77 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import numpy
+import pytest
+from dronecan_gui_tool.widgets.sample_history import SampleHistory
+
+
+def make_history(count, capacity=1000, seed=0):
+    rng = numpy.random.default_rng(seed)
+    x = numpy.cumsum(rng.uniform(0.001, 0.1, size=count))
+    y = numpy.cumsum(rng.normal(size=count))
+    history = SampleHistory(capacity)
+    for a, b in zip(x, y):
+        history.append(float(a), float(b))
+    return history, x, y
+
+
+def test_recent_range_at_full_resolution():
+    history, x_all, y_all = make_history(5000)
+    assert len(history) == 1000
+    x, y = history.get_range(x_all[4500], x_all[4600], max_points=1000)
+    assert x.tolist() == x_all[4499:4602].tolist()
+    assert y.tolist() == y_all[4499:4602].tolist()
+
+
+def test_whole_range_is_decimated():
+    history, x_all, y_all = make_history(100000)
+    x, y = history.get_range(x_all[0], x_all[-1], max_points=500)
+    assert len(x) <= 500
+    assert numpy.all(numpy.diff(x) >= 0)
+    assert (y.min(), y.max()) == (y_all.min(), y_all.max())
+    assert x[-1] == x_all[-1]       # The line ends at the newest sample
+
+    history.clear()
+    assert len(history) == 0
+    assert len(history.get_range(0, 1, max_points=100)[0]) == 0
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_keep_bounds_fuzz(seed):
+    rng = numpy.random.default_rng(seed)
+    history, x_all, y_all = make_history(int(rng.integers(1, 70000)), capacity=int(rng.integers(16, 3000)),
+                                         seed=seed)
+    span = x_all[-1] - x_all[0]
+    for _ in range(200):
+        lo = x_all[0] + rng.uniform(-0.1, 1.1) * span
+        hi = lo + rng.uniform(0, 0.3) ** 3 * span
+        max_points = int(rng.integers(4, 2000))
+        x, y = history.get_range(lo, hi, max_points=max_points, keep_bounds=True)
+        assert numpy.all(numpy.diff(x) >= 0), (lo, hi, max_points)
+        assert (y.min(), y.max()) == (y_all.min(), y_all.max()), (lo, hi, max_points)
+
+
+def test_out_of_order_samples_are_clamped():
+    # Transfers are delivered in the order of completion, so their timestamps may step back
+    rng = numpy.random.default_rng(1)
+    x_all = numpy.arange(50000) * 0.01 + rng.uniform(-0.05, 0.05, size=50000)
+    y_all = rng.normal(size=50000)
+    history = SampleHistory(1000)
+    for a, b in zip(x_all, y_all):
+        history.append(float(a), float(b))
+    clamped = numpy.maximum.accumulate(x_all)
+
+    x, y = history.get_range(clamped[49500], clamped[49600], max_points=1000)
+    first = int(numpy.searchsorted(clamped, clamped[49500])) - 1
+    last = int(numpy.searchsorted(clamped, clamped[49600], side='right')) + 1
+    assert x.tolist() == clamped[first:last].tolist()
+    assert y.tolist() == y_all[first:last].tolist()
+
+    for lo in numpy.linspace(-10, 510, 27):
+        x, y = history.get_range(lo, lo + 20, max_points=300, keep_bounds=True)
+        assert numpy.all(numpy.diff(x) >= 0)
+        assert (y.min(), y.max()) == (y_all.min(), y_all.max())
@@ -0,0 +1,160 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import numpy
+import pytest
+from dronecan_gui_tool.widgets.sample_ring import ColumnRingBuffer, SampleRingBuffer, allocate_mapped, \
+    decimate_min_max, get_extreme_indexes
+
+
+def test_samples_wrap_around():
+    samples = SampleRingBuffer(5000, y_dtype=numpy.float32)
+    assert samples.last is None
+    for i in range(12345):
+        samples.append(i * 0.5, i % 100)
+    assert len(samples) == 5000
+    assert samples.x.tolist() == [i * 0.5 for i in range(12345 - 5000, 12345)]
+    assert samples.y.dtype == numpy.float32
+    assert samples.last == (12344 * 0.5, 44)
+
+    samples.clear()
+    assert len(samples) == 0 and samples.last is None
+
+
+def test_range_is_extended_and_decimated():
+    samples = SampleRingBuffer(5000)
+    for i in range(10000):
+        samples.append(float(i), float(i % 1000))
+
+    # One sample beyond either edge, so that the lines reach the edges of the view
+    x, y = samples.get_range(6000.5, 6010.5)
+    assert x.tolist() == list(range(6000, 6012))
+
+    # A view over the whole history is limited to the point budget, the peaks are kept
+    x, y = samples.get_range(0, 1e9, max_points=200)
+    assert 100 <= len(x) <= 200
+    assert numpy.all(numpy.diff(x) > 0)
+    assert (y.min(), y.max()) == (0, 999)
+
+    x, y = samples.get_range(20000, 30000)
+    assert x.tolist() == [9999]
+
+
+def test_storage_grows_on_demand():
+    ring = ColumnRingBuffer(10000, [numpy.int64, numpy.float32])
+    assert ring.capacity == 10000
+    assert ring._storage_capacity == ColumnRingBuffer.INITIAL_STORAGE_CAPACITY
+    for i in range(3000):
+        ring.append(i, i / 2)
+    assert ring._storage_capacity == 4096
+    assert ring.column(0).tolist() == list(range(3000))
+    assert ring.column(1).dtype == numpy.float32
+
+    # Never beyond the capacity
+    for i in range(3000, 25000):
+        ring.append(i, i / 2)
+    assert ring._storage_capacity == 10000
+    assert ring.column(0).tolist() == list(range(15000, 25000))
+    assert ring.last == (24999, 12499.5)
+
+    with pytest.raises(ValueError):
+        ring.column(0)[0] = 1       # The views are read-only
+
+
+def test_set_capacity():
+    ring = ColumnRingBuffer(100, [numpy.int64])
+    for i in range(250):
+        ring.append(i)
+
+    ring.set_capacity(30)           # The oldest records are discarded
+    assert ring.column(0).tolist() == list(range(220, 250))
+    ring.append(250)
+    assert ring.column(0).tolist() == list(range(221, 251))
+
+    ring.set_capacity(5000)         # The records are kept, the storage grows as before
+    assert ring.column(0).tolist() == list(range(221, 251))
+    for i in range(251, 2000):
+        ring.append(i)
+    assert ring.column(0).tolist() == list(range(221, 2000))
+
+    with pytest.raises(ValueError):
+        ring.set_capacity(0)
+
+
+def test_allocate_mapped():
+    a = allocate_mapped(1000, numpy.float64)
+    assert isinstance(a, numpy.memmap)
+    assert a.shape == (1000,) and not a.any()
+
+    samples = SampleRingBuffer(3000, allocate=allocate_mapped)
+    for i in range(5000):
+        samples.append(float(i), -float(i))
+    assert samples.x.tolist() == [float(i) for i in range(2000, 5000)]
+    assert samples.y[-1] == -4999
+    # Plain arrays are handed out, not the memory maps
+    assert type(samples.x) is numpy.ndarray
+
+
+@pytest.mark.parametrize('n', [0, 3, 100, 1000, 1001, 12345])
+@pytest.mark.parametrize('max_points', [1, 10, 200, 999])
+def test_decimate_min_max(n, max_points):
+    rng = numpy.random.default_rng(n)
+    x = numpy.arange(n, dtype=numpy.float64)
+    y = rng.normal(size=n).cumsum()
+    dx, dy = decimate_min_max(x, y, max_points)
+    if n <= max(4, max_points):
+        assert dx is x and dy is y
+        return
+    assert len(dx) <= max(4, max_points)
+    assert numpy.all(numpy.diff(dx) > 0)                # The original order
+    assert numpy.array_equal(y[dx.astype(int)], dy)     # The points are taken from the input as is
+    assert (dy.min(), dy.max()) == (y.min(), y.max())
+
+
+def test_get_extreme_indexes():
+    assert get_extreme_indexes(numpy.zeros(0)).tolist() == []
+    assert get_extreme_indexes(numpy.array([5.0])).tolist() == [0]
+    assert get_extreme_indexes(numpy.array([3.0, 9, 1, 4])).tolist() == [0, 1, 2, 3]
+    assert get_extreme_indexes(numpy.array([1.0, 2, 3, 4, 5])).tolist() == [0, 4]
+
+
+def test_range_keeps_bounds():
+    samples = SampleRingBuffer(1000)
+    y_all = numpy.sin(numpy.arange(1000) * 0.01) * numpy.arange(1000)
+    for i, v in enumerate(y_all):
+        samples.append(float(i), v)
+
+    x, y = samples.get_range(400, 410, keep_bounds=True)
+    assert (y.min(), y.max()) == (y_all.min(), y_all.max())
+    assert numpy.all(numpy.diff(x) > 0)
+    assert x[0] == 0 and x[-1] == 999               # The first and the last samples are kept as well
+    assert set(range(399, 412)) <= set(x.tolist())
+
+    # Nothing is added if the range covers everything
+    x, y = samples.get_range(-1, 1e6, keep_bounds=True)
+    assert x.tolist() == list(range(1000))
+
+    x, y = samples.get_range(400, 410, max_points=4, keep_bounds=True)
+    assert len(x) <= 4 + 8
+    assert (y.min(), y.max()) == (y_all.min(), y_all.max())
+
+
+def test_x_stepping_back_is_clamped():
+    samples = SampleRingBuffer(100)
+    for x, y in [(1.0, 10), (3.0, 11), (2.0, 12), (2.5, 13), (4.0, 14)]:
+        samples.append(x, y)
+    assert samples.x.tolist() == [1, 3, 3, 3, 4]
+    assert samples.y.tolist() == [10, 11, 12, 13, 14]
+    x, y = samples.get_range(3, 3)
+    assert y.tolist() == [10, 11, 12, 13, 14]
+
+    # X-Y plots keep the samples as they are, but cannot look up ranges
+    unsorted = SampleRingBuffer(100, sorted_x=False)
+    for x in (1.0, 3.0, 2.0):
+        unsorted.append(x, 0)
+    assert unsorted.x.tolist() == [1, 3, 2]
+    with pytest.raises(ValueError):
+        unsorted.get_range(0, 1)
@@ -0,0 +1,67 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import dronecan
+import pytest
+from dronecan_gui_tool.widgets.bus_monitor.frame_buffer import FrameBuffer
+from dronecan_gui_tool.widgets.bus_monitor.selection_stats import SelectionSummary, ranges_to_rows, \
+    get_timestamp_difference
+from dronecan_gui_tool.widgets.bus_monitor.can_id import NO_DATA_TYPE_KEY
+from .frames import make_frame
+
+NODE_STATUS_ID = dronecan.uavcan.protocol.NodeStatus.default_dtid
+
+
+def make_buffer(entries, capacity=100):
+    buf = FrameBuffer(capacity)
+    for entry in entries:
+        buf.append(*entry)
+    return buf
+
+
+def test_ranges_to_rows():
+    assert ranges_to_rows([]).tolist() == []
+    assert ranges_to_rows([(5, 7), (0, 0), (6, 9)]).tolist() == [0, 5, 6, 7, 8, 9]
+
+
+def test_summary():
+    node_status = (NODE_STATUS_ID << 8) | 10
+    entries = [('rx', make_frame(node_status, b'\x00' * 8, ts=10 + i)) for i in range(6)]
+    entries += [('tx', make_frame(0x123, b'\x00' * 2, extended=False, ts=16)),
+                ('tx', make_frame((1 << 8) | 0, b'\xC0', ts=20))]
+    buf = make_buffer(entries)
+
+    summary = SelectionSummary(buf, list(range(buf.first_seq, buf.next_seq)))
+    assert (summary.count, summary.num_tx, summary.num_bytes) == (8, 2, 51)
+    assert summary.duration == 10
+    assert summary.frames_per_second == pytest.approx(0.7)
+    assert summary.bytes_per_second == pytest.approx(5.1)
+    assert summary.data_type_counts[0] == (NODE_STATUS_ID, 6)
+    assert sorted(summary.data_type_counts[1:]) == [(NO_DATA_TYPE_KEY, 1), (1, 1)]
+
+    report = summary.get_report(max_data_types=1)
+    assert '8 frames (6 RX, 2 TX), 51 payload bytes' in report
+    assert 'uavcan.protocol.NodeStatus' in report
+    assert report.endswith('... 2 more data types')
+
+
+def test_duration_fallback():
+    # No usable monotonic timestamps, e.g. a capture that did not record them
+    buf = make_buffer([('rx', make_frame(1, ts=5.0, ts_real=100.0 + i)) for i in range(3)])
+    summary = SelectionSummary(buf, [0, 1, 2])
+    assert summary.duration == 2
+    assert get_timestamp_difference(buf, 0, 2) == 2
+
+    single = SelectionSummary(buf, [1])
+    assert single.duration == 0
+    assert single.frames_per_second is None
+    assert single.get_load_string() == 'average load is unknown'
+
+
+def test_timestamp_difference():
+    buf = make_buffer([('rx', make_frame(1, ts=t, ts_real=1000.0)) for t in (1.0, 1.25, 3.0)])
+    assert get_timestamp_difference(buf, 0, 1) == 0.25
+    assert get_timestamp_difference(buf, 2, 0) == -2
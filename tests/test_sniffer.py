@@ -0,0 +1,72 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+from PyQt5.QtCore import Qt
+from dronecan_gui_tool.widgets import BasicTable
+from dronecan_gui_tool.widgets.bus_monitor.sniffer import SnifferEntry, SnifferModel
+from .frames import make_frame
+
+
+def test_entry_tracks_changed_bytes():
+    entry = SnifferEntry('rx', make_frame(1, b'\x01\x02\x03'))
+    entry.update(make_frame(1, b'\x01\x02\x03'), 10.0)
+    assert entry.changed_at == [10.0] * 3
+
+    entry.update(make_frame(1, b'\x01\x02\x03'), 11.0)
+    assert entry.changed_at == [10.0] * 3
+
+    entry.update(make_frame(1, b'\x01\xFF\x03\x04'), 12.0)
+    assert entry.changed_at == [10.0, 12.0, 10.0, 12.0]
+
+    entry.update(make_frame(1, b'\x00'), 13.0)
+    assert entry.changed_at == [13.0]
+    assert entry.count == 4 and entry.frame.data == b'\x00'
+
+
+def test_model_keeps_one_row_per_id(qapp):
+    columns = [BasicTable.Column('ID', lambda e: '%08x' % e.frame.id),
+               BasicTable.Column('Count', lambda e: e.count)]
+    model = SnifferModel(None, columns)
+    for i in range(1000):
+        can_id = [0x300, 0x100, 0x200][i % 3]
+        direction = 'tx' if can_id == 0x200 and i % 2 else 'rx'
+        model.add_frame(direction, make_frame(can_id, bytes([i % 256]), ts=1 + i * 0.001))
+    model.add_frame('rx', make_frame(0x100, b'', extended=False))
+
+    assert model.rowCount() == 0        # Rows are inserted on refresh only
+    model.refresh()
+    assert model.rowCount() == 5
+    assert [model.data(model.index(row, 0)) for row in range(5)] == \
+           ['00000100', '00000100', '00000200', '00000200', '00000300']
+    assert model.get_entry(0).frame.extended is False
+    assert sum(model.get_entry(row).count for row in range(5)) == 1001
+    assert model.data(model.index(0, 0), Qt.TextAlignmentRole) is not None
+
+    # Only the newest frame of an ID is kept, its changed bytes are highlighted
+    entry = model.get_entry(4)
+    assert entry.frame.data == bytes([999 % 256])
+    assert model.get_change_intensities(4)[0] > 0.5
+    assert entry.rate > 0
+
+    model.clear()
+    assert model.rowCount() == 0
+
+
+def test_sniffer_columns(qapp):
+    from dronecan_gui_tool.widgets.bus_monitor.window import SNIFFER_COLUMNS
+    model = SnifferModel(None, SNIFFER_COLUMNS)
+    model.add_frame('rx', make_frame(0x1234567, b'AB\x00CDEFGHIJ', canfd=True))
+    model.refresh()
+
+    def cell(name, role=Qt.DisplayRole):
+        column = [c.name for c in SNIFFER_COLUMNS].index(name)
+        return model.data(model.index(0, column), role)
+
+    assert cell('Data Hex') == '41 42 00 43 44 45 46 47 48 49 4A'
+    assert cell('Data ASCII') == 'AB.CDEFGHIJ'
+    # The brushes are shared rather than allocated on every call
+    brush = cell('CAN ID', Qt.BackgroundRole)
+    assert brush is not None and cell('CAN ID', Qt.BackgroundRole) is brush
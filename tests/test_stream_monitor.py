@@ -0,0 +1,90 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import dronecan
+from dronecan_gui_tool.widgets.bus_monitor.stream_monitor import StreamMonitor
+from .frames import make_frame, make_transfer_frames
+
+
+def node_info(transfer_id):
+    msg = dronecan.uavcan.protocol.GetNodeInfo.Response()
+    msg.name = 'org.dronecan.test.node.with.a.long.name'
+    frames = make_transfer_frames(msg, transfer_id, source_node_id=11, dest_node_id=12)
+    assert len(frames) > 3
+    return frames
+
+
+def status(transfer_id, source_node_id=10):
+    return make_transfer_frames(dronecan.uavcan.protocol.NodeStatus(uptime_sec=transfer_id), transfer_id,
+                                source_node_id=source_node_id)
+
+
+def feed(monitor, entries):
+    return sum(monitor.add_frame(*entry) for entry in entries)
+
+
+def counters(stream):
+    return {name: getattr(stream, name) for name in ('frames', 'transfers', 'tid_gaps', 'lost_transfers',
+                                                     'toggle_errors', 'missing_eot', 'orphan_frames')}
+
+
+def single_stream(monitor):
+    [stream] = monitor.streams
+    return stream
+
+
+def test_clean_streams():
+    monitor = StreamMonitor()
+    entries = []
+    for tid in range(40):
+        entries += status(tid % 32) + node_info(tid % 32)
+    assert feed(monitor, entries) == 0
+    assert len(monitor.streams) == 2
+    for stream in monitor.streams:
+        assert stream.transfers == 40 and stream.error_count == 0 and stream.loss_ratio == 0
+
+
+def test_transfer_id_gap():
+    monitor = StreamMonitor()
+    feed(monitor, status(30) + status(31) + status(3))
+    stream = single_stream(monitor)
+    assert (stream.tid_gaps, stream.lost_transfers, stream.transfers) == (1, 3, 3)
+    assert stream.loss_ratio == 3 / 6
+
+
+def test_missing_end_and_orphans():
+    monitor = StreamMonitor()
+    feed(monitor, node_info(0)[:-1] + node_info(1) + node_info(2)[1:])
+    stream = single_stream(monitor)
+    c = counters(stream)
+    assert (c['missing_eot'], c['transfers'], c['orphan_frames']) == (1, 1, len(node_info(2)) - 1)
+
+
+def test_toggle_error_breaks_only_its_transfer():
+    frames = node_info(5)
+    direction, frame = frames[1]
+    frames[1] = direction, make_frame(frame.id, frame.data[:-1] + bytes([frame.data[-1] ^ 0x20]))
+
+    monitor = StreamMonitor()
+    assert feed(monitor, frames + node_info(6)) == 1
+    c = counters(single_stream(monitor))
+    assert (c['toggle_errors'], c['orphan_frames'], c['missing_eot'], c['transfers']) == (1, 0, 0, 1)
+
+
+def test_sessions():
+    monitor = StreamMonitor()
+    # Same session in the other direction is tracked separately; priority is not a part of the session
+    feed(monitor, status(0) + [('tx', f) for _, f in status(0)])
+    feed(monitor, [('rx', make_frame(f.id | (31 << 24), f.data)) for _, f in status(1)])
+    assert sorted(s.direction for s in monitor.streams) == ['rx', 'tx']
+
+    # Anonymous frames do not have sequential transfer IDs, and non-DroneCAN frames are ignored
+    feed(monitor, [('rx', make_frame((1 << 8) | 0, bytes([0, 0xC0 | tid]))) for tid in (7, 2, 19)])
+    feed(monitor, [('rx', make_frame(0x123, b'\x00', extended=False))])
+    assert sum(s.error_count for s in monitor.streams) == 0
+
+    monitor.clear()
+    assert not list(monitor.streams)
@@ -0,0 +1,83 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import random
+import numpy
+import pytest
+import dronecan
+from dronecan_gui_tool.widgets.bus_monitor.stream_timing import LogLinearHistogram, StreamTiming, \
+    StreamTimingAnalyzer
+from .frames import make_frame, make_transfer_frames
+
+
+def test_histogram_is_exact_for_small_values():
+    histogram = LogLinearHistogram(1000)
+    for value in range(100):
+        histogram.record(value)
+    assert histogram.count == 100
+    assert histogram.get_percentile(50) == 49.5
+    assert histogram.get_percentile(100) == 99.5
+    assert LogLinearHistogram(10).get_percentile(50) is None
+
+
+def test_histogram_relative_error():
+    rng = random.Random(0)
+    values = [int(rng.lognormvariate(8, 2)) for _ in range(20000)]
+    histogram = LogLinearHistogram(10 ** 9)
+    for value in values:
+        histogram.record(value)
+
+    bound = 1 / 2 ** (LogLinearHistogram.SUB_BUCKET_BITS - 1)
+    ordered = sorted(values)
+    for percentile in (1, 10, 50, 90, 99, 99.9, 100):
+        exact = ordered[round(len(values) * percentile / 100) - 1]
+        assert histogram.get_percentile(percentile) == pytest.approx(exact, rel=bound, abs=1)
+
+    edges, counts = histogram.get_buckets()
+    assert len(edges) == len(counts) + 1
+    assert counts.sum() == len(values)
+    assert edges[0] <= min(values) and edges[-1] > max(values)
+    assert numpy.all(numpy.diff(edges) > 0)
+
+
+def test_histogram_clamps_at_maximum():
+    histogram = LogLinearHistogram(1000)
+    histogram.record(10 ** 6)
+    assert histogram.get_percentile(100) == pytest.approx(1000, rel=0.02)
+
+
+def test_stream_timing():
+    timing = StreamTiming(10, 341)
+    rng = random.Random(0)
+    intervals = [2500 + rng.randint(-100, 100) for _ in range(4000)]     # 400 Hz with jitter, in microseconds
+    ts = 100.0
+    timing.add(ts)
+    for interval in intervals:
+        ts += interval * 1e-6
+        timing.add(ts)
+
+    assert timing.count == len(intervals)
+    assert timing.mean == pytest.approx(numpy.mean(intervals), abs=1)
+    assert timing.stddev == pytest.approx(numpy.std(intervals), rel=0.02)
+    assert timing.max_interval == pytest.approx(max(intervals), abs=1)
+    assert timing.min_interval == pytest.approx(min(intervals), abs=1)
+
+
+def test_analyzer_tracks_message_starts_only():
+    analyzer = StreamTimingAnalyzer()
+    for i in range(10):
+        msg = dronecan.uavcan.protocol.GetNodeInfo.Response()
+        msg.name = 'org.dronecan.test.node.with.a.long.name'
+        for entry in make_transfer_frames(dronecan.uavcan.protocol.NodeStatus(), i, ts=1 + i * 0.1) + \
+                make_transfer_frames(msg, i, source_node_id=11, dest_node_id=12, ts=1 + i * 0.1):
+            analyzer.add_frame(*entry)
+        analyzer.add_frame('rx', make_frame(0x123, b'\x01', extended=False))
+        analyzer.add_frame('rx', make_frame((1 << 8) | 0, bytes([0xC0 | i])))        # Anonymous
+
+    [stream] = analyzer.streams.values()
+    assert (stream.source_node_id, stream.data_type_key) == (10, dronecan.uavcan.protocol.NodeStatus.default_dtid)
+    assert stream.count == 9
+    assert stream.mean == pytest.approx(100000, abs=2)
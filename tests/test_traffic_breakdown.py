@@ -0,0 +1,48 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import pytest
+from dronecan_gui_tool.widgets.bus_monitor.traffic_breakdown import SlidingWindowCounter, TrafficBreakdown
+from dronecan_gui_tool.widgets.bus_monitor.can_id import SERVICE_TYPE_KEY_FLAG, NO_DATA_TYPE_KEY
+from .frames import make_frame
+from .test_can_id_decode import message_id, service_id
+
+
+def test_sliding_window_rates():
+    counter = SlidingWindowCounter()
+    for i in range(100):
+        counter.add(10 + i * 0.05, 8)           # 20 frames per second for 5 seconds
+    assert (counter.frames, counter.bytes) == (100, 800)
+    frames, num_bytes = counter.get_rates(14.999, 1.0)
+    assert frames == pytest.approx(20, abs=2)
+    assert num_bytes == pytest.approx(160, abs=16)
+    assert counter.get_rates(14.999, 10.0)[0] == pytest.approx(10, abs=1)
+    assert counter.get_rates(100, 1.0) == (0, 0)
+
+
+def test_breakdown_groups():
+    breakdown = TrafficBreakdown()
+    frames = [make_frame(message_id(341, 10, priority=16), b'\x00' * 8, ts=1.0),
+              make_frame(message_id(341, 11, priority=16), b'\x00' * 8, ts=1.1),
+              make_frame(service_id(1, 10, 11, request=True, priority=30), b'\xC0', ts=1.2),
+              make_frame(message_id(0x4D01, 0, priority=24), b'\x00' * 4, ts=1.3),
+              make_frame(0x123, b'\x01\x02', extended=False, ts=1.4)]
+    for frame in frames:
+        breakdown.add_frame('rx', frame)
+
+    def counts(group):
+        return {key: c.frames for key, c in breakdown.get_counters(group).items()}
+
+    assert counts(TrafficBreakdown.GROUP_NODE) == {10: 2, 11: 1, 0: 1, None: 1}
+    assert counts(TrafficBreakdown.GROUP_DATA_TYPE) == {341: 2, 1 | SERVICE_TYPE_KEY_FLAG: 1, 1: 1,
+                                                        NO_DATA_TYPE_KEY: 1}
+    assert counts(TrafficBreakdown.GROUP_PRIORITY) == {16: 2, 30: 1, 24: 1, None: 1}
+    assert breakdown.total.bytes == 8 + 8 + 1 + 4 + 2
+    assert breakdown.now >= 1.4
+
+    breakdown.clear()
+    assert counts(TrafficBreakdown.GROUP_NODE) == {}
+    assert breakdown.total.frames == 0
@@ -0,0 +1,86 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import dronecan
+import pytest
+from dronecan_gui_tool.widgets.bus_monitor.frame_buffer import FrameBuffer
+from dronecan_gui_tool.widgets.bus_monitor.transfer_decoder import TransferIndex, DecodingFailedException, \
+    decode_transfer
+from .frames import make_transfer_frames
+
+NODE_NAME = 'org.dronecan.test.node.with.a.long.name'
+
+
+def node_info_frames(transfer_id):
+    msg = dronecan.uavcan.protocol.GetNodeInfo.Response()
+    msg.name = NODE_NAME
+    return make_transfer_frames(msg, transfer_id, source_node_id=11, dest_node_id=12)
+
+
+def node_status_frames(transfer_id):
+    return make_transfer_frames(dronecan.uavcan.protocol.NodeStatus(uptime_sec=transfer_id), transfer_id)
+
+
+def make_buffer(capacity=1000):
+    buf = FrameBuffer(capacity)
+    index = TransferIndex(buf)
+    buf.on_append = index.add_frame
+    return buf, index
+
+
+def test_interleaved_multi_frame_transfer():
+    buf, index = make_buffer()
+    info = node_info_frames(3)
+    assert len(info) > 2
+
+    seqs = []
+    for i, entry in enumerate(info):
+        seqs.append(buf.append(*entry))
+        buf.append(*node_status_frames(i)[0])       # Unrelated single-frame transfers in between
+
+    for seq in seqs:
+        assert index.get_transfer_seqs(seq) == seqs
+    found, text = decode_transfer(seqs[1], buf, index)
+    assert found == seqs
+    assert NODE_NAME in text
+
+    # Single-frame transfers are not indexed, but can be decoded as well
+    single = seqs[0] + 1
+    assert index.get_transfer_seqs(single) == [single]
+    assert 'uptime_sec' in decode_transfer(single, buf, index)[1]
+    assert len(index) == len(seqs)
+
+
+def test_incomplete_and_orphan_transfers():
+    buf, index = make_buffer()
+    info = node_info_frames(5)
+    first = buf.append(*info[0])
+    with pytest.raises(DecodingFailedException, match='EOT'):
+        index.get_transfer_seqs(first)
+
+    # A new start of transfer with the same key abandons the unfinished one
+    restarted = [buf.append(*entry) for entry in info]
+    assert index.get_transfer_seqs(restarted[-1]) == restarted
+    with pytest.raises(DecodingFailedException, match='EOT'):
+        index.get_transfer_seqs(first)
+
+    orphan = buf.append(*node_info_frames(6)[1])
+    with pytest.raises(DecodingFailedException, match='SOT'):
+        index.get_transfer_seqs(orphan)
+
+
+def test_eviction():
+    info = node_info_frames(7)
+    buf, index = make_buffer(capacity=len(info) + 2)
+    seqs = [buf.append(*entry) for entry in info]
+    assert index.get_transfer_seqs(seqs[-1]) == seqs
+
+    buf.append(*node_status_frames(0)[0])
+    buf.append(*node_status_frames(1)[0])
+    buf.append(*node_status_frames(2)[0])       # The first frame of the transfer is evicted
+    with pytest.raises(DecodingFailedException, match='evicted'):
+        index.get_transfer_seqs(seqs[-1])
+    assert len(index) == len(seqs) - 1
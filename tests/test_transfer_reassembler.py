@@ -0,0 +1,67 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import dronecan
+import pytest
+from dronecan_gui_tool.widgets.bus_monitor.transfer_decoder import TransferReassembler, TransferBuffer
+from .frames import make_frame, make_transfer_frames
+
+
+def node_info_frames(transfer_id, direction='rx'):
+    msg = dronecan.uavcan.protocol.GetNodeInfo.Response()
+    msg.name = 'org.dronecan.test.node'
+    return make_transfer_frames(msg, transfer_id, source_node_id=11, dest_node_id=12, direction=direction)
+
+
+def feed(reassembler, entries):
+    return [t for t in (reassembler.add_frame(*e) for e in entries) if t is not None]
+
+
+def test_single_and_multi_frame_transfers():
+    reassembler = TransferReassembler()
+    status = make_transfer_frames(dronecan.uavcan.protocol.NodeStatus(uptime_sec=42), 9)
+    [single] = feed(reassembler, status)
+    assert single.transfer_id == 9 and len(single.frames) == 1
+    assert single.payload_size == 7
+    assert 'uptime_sec: 42' in single.decode()
+
+    frames = node_info_frames(4)
+    [multi] = feed(reassembler, frames)
+    assert len(multi.frames) == len(frames) > 1
+    assert multi.id == frames[0][1].id and multi.ts_monotonic == frames[0][1].ts_monotonic
+    assert multi.data == frames[-1][1].data
+    assert multi.payload_size == sum(len(f.data) - 1 for _, f in frames) - 2     # Without the CRC
+    assert 'org.dronecan.test.node' in multi.decode()
+
+
+def test_interleaved_directions_are_separate():
+    reassembler = TransferReassembler()
+    rx, tx = node_info_frames(4, 'rx'), node_info_frames(4, 'tx')
+    interleaved = [e for pair in zip(rx, tx) for e in pair]
+    assert len(feed(reassembler, interleaved)) == 2
+
+
+def test_broken_transfers_are_dropped():
+    reassembler = TransferReassembler()
+    frames = node_info_frames(4)
+    assert feed(reassembler, frames[:1] + frames[2:]) == []        # Missing frame breaks the toggle sequence
+    assert feed(reassembler, frames[1:]) == []                      # No start of transfer
+    assert reassembler.add_frame('rx', make_frame(0x123, b'\xC0', extended=False)) is None
+    assert reassembler.add_frame('rx', make_frame(0x123, b'')) is None
+    assert len(feed(reassembler, frames)) == 1                      # Still works afterwards
+
+
+def test_transfer_buffer():
+    buf = TransferBuffer(3)
+    for i in range(5):
+        buf.append('rx', make_frame(i, ts_real=100 + i))
+    assert (len(buf), buf.first_seq, buf.next_seq) == (3, 2, 5)
+    assert buf.get(4)[1].id == 4
+    assert buf.get_entry(2)[2] is None and buf.get_entry(3)[2] == 102
+    with pytest.raises(IndexError):
+        buf.get(1)
+    buf.clear()
+    assert len(buf) == 0 and buf.first_seq == 5
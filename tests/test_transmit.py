@@ -0,0 +1,131 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import pickle
+import threading
+import pytest
+from dronecan_gui_tool.widgets.bus_monitor.transmit import TransmitJob, TransmitScheduler, Transmitter
+from .frames import make_frame
+
+
+def frames_at(*timestamps, canfd=False):
+    return [('rx', make_frame(i, bytes([i & 0xFF]), ts=ts, canfd=canfd)) for i, ts in enumerate(timestamps)]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class Recorder:
+    def __init__(self, clock, reject=()):
+        self.sent = []
+        self._clock = clock
+        self._reject = set(reject)
+
+    def __call__(self, can_id, data, extended=False, canfd=False):
+        assert threading.current_thread() is threading.main_thread()
+        if can_id in self._reject:
+            raise RuntimeError('TX queue is full')
+        self.sent.append((self._clock(), can_id, data, extended, canfd))
+
+
+def test_job():
+    job = TransmitJob(frames_at(10.0, 10.5, 10.25, 11.0))
+    # The timestamps of a capture may step back, the offsets never do
+    assert [f[0] for f in job.frames] == [0, 0.5, 0.5, 1.0]
+    assert job.frames[1][1:] == (1, b'\x01', True, False)
+    assert job.span == 1.0
+    assert job.cycle_length == pytest.approx(4 / 3)
+    assert TransmitJob(frames_at(1.0, 1.1), repeat=0, period=5).cycle_length == 5
+
+    restored = pickle.loads(pickle.dumps(job))
+    assert restored.frames == job.frames and restored.repeat == job.repeat
+
+
+def test_job_validation():
+    with pytest.raises(ValueError):
+        TransmitJob([])
+    with pytest.raises(ValueError):
+        TransmitJob(frames_at(1.0), repeat=-1)
+    with pytest.raises(ValueError):
+        TransmitJob(frames_at(1.0, 1.0), repeat=2)      # No duration and no period
+    with pytest.raises(ValueError):
+        TransmitJob(frames_at(*([1.0] * (TransmitJob.MAX_FRAMES + 1))))
+    TransmitJob(frames_at(1.0), repeat=2, period=0.01)
+
+
+def test_scheduler_preserves_gaps():
+    clock = Clock()
+    send = Recorder(clock)
+    scheduler = TransmitScheduler(TransmitJob(frames_at(1.0, 1.02, 1.05, canfd=True), repeat=2, period=0.1),
+                                  clock=clock)
+    # Polled every 10 ms
+    while not scheduler.finished:
+        scheduler.poll(send)
+        clock.now += 0.01
+        assert clock.now < 101
+
+    assert scheduler.error is None
+    assert (scheduler.frames_sent, scheduler.cycles_completed, scheduler.frames_failed) == (6, 2, 0)
+    assert [s[1] for s in send.sent] == [0, 1, 2, 0, 1, 2]
+    assert all(s[4] for s in send.sent)
+    for (ts, *_), expected in zip(send.sent, [0, 0.02, 0.05, 0.1, 0.12, 0.15]):
+        assert ts - 100 == pytest.approx(expected, abs=0.0101)
+    assert scheduler.timing_error.count == 6
+    assert scheduler.max_timing_error < 0.0101
+    assert 'TX finished: cycle 2/2, 6 frames' in scheduler.get_status_string()
+
+
+def test_scheduler_limits_frames_per_poll():
+    clock = Clock()
+    send = Recorder(clock)
+    scheduler = TransmitScheduler(TransmitJob(frames_at(*([1.0] * 2500))), clock=clock)
+    scheduler.poll(send)
+    assert len(send.sent) == TransmitScheduler.MAX_FRAMES_PER_POLL
+    scheduler.poll(send)
+    scheduler.poll(send)
+    assert len(send.sent) == 2500 and scheduler.finished
+
+
+def test_scheduler_rejected_frames():
+    clock = Clock()
+    send = Recorder(clock, reject={1})
+    scheduler = TransmitScheduler(TransmitJob(frames_at(1.0, 1.001, 1.002)), clock=clock)
+    clock.now += 1
+    scheduler.poll(send)
+    assert scheduler.finished
+    assert [s[1] for s in send.sent] == [0, 2]
+    assert scheduler.frames_failed == 1
+    assert '1 frames rejected by the driver' in scheduler.get_status_string()
+
+
+def test_transmitter():
+    clock = Clock()
+    send = Recorder(clock)
+    transmitter = Transmitter(send, clock=clock)
+    assert transmitter.get_status_string() is None
+    transmitter.poll()
+
+    transmitter.start(TransmitJob(frames_at(1.0, 1.01), repeat=0, period=10))
+    transmitter.poll()
+    assert len(send.sent) == 1
+
+    # Nothing is sent after stop()
+    transmitter.stop()
+    assert 'TX finished' in transmitter.get_status_string()
+    clock.now += 100
+    transmitter.poll()
+    assert len(send.sent) == 1
+
+    # A new job replaces the old one
+    transmitter.start(TransmitJob(frames_at(1.0)))
+    transmitter.poll()
+    assert len(send.sent) == 2
+    assert 'TX finished: cycle 1/1' in transmitter.get_status_string()
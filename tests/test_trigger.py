@@ -0,0 +1,87 @@
+#
+# Copyright (C) 2026  DroneCAN Development Team  <dronecan.org>
+#
+# This software is distributed under the terms of the MIT License.
+#
+
+import pytest
+from dronecan_gui_tool.widgets.bus_monitor.trigger import TriggerCapture
+from .frames import make_frame
+
+TRIGGER_ID = 0x123
+
+
+def frames(count, start=0):
+    return [('rx', make_frame(start + i, b'\x00')) for i in range(count)]
+
+
+def match_trigger_id(direction, frame):
+    return frame.id == TRIGGER_ID
+
+
+def feed(capture, entries):
+    """Returns the number of frames consumed until the capture was complete"""
+    for i, (direction, frame) in enumerate(entries):
+        if capture.add_frame(direction, frame):
+            return i + 1
+    return None
+
+
+def test_pre_and_post_trigger_windows():
+    capture = TriggerCapture(match_trigger_id, 3, 2)
+    assert capture.trigger_index is None
+    assert capture.get_status_string() == 'Armed, 0/3 pre-trigger'
+
+    assert feed(capture, frames(10)) is None
+    assert capture.state == TriggerCapture.STATE_ARMED
+    assert capture.get_status_string() == 'Armed, 3/3 pre-trigger'
+    assert [f.id for _, f in capture.frames] == [6, 7, 8, 9]
+
+    assert feed(capture, [('tx', make_frame(TRIGGER_ID))]) is None
+    assert capture.state == TriggerCapture.STATE_TRIGGERED
+    assert capture.trigger_index == 3
+    assert capture.get_status_string() == 'Triggered, 0/2 post-trigger'
+
+    # Later matches do not restart the capture
+    assert feed(capture, [('rx', make_frame(TRIGGER_ID))] + frames(5, start=100)) == 2
+    assert capture.state == TriggerCapture.STATE_COMPLETE
+    assert [f.id for _, f in capture.frames] == [7, 8, 9, TRIGGER_ID, TRIGGER_ID, 100]
+    assert capture.frames[capture.trigger_index][0] == 'tx'
+    assert capture.get_status_string() == 'Complete, 6 frames'
+
+    # Frames after completion are ignored
+    assert not capture.add_frame('rx', make_frame(1))
+    assert len(capture.frames) == 6
+
+
+def test_trigger_before_pre_trigger_window_is_full():
+    capture = TriggerCapture(match_trigger_id, 100, 1)
+    assert feed(capture, frames(2) + [('rx', make_frame(TRIGGER_ID))] + frames(3, start=10)) == 4
+    assert capture.trigger_index == 2
+    assert [f.id for _, f in capture.frames] == [0, 1, TRIGGER_ID, 10]
+
+
+def test_no_post_trigger_frames():
+    capture = TriggerCapture(match_trigger_id, 0, 0)
+    assert feed(capture, frames(5) + [('rx', make_frame(TRIGGER_ID))]) == 6
+    assert capture.trigger_index == 0
+    assert [f.id for _, f in capture.frames] == [TRIGGER_ID]
+
+
+def test_trigger_on_errors():
+    capture = TriggerCapture(None, 1, 1, trigger_on_errors=True)
+    for _, frame in frames(3):
+        assert not capture.add_frame('rx', frame)
+    assert not capture.add_frame('rx', make_frame(50), errors=1)
+    assert capture.add_frame('rx', make_frame(51), errors=1)
+    assert [f.id for _, f in capture.frames] == [2, 50, 51]
+
+    # Errors are not a condition unless requested
+    capture = TriggerCapture(match_trigger_id, 1, 1)
+    assert not capture.add_frame('rx', make_frame(50), errors=1)
+    assert capture.state == TriggerCapture.STATE_ARMED
+
+
+def test_condition_required():
+    with pytest.raises(ValueError):
+        TriggerCapture(None, 10, 10)